@@ -0,0 +1,85 @@
+# app/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class LRUCache:
+    """
+    Thread-safe LRU bounded by entry count, with an optional absolute expiry per entry
+    (epoch seconds, i.e. comparable with a JWT `exp`). Keeps hit/miss/eviction counters.
+    With `weigher` (e.g. len for bytes values) it is also bounded by total weight
+    `maxweight`; a single value heavier than that is not stored.
+    """
+
+    def __init__(self, maxsize: int, *, weigher: Optional[Callable[[Any], int]] = None, maxweight: int = 0):
+        self.maxsize = maxsize
+        self.weigher = weigher
+        self.maxweight = maxweight
+        self.weight = 0
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float], int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at, w = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._data[key]
+                self.weight -= w
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, *, expires_at: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        w = self.weigher(value) if self.weigher else 0
+        if self.weigher and w > self.maxweight:
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.weight -= old[2]
+            self._data[key] = (value, expires_at, w)
+            self.weight += w
+            while len(self._data) > self.maxsize or (self.weigher and self.weight > self.maxweight):
+                _, evicted = self._data.popitem(last=False)
+                self.weight -= evicted[2]
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.weight -= old[2]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "weight": self.weight,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -3,9 +3,29 @@ from typing import List
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_DIRECT_URL: str | None = None  # bypasses PgBouncer for LISTEN; defaults to DATABASE_URL
+
+    # Connection pool (per engine, per API worker); see app/db/pool.py
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 30                # size + overflow should cover the 40 threadpool threads
+    DB_POOL_TIMEOUT: float = 10.0            # seconds to wait for a checkout before erroring
+    DB_POOL_RECYCLE: int = 1800              # replace connections older than this (seconds); -1 = never
+    DB_POOL_PRE_PING: bool = False           # ping on every checkout (costs a round trip each)
+    DB_POOL_IDLE_PING_SECONDS: float = 30.0  # ping only connections idle at least this long; -1 = never
+    DB_POOL_SLOW_CHECKOUT_SECONDS: float = 0.5  # log checkouts that waited longer
+    DB_PGBOUNCER: bool = False               # transaction pooling: no server-side prepared statements
+
+    # Read replicas for read-only endpoints (JSON list of URLs); see app/db/replicas.py
+    DATABASE_REPLICA_URLS: list[str] = []
+    REPLICA_CHECK_SECONDS: float = 5.0       # health/lag probe interval; 0 = eject on errors only
+    REPLICA_MAX_LAG_SECONDS: float = 10.0    # a replica further behind than this is ejected
+    REPLICA_EJECT_SECONDS: float = 30.0      # how long a replica sits out after a connection error
+    REPLICA_CONNECT_TIMEOUT: int = 3         # seconds; keeps a dead host from stalling requests
+    READ_AFTER_WRITE_SECONDS: float = 10.0   # a user's reads go to the primary this long after a write
     JWT_SECRET: str = "change-me"
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRE_DAYS: int = 7
+    JWT_CACHE_SIZE: int = 10_000   # verified-token LRU per worker; 0 disables it
     CORS_ORIGINS: list[str] = [
         "http://localhost:5173",
         "http://127.0.0.1:5173",               # handy in dev
@@ -21,6 +41,40 @@ class Settings(BaseSettings):
     COOKIE_SAMESITE: str = "lax"   # "lax" | "strict" | "none"
     COOKIE_MAX_AGE: int = 60 * 60 * 24 * 7  # 7 days
 
+    # Password hashing (bcrypt) in a process pool; 0 workers = hash inline
+    BCRYPT_ROUNDS: int = 12                  # changing it rehashes users on their next login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32      # hashing + queued requests per API worker
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+
+    # Server-Timing header + per-request log line (db / render / app time)
+    SERVER_TIMING: bool = True
+
+    # Prometheus text exposition at /metrics
+    METRICS_ENABLED: bool = True
+
+    # GET /categories: in-process cache (dropped on NOTIFY category_changed) and client max-age
+    CATEGORIES_CACHE_TTL_SECONDS: float = 300.0
+    CATEGORIES_MAX_AGE: int = 60
+
+    # Serialized GET /quiz/result/{id} bodies kept per worker (MiB)
+    QUIZ_RESULT_CACHE_MB: int = 64
+
+    # Cross-worker cache invalidation via Postgres LISTEN/NOTIFY
+    DB_LISTEN: bool = True
+
+    # is_active cache used by services.auth.get_current_user
+    USER_STATUS_TTL_SECONDS: float = 30.0
+    USER_STATUS_CACHE_SIZE: int = 50_000
+
+    # Async request path: AsyncSession on psycopg async instead of the threadpool
+    DB_ASYNC: bool = False
+
+    # In-memory question bank used by GET /quiz
+    QUESTION_BANK_CACHE: bool = True
+    QUESTION_BANK_MAX_QUESTIONS: int = 100_000   # bigger categories are sampled in SQL instead
+    QUESTION_BANK_CHECK_SECONDS: float = 5.0     # how often a worker re-reads the version stamp
+
     class Config:
         env_file = ".env"
 
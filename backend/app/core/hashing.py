@@ -0,0 +1,120 @@
+# app/core/hashing.py
+"""Password hashing (bcrypt) in a small process pool, with a cap on pending requests."""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.hash import bcrypt
+
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+# Worker-side functions: module level so they can be pickled into the pool
+def _hash(pw: str, rounds: int) -> str:
+    return bcrypt.using(rounds=rounds).hash(pw)
+
+def _verify(pw: str, hashed: str) -> bool:
+    return bcrypt.verify(pw, hashed)
+
+def _timed(fn: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    return fn(*args), time.perf_counter() - t0
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int, queue_timeout: float):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._stats_lock = threading.Lock()
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    # spawn, not fork: the API process is multi-threaded
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+        return self._pool
+
+    def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.workers <= 0:
+            return fn(*args)
+
+        t0 = time.perf_counter()
+        with self._stats_lock:
+            self._waiting += 1
+        acquired = self._slots.acquire(timeout=self.queue_timeout)
+        waited = time.perf_counter() - t0
+        with self._stats_lock:
+            self._waiting -= 1
+            if not acquired:
+                self._rejected += 1
+            else:
+                self._in_flight += 1
+        if not acquired:
+            log.warning("password hashing queue full, rejected after %.2fs", waited)
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy, please retry")
+
+        took = 0.0
+        try:
+            result, took = self._get_pool().submit(_timed, fn, *args).result()
+            return result
+        finally:
+            self._slots.release()
+            waited = time.perf_counter() - t0 - took  # semaphore + executor queue (+ IPC)
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._completed += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+    def hash(self, pw: str) -> str:
+        return self._run(_hash, pw, settings.BCRYPT_ROUNDS)
+
+    def verify(self, pw: str, hashed: str) -> bool:
+        return self._run(_verify, pw, hashed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            done = self._completed
+            hashing = min(self._in_flight, max(self.workers, 0))
+            return {
+                "workers": self.workers,
+                # waiting for a slot, plus admitted but queued behind busy workers
+                "waiting": self._waiting + self._in_flight - hashing,
+                "in_flight": hashing,
+                "completed": done,
+                "rejected": self._rejected,
+                "wait_avg_ms": (self._wait_total / done * 1000) if done else 0.0,
+                "wait_max_ms": self._wait_max * 1000,
+            }
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+def needs_rehash(hashed: str) -> bool:
+    """True when `hashed` was made with a different bcrypt cost than BCRYPT_ROUNDS."""
+    return bcrypt.using(rounds=settings.BCRYPT_ROUNDS).needs_update(hashed)
+
+hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+)
@@ -28,11 +28,12 @@ def setup_logging() -> None:
 
     handler = logging.StreamHandler(sys.stdout)
     handler.setFormatter(SafeFormatter(fmt))
+    # on the handler, not the root logger: logger filters skip records propagated from children
+    handler.addFilter(RequestIdFilter())
 
     root = logging.getLogger()
     root.setLevel(getattr(logging, level, logging.INFO))
     root.addHandler(handler)
-    root.addFilter(RequestIdFilter())
 
     logging.getLogger("uvicorn.access").setLevel(os.getenv("UVICORN_ACCESS_LOG_LEVEL", "WARNING"))
 
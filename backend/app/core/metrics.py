@@ -0,0 +1,185 @@
+# app/core/metrics.py
+"""Minimal Prometheus metrics; each thread writes its own shard, summed on scrape."""
+import hashlib
+import re
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+Labels = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_local = threading.local()
+_shards: List[Dict[Tuple[str, Labels], List[float]]] = []
+_shards_lock = threading.Lock()  # only taken once per thread, when its shard is created
+_registry: List["_Metric"] = []
+
+def _shard() -> Dict[Tuple[str, Labels], List[float]]:
+    shard = getattr(_local, "shard", None)
+    if shard is None:
+        shard = _local.shard = {}
+        with _shards_lock:
+            _shards.append(shard)
+    return shard
+
+def _fmt_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _escape(v: str) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _fmt_num(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def _cells(self, labels: Labels, size: int) -> List[float]:
+        shard = _shard()
+        key = (self.name, labels)
+        cells = shard.get(key)
+        if cells is None:
+            cells = shard[key] = [0] * size
+        return cells
+
+    def _merged(self) -> Dict[Labels, List[float]]:
+        out: Dict[Labels, List[float]] = {}
+        with _shards_lock:
+            shards = list(_shards)
+        for shard in shards:
+            for (name, labels), cells in list(shard.items()):
+                if name != self.name:
+                    continue
+                acc = out.get(labels)
+                if acc is None:
+                    out[labels] = list(cells)
+                else:
+                    for i, v in enumerate(cells):
+                        acc[i] += v
+        return out
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), n: float = 1) -> None:
+        self._cells(labels, 1)[0] += n
+
+    def values(self) -> Dict[Labels, float]:
+        return {labels: cells[0] for labels, cells in self._merged().items()}
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(self.labelnames, l)} {_fmt_num(c[0])}" for l, c in self._merged().items()]
+
+class Gauge(Counter):
+    """Summed across threads, so inc()/dec() must happen on the same thread (e.g. the event loop)."""
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), n: float = 1) -> None:
+        self._cells(labels, 1)[0] -= n
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, labels: Labels, value: float) -> None:
+        # cells: one per bucket (non-cumulative) + the +Inf bucket + the running sum
+        cells = self._cells(labels, len(self.buckets) + 2)
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-1] += value
+
+    def summary(self, labels: Labels = ()) -> Tuple[float, float]:
+        """(count, sum) of observations for `labels`, across threads."""
+        cells = self._merged().get(labels)
+        if cells is None:
+            return 0, 0.0
+        return sum(cells[:-1]), cells[-1]
+
+    def cumulative(self, labels: Labels = ()) -> Dict[str, float]:
+        """{le: cumulative count}, as in the exposition format."""
+        cells = self._merged().get(labels) or [0] * (len(self.buckets) + 2)
+        out: Dict[str, float] = {}
+        cum = 0
+        for le, n in zip(self.buckets + (float("inf"),), cells):
+            cum += n
+            out["+Inf" if le == float("inf") else repr(le)] = cum
+        return out
+
+    def render(self) -> List[str]:
+        lines: List[str] = []
+        for labels, cells in self._merged().items():
+            cum = 0
+            for le, n in zip(self.buckets + (float("inf"),), cells):
+                cum += n
+                le_label = 'le="+Inf"' if le == float("inf") else f'le="{le!r}"'
+                lines.append(f"{self.name}_bucket{_fmt_labels(self.labelnames, labels, le_label)} {_fmt_num(cum)}")
+            lines.append(f"{self.name}_sum{_fmt_labels(self.labelnames, labels)} {_fmt_num(cells[-1])}")
+            lines.append(f"{self.name}_count{_fmt_labels(self.labelnames, labels)} {_fmt_num(cum)}")
+        return lines
+
+class GaugeFunc(_Metric):
+    """Gauge read from a callback at scrape time: fn() -> [(label values, value), ...]."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str], fn: Callable[[], Iterable[Tuple[Labels, float]]]):
+        super().__init__(name, help, labelnames)
+        self.fn = fn
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{_fmt_labels(self.labelnames, l)} {_fmt_num(v)}" for l, v in self.fn()]
+
+def render() -> str:
+    out: List[str] = []
+    for m in _registry:
+        out.append(f"# HELP {m.name} {m.help}")
+        out.append(f"# TYPE {m.name} {m.kind}")
+        out.extend(m.render())
+    return "\n".join(out) + "\n"
+
+# ---- SQL statement fingerprints ----
+
+_fp_cache: Dict[str, str] = {}
+_FP_CACHE_MAX = 2000
+_WS = re.compile(r"\s+")
+_LITERALS = re.compile(r"%\(\w+\)s|%s|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_TABLE = re.compile(r"\b(?:from|into|update|join)\s+([a-z_][a-z0-9_]*)", re.I)
+
+def fingerprint(statement: str) -> str:
+    """`<verb>:<first table>:<hash>` of the statement with whitespace and literals normalized."""
+    fp = _fp_cache.get(statement)
+    if fp is not None:
+        return fp
+    norm = _LITERALS.sub("?", _WS.sub(" ", statement).strip()).lower()
+    if norm.startswith("with"):
+        verbs = re.findall(r"\)\s*(select|insert|update|delete)\b", norm)
+        verb = verbs[-1] if verbs else "with"
+    else:
+        verb = norm.split(" ", 1)[0] if norm else "?"
+    table = _TABLE.search(norm)
+    fp = f"{verb}:{table.group(1) if table else '-'}:{hashlib.md5(norm.encode()).hexdigest()[:8]}"
+    if len(_fp_cache) < _FP_CACHE_MAX:
+        _fp_cache[statement] = fp
+    return fp
+
+# ---- app metrics ----
+
+REQUEST_LATENCY = Histogram("http_request_duration_seconds", "Request latency by route template", ("method", "route"))
+REQUESTS = Counter("http_requests_total", "Requests by route template and status", ("method", "route", "status"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served")
+SQL_LATENCY = Histogram("db_statement_duration_seconds", "SQL statement latency by fingerprint", ("statement",))
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("engine",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
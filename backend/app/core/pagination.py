@@ -0,0 +1,42 @@
+# app/core/pagination.py
+import base64
+import json
+import math
+from datetime import datetime
+from typing import Any, List
+
+from fastapi import HTTPException
+
+# Opaque keyset cursors: base64url(JSON list of the last row's sort-key values)
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    ).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str, n: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if not isinstance(values, list) or len(values) != n:
+        raise HTTPException(status_code=400, detail="invalid cursor")
+    return values
+
+def decode_datetime(value: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="invalid cursor")
+
+def decode_int(value: Any) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    raise HTTPException(status_code=400, detail="invalid cursor")
+
+def decode_float(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    raise HTTPException(status_code=400, detail="invalid cursor")
@@ -0,0 +1,84 @@
+# app/core/responses.py
+"""orjson-rendered responses for the {"ok": ..., "data": ...} envelope."""
+import hashlib
+import time
+from collections.abc import Mapping
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy.engine import Row
+
+from app.core.timing import request_timings_ctx
+
+def _default(obj: Any) -> Any:
+    # only called for types orjson doesn't handle natively
+    if isinstance(obj, Mapping):  # RowMapping
+        return dict(obj)
+    if isinstance(obj, Decimal):
+        # same as jsonable_encoder: integral -> int, otherwise float
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, Row):
+        return list(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class EnvelopeResponse(Response):
+    """orjson-rendered JSON response that books its serialization time on the current request."""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        t0 = time.perf_counter()
+        body = dumps(content)
+        t = request_timings_ctx.get()
+        if t is not None:
+            t.render_time += time.perf_counter() - t0
+        return body
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, so W/"x" matches "x")."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(t.strip().removeprefix("W/") == tag for t in if_none_match.split(","))
+
+class CachedBody:
+    """
+    A pre-serialized JSON body with a strong content-hash ETag, for endpoints served from
+    an in-process cache: respond() answers If-None-Match with 304 and otherwise sends
+    the stored bytes, never touching the serializer.
+    """
+    __slots__ = ("body", "etag", "cache_control", "expires_at")
+
+    def __init__(self, body: bytes, cache_control: str, expires_at: Optional[float] = None):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.cache_control = cache_control
+        self.expires_at = expires_at  # time.monotonic() deadline, if the owner uses one
+
+    def respond(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if etag_matches(request.headers.get("if-none-match"), self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(self.body, media_type="application/json", headers=headers)
+
+_UNSET = object()
+
+def ok(data: Any = _UNSET, *, status_code: int = 200, **extra: Any) -> EnvelopeResponse:
+    """{"ok": true, "data": data, **extra}; `data` is omitted when not given."""
+    body = {"ok": True}
+    if data is not _UNSET:
+        body["data"] = data
+    body.update(extra)
+    return EnvelopeResponse(body, status_code=status_code)
@@ -1,29 +1,45 @@
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
-from passlib.hash import bcrypt
 from fastapi import HTTPException, status, Request
+from app.core.cache import LRUCache
 from app.core.config import settings
+from app.core.hashing import hasher
 from typing import Any, Dict, Optional
+import hashlib
 import logging
 
 log = logging.getLogger(__name__)
 
+# Verified token payloads keyed by sha256(token); an entry lives until the token's `exp`
+token_cache = LRUCache(settings.JWT_CACHE_SIZE)
+
 def hash_password(pw: str) -> str:
-    return bcrypt.hash(pw)
+    return hasher.hash(pw)
 
 def verify_password(pw: str, hashed: str) -> bool:
-    return bcrypt.verify(pw, hashed)
+    return hasher.verify(pw, hashed)
 
 def make_token(payload: Dict[str, Any]) -> str:
     exp = datetime.utcnow() + timedelta(days=settings.JWT_EXPIRE_DAYS)
     to_encode = {**payload, "exp": exp}
     return jwt.encode(to_encode, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
 
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verified payload of `token` (cached until its exp), or None if invalid/expired."""
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+        except JWTError:
+            return None
+        exp = payload.get("exp")
+        if exp is not None:
+            token_cache.set(key, payload, expires_at=float(exp))
+    return dict(payload)  # callers get their own copy
+
 def get_payload_from_token(token: str) -> Optional[Dict[str, Any]]:
-    try:
-        return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-    except JWTError:
-        return None
+    return decode_token(token)
 
 def get_user_from_cookie(req: Request) -> Optional[Dict[str, Any]]:
     """
@@ -34,20 +50,10 @@ def get_user_from_cookie(req: Request) -> Optional[Dict[str, Any]]:
     token = req.cookies.get(cookie_name)
     if not token:
         return None
-
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[getattr(settings, "JWT_ALGORITHM", "HS256")],
-        )
-        # jose verifies `exp` automatically; if expired it raises, which we catch below.
-        return payload  # e.g. {"user_id": ..., "email": ..., "is_admin": ...}
-    except JWTError:
-        return None
+    return decode_token(token)  # e.g. {"user_id": ..., "email": ..., "is_admin": ...}
 
 
-def require_auth(request: Request) -> dict:
+def _request_token(request: Request) -> Optional[str]:
     token = None
 
     auth = request.headers.get("authorization") or ""
@@ -56,13 +62,21 @@ def require_auth(request: Request) -> dict:
 
     if not token:
         token = request.cookies.get("token")
+    return token or None
+
+def optional_auth(request: Request) -> Optional[Dict[str, Any]]:
+    """Payload of the request's token, or None when there is no valid one (never raises)."""
+    token = _request_token(request)
+    return decode_token(token) if token else None
+
+def require_auth(request: Request) -> dict:
+    token = _request_token(request)
 
     if not token:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
     
-    try:
-        payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
-    except Exception:
+    payload = decode_token(token)
+    if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unauthorized")
 
     return payload
@@ -0,0 +1,41 @@
+# app/core/timing.py
+"""Per-request SQL and render time, for the Server-Timing header and the SQL latency histogram."""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core import metrics
+from app.core.config import settings
+
+class RequestTimings:
+    __slots__ = ("db_count", "db_time", "render_time")
+
+    def __init__(self) -> None:
+        self.db_count = 0
+        self.db_time = 0.0       # seconds
+        self.render_time = 0.0   # seconds
+
+request_timings_ctx: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._timing_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, "_timing_start", None)
+    if start is None:
+        return
+    elapsed = time.perf_counter() - start
+    if settings.METRICS_ENABLED:
+        metrics.SQL_LATENCY.observe((metrics.fingerprint(statement),), elapsed)
+    t = request_timings_ctx.get()
+    if t is not None:
+        t.db_count += 1
+        t.db_time += elapsed
+
+def install_db_hooks(engine: Engine) -> None:
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
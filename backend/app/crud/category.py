@@ -0,0 +1,17 @@
+# app/crud/category.py
+from typing import List, Dict, Any, Iterable, Set
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+
+def list_categories(db: Session) -> List[Dict[str, Any]]:
+    rows = db.execute(text("""
+        SELECT category_id, name
+        FROM category
+        ORDER BY name
+    """)).mappings().all()
+    return [dict(r) for r in rows]
+
+def existing_category_ids(db: Session, ids: Iterable[int]) -> Set[int]:
+    rows = db.execute(text("SELECT category_id FROM category WHERE category_id = ANY(:ids)"),
+                      {"ids": list(ids)}).scalars()
+    return {int(c) for c in rows}
@@ -1,26 +1,28 @@
 # app/crud/question.py
-from typing import List, Dict, Any, Optional, Iterable
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.engine import RowMapping
 
 def list_questions(
     db: Session,
     *,
     category_id: Optional[int],
-    query_text: Optional[str],
     limit: int,
     offset: int,
-) -> List[Dict[str, Any]]:
+    after_id: Optional[int] = None,
+) -> Sequence[RowMapping]:
     where = ["1=1"]
     params: Dict[str, Any] = {"limit": limit, "offset": offset}
     if category_id is not None:
         where.append("qs.category_id = :cid")
         params["cid"] = category_id
-    if query_text:
-        where.append("qs.question ILIKE :qq")
-        params["qq"] = f"%{query_text}%"
+    if after_id is not None:
+        # keyset: continue below the last question_id of the previous page
+        where.append("qs.question_id < :after_id")
+        params["after_id"] = after_id
 
-    rows = db.execute(text(f"""
+    return db.execute(text(f"""
         SELECT
           qs.question_id,
           qs.description, 
@@ -33,7 +35,70 @@ def list_questions(
         ORDER BY qs.question_id DESC
         LIMIT :limit OFFSET :offset
     """), params).mappings().all()
-    return [dict(r) for r in rows]
+
+def search_questions(
+    db: Session,
+    *,
+    query_text: str,
+    category_id: Optional[int],
+    include_choice_text: bool,
+    limit: int,
+    offset: int,
+    after: Optional[Tuple[float, int]] = None,
+) -> Sequence[RowMapping]:
+    """
+    Full-text search over questions.search_tsv (and choice.search_tsv when
+    include_choice_text), ranked by ts_rank then question_id, both DESC. Each branch is
+    an index scan on its GIN index; a question matched only through a choice ranks at
+    half weight.
+    """
+    params: Dict[str, Any] = {"q": query_text, "limit": limit, "offset": offset}
+    cat_q = ""
+    cat_c = ""
+    if category_id is not None:
+        params["cid"] = category_id
+        cat_q = "AND qs.category_id = :cid"
+        cat_c = "AND cq.category_id = :cid"
+    choice_branch = ""
+    if include_choice_text:
+        choice_branch = f"""
+          UNION ALL
+          SELECT ch.question_id, ts_rank(ch.search_tsv, tsq.q)::float8 * 0.5
+          FROM choice ch
+          JOIN questions cq ON cq.question_id = ch.question_id
+          CROSS JOIN tsq
+          WHERE ch.search_tsv @@ tsq.q {cat_c}
+        """
+    after_sql = ""
+    if after is not None:
+        after_sql = "WHERE (h.rank, h.question_id) < (:after_rank, :after_id)"
+        params["after_rank"], params["after_id"] = after
+
+    return db.execute(text(f"""
+        WITH tsq AS (SELECT websearch_to_tsquery('english', :q) AS q),
+        hits AS (
+          SELECT qs.question_id, ts_rank(qs.search_tsv, tsq.q)::float8 AS rank
+          FROM questions qs CROSS JOIN tsq
+          WHERE qs.search_tsv @@ tsq.q {cat_q}
+          {choice_branch}
+        ),
+        ranked AS (
+          SELECT question_id, MAX(rank) AS rank FROM hits GROUP BY question_id
+        )
+        SELECT
+          qs.question_id,
+          qs.description,
+          qs.category_id,
+          cat.name AS category,
+          COALESCE(qs.is_active, TRUE) AS is_active,
+          h.rank
+        FROM ranked h
+        JOIN questions qs ON qs.question_id = h.question_id
+        JOIN category cat ON cat.category_id = qs.category_id
+        {after_sql}
+        ORDER BY h.rank DESC, h.question_id DESC
+        LIMIT :limit OFFSET :offset
+    """), params).mappings().all()
 
 def get_choices_for_questions(db: Session, ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
     if not ids:
@@ -50,7 +115,6 @@ def get_choices_for_questions(db: Session, ids: Iterable[int]) -> Dict[int, List
             "choiceId": r["choice_id"],
             "description": r["description"],
             "isCorrect": r["is_correct"],
-            "isActive": r["is_active"],
         })
     return by_q
 
@@ -89,47 +153,124 @@ def insert_choices(db: Session, *, question_id: int, choices: List[Dict[str, Any
         for c in choices
     ])
 
-def update_question_fields(
-    db: Session,
-    *,
-    question_id: int,
-    description: str,
-    category_id: int,
-    is_active: bool,
-) -> None:
+# ---- bulk import (COPY into a temp staging table, then one set-based merge) ----
+
+ImportRow = Tuple[int, int, str, bool, List[str], int]  # line, category_id, description, is_active, choices, correct (1-based)
+
+def create_import_staging(db: Session) -> None:
     db.execute(text("""
-        UPDATE questions
-           SET description = :desc,        
-               category_id = :cid,
-               is_active = :iact
-         WHERE question_id = :qid
-    """), {"desc": description, "cid": category_id, "iact": bool(is_active), "qid": question_id})
+        CREATE TEMP TABLE import_questions (
+          line        INT NOT NULL,
+          question_id BIGINT,
+          category_id BIGINT NOT NULL,
+          description TEXT NOT NULL,
+          is_active   BOOLEAN NOT NULL,
+          choices     TEXT[] NOT NULL,
+          correct     INT NOT NULL
+        ) ON COMMIT DROP
+    """))
 
-def clear_all_correct(db: Session, *, question_id: int) -> None:
-    db.execute(text("UPDATE choice SET is_correct = FALSE WHERE question_id = :qid"), {"qid": question_id})
+def copy_import_rows(db: Session, rows: Iterable[ImportRow]) -> int:
+    """Stream `rows` into import_questions over COPY on the session's connection."""
+    raw_conn = db.connection().connection.driver_connection
+    n = 0
+    with raw_conn.cursor() as cur:
+        with cur.copy(
+            "COPY import_questions (line, category_id, description, is_active, choices, correct) FROM STDIN"
+        ) as cp:
+            for row in rows:
+                cp.write_row(row)
+                n += 1
+    return n
 
-def upsert_choice(
+def merge_import(db: Session) -> List[int]:
+    """
+    Insert everything staged: question ids are drawn from the sequence up front so each
+    choice row can be tied to its question without a RETURNING round trip. Returns the
+    category ids touched.
+    """
+    db.execute(text("""
+        UPDATE import_questions
+           SET question_id = nextval(pg_get_serial_sequence('questions', 'question_id'))
+    """))
+    db.execute(text("""
+        INSERT INTO questions(question_id, category_id, description, is_active)
+        SELECT question_id, category_id, description, is_active
+        FROM import_questions
+        ORDER BY line
+    """))
+    db.execute(text("""
+        INSERT INTO choice(question_id, description, is_correct)
+        SELECT s.question_id, c.description, c.ord = s.correct
+        FROM import_questions s
+        CROSS JOIN LATERAL unnest(s.choices) WITH ORDINALITY AS c(description, ord)
+        ORDER BY s.line, c.ord
+    """))
+    return [int(c) for c in db.execute(text("SELECT DISTINCT category_id FROM import_questions")).scalars()]
+
+# ---- batch edits: a handful of set-based statements for any number of questions ----
+
+def lock_questions(db: Session, question_ids: Iterable[int]) -> Dict[int, int]:
+    """{question_id: category_id} for the ids that exist, row-locked until commit."""
+    rows = db.execute(text("""
+        SELECT question_id, category_id FROM questions
+        WHERE question_id = ANY(:ids)
+        ORDER BY question_id
+        FOR UPDATE
+    """), {"ids": list(question_ids)}).all()
+    return {int(q): int(c) for q, c in rows}
+
+def get_choice_owners(db: Session, choice_ids: Iterable[int]) -> Dict[int, int]:
+    rows = db.execute(text("SELECT choice_id, question_id FROM choice WHERE choice_id = ANY(:ids)"),
+                      {"ids": list(choice_ids)}).all()
+    return {int(c): int(q) for c, q in rows}
+
+def batch_update_questions(
     db: Session,
-    *,
-    question_id: int,
-    choice_id: Optional[int],
-    description: str,
-    is_correct: bool,
+    rows: List[Tuple[int, Optional[str], Optional[int], Optional[bool]]],
 ) -> None:
-    if choice_id is not None:
-        # UPDATE existing
-        db.execute(text("""
-            UPDATE choice
-               SET description = :desc,
-                   is_correct  = :isc
-             WHERE question_id = :qid AND choice_id = :cid
-        """), {"qid": question_id, "cid": choice_id, "desc": description, "isc": bool(is_correct)})
-    else:
-        # INSERT new
+    """rows: (question_id, description, category_id, is_active); None keeps the current value."""
+    if not rows:
+        return
+    qids, descs, cids, acts = (list(col) for col in zip(*rows))
+    db.execute(text("""
+        UPDATE questions q
+           SET description = COALESCE(v.description, q.description),
+               category_id = COALESCE(v.category_id, q.category_id),
+               is_active   = COALESCE(v.is_active, q.is_active)
+          FROM unnest(CAST(:qids AS bigint[]), CAST(:descs AS text[]),
+                      CAST(:cids AS bigint[]), CAST(:acts AS boolean[]))
+               AS v(question_id, description, category_id, is_active)
+         WHERE q.question_id = v.question_id
+    """), {"qids": qids, "descs": descs, "cids": cids, "acts": acts})
+
+def clear_correct(db: Session, question_ids: List[int]) -> None:
+    # first, so the one-correct-per-question unique index holds while choices are rewritten
+    if question_ids:
+        db.execute(text("UPDATE choice SET is_correct = FALSE WHERE question_id = ANY(:ids) AND is_correct"),
+                   {"ids": question_ids})
+
+def batch_update_choices(db: Session, rows: List[Tuple[int, str, bool]]) -> None:
+    """rows: (choice_id, description, is_correct) of existing choices."""
+    if not rows:
+        return
+    ids, descs, flags = (list(col) for col in zip(*rows))
+    db.execute(text("""
+        UPDATE choice c
+           SET description = v.description,
+               is_correct  = v.is_correct
+          FROM unnest(CAST(:ids AS bigint[]), CAST(:descs AS text[]), CAST(:flags AS boolean[]))
+               AS v(choice_id, description, is_correct)
+         WHERE c.choice_id = v.choice_id
+    """), {"ids": ids, "descs": descs, "flags": flags})
+
+def insert_choice_rows(db: Session, rows: List[Tuple[int, str, bool]]) -> None:
+    """rows: (question_id, description, is_correct); one executemany."""
+    if rows:
         db.execute(text("""
             INSERT INTO choice (question_id, description, is_correct)
             VALUES (:qid, :desc, :isc)
-        """), {"qid": question_id, "desc": description, "isc": bool(is_correct)})
+        """), [{"qid": q, "desc": d, "isc": c} for q, d, c in rows])
 
 def delete_choices(db: Session, *, question_id: int) -> None:
     db.execute(text("DELETE FROM choice WHERE question_id = :qid"), {"qid": question_id})
@@ -138,6 +279,39 @@ def set_question_status(db: Session, *, question_id: int, is_active: bool) -> Op
     r = db.execute(text("""
         UPDATE questions SET is_active = :iact
         WHERE question_id = :qid
-        RETURNING question_id, is_active
+        RETURNING question_id, is_active, category_id
     """), {"iact": bool(is_active), "qid": question_id}).mappings().first()
     return dict(r) if r else None
+
+# ---- question bank snapshot (services/question_bank.py) ----
+
+def bump_bank_version(db: Session, category_ids: Iterable[int]) -> None:
+    cids = sorted({int(c) for c in category_ids if c is not None})
+    if not cids:
+        return
+    db.execute(text("""
+        INSERT INTO question_bank_version(category_id, version)
+        SELECT cid, 1 FROM unnest(CAST(:cids AS bigint[])) AS cid
+        ON CONFLICT (category_id) DO UPDATE
+          SET version = question_bank_version.version + 1
+    """), {"cids": cids})
+
+def get_bank_version(db: Session, category_id: int) -> int:
+    v = db.execute(text("SELECT version FROM question_bank_version WHERE category_id = :cid"),
+                   {"cid": category_id}).scalar_one_or_none()
+    return int(v or 0)
+
+def count_active_questions(db: Session, category_id: int) -> int:
+    return int(db.execute(text("""
+        SELECT COUNT(*) FROM questions WHERE category_id = :cid AND is_active
+    """), {"cid": category_id}).scalar_one())
+
+def get_active_bank_rows(db: Session, category_id: int):
+    """One row per (active question, choice), grouped by question. Returned as raw tuples."""
+    return db.execute(text("""
+        SELECT q.question_id, q.description, c.choice_id, c.description, c.is_correct
+        FROM questions q
+        JOIN choice c ON c.question_id = q.question_id
+        WHERE q.category_id = :cid AND q.is_active
+        ORDER BY q.question_id, c.choice_id
+    """), {"cid": category_id}).all()
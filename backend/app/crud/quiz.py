@@ -1,9 +1,10 @@
 # app/crud/quiz.py
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import Iterable, List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 
-# Random 5 questions in a category, with randomized options
+# Random 5 questions in a category, with randomized options.
+# Sorts the whole category by random(); only used for small categories (see sample_questions_with_options).
 def get_random_questions_with_options(db: Session, category_id: int, limit: int = 5) -> List[Dict[str, Any]]:
     rows = db.execute(text("""
         SELECT
@@ -15,43 +16,117 @@ def get_random_questions_with_options(db: Session, category_id: int, limit: int
           ) AS options
         FROM questions q
         JOIN choice c ON c.question_id = q.question_id
-        WHERE q.category_id = :cid
+        WHERE q.category_id = :cid AND q.is_active
         GROUP BY q.question_id, q.description
         ORDER BY random()
         LIMIT :lim
     """), {"cid": category_id, "lim": limit}).mappings().all()
     return [dict(r) for r in rows]
 
-def insert_quiz(db: Session, *, user_id: int, category_id: int, t_start, t_end) -> int:
-    row = db.execute(text("""
-        INSERT INTO quizzes(user_id, category_id, name, time_start, time_end, correct_rate)
-        VALUES (:uid, :cid, 'Quiz', :ts, :te, 0)
-        RETURNING quiz_id
-    """), {"uid": user_id, "cid": category_id, "ts": t_start, "te": t_end}).mappings().first()
-    return int(row["quiz_id"])
-
-def insert_user_answers(db: Session, quiz_id: int, answers: Iterable[dict]) -> None:
-    # answers: [{questionId, choiceId}, ...]
-    if not answers:
-        return
-    values = [{"quiz_id": quiz_id, "qid": a["questionId"], "cid": a["choiceId"]} for a in answers]
-    db.execute(text("""
-        INSERT INTO quizquestion(quiz_id, question_id, user_choice_id)
-        VALUES (:quiz_id, :qid, :cid)
-    """), values)
-
-def compute_score(db: Session, quiz_id: int) -> float:
-    score = db.execute(text("""
-        SELECT COALESCE(AVG(CASE WHEN c.is_correct THEN 1.0 ELSE 0.0 END), 0) AS score
-        FROM quizquestion qq
-        LEFT JOIN choice c ON c.choice_id = qq.user_choice_id
-        WHERE qq.quiz_id = :id
-    """), {"id": quiz_id}).scalar_one()
-    return float(score or 0.0)
+def sample_questions_with_options(
+    db: Session, category_id: int, keys: List[float], limit: int = 5
+) -> List[Dict[str, Any]]:
+    """
+    Random-key sampling: each key in `keys` probes idx_question_category_randkey for the
+    first active question with rand_key >= key (one index seek per probe), duplicates are
+    dropped and the first `limit` picks get their shuffled options. Cost depends on
+    len(keys), not on the size of the category. May return fewer than `limit` rows when
+    probes collide or run past the largest key; callers fall back to the full sort then.
+    The sample is approximate: a question is picked in proportion to the gap between its
+    rand_key and the next smaller one, so questions after wide gaps come up more often.
+    """
+    rows = db.execute(text("""
+        WITH probes AS (
+          SELECT p.ord, pick.question_id
+          FROM unnest(CAST(:keys AS float8[])) WITH ORDINALITY AS p(key, ord)
+          CROSS JOIN LATERAL (
+            SELECT q.question_id
+            FROM questions q
+            WHERE q.category_id = :cid AND q.is_active AND q.rand_key >= p.key
+            ORDER BY q.rand_key
+            LIMIT 1
+          ) pick
+        ),
+        picked AS (
+          SELECT question_id, MIN(ord) AS ord
+          FROM probes
+          GROUP BY question_id
+          ORDER BY MIN(ord)
+          LIMIT :lim
+        )
+        SELECT
+          q.question_id,
+          q.description AS question,
+          json_agg(
+            json_build_object('choiceId', c.choice_id, 'description', c.description)
+            ORDER BY random()
+          ) AS options
+        FROM picked p
+        JOIN questions q ON q.question_id = p.question_id
+        JOIN choice c ON c.question_id = q.question_id
+        GROUP BY p.ord, q.question_id, q.description
+        ORDER BY p.ord
+    """), {"cid": category_id, "keys": keys, "lim": limit}).mappings().all()
+    return [dict(r) for r in rows]
 
-def update_quiz_score(db: Session, quiz_id: int, score: float) -> None:
-    db.execute(text("UPDATE quizzes SET correct_rate = :r WHERE quiz_id = :id"),
-               {"r": score, "id": quiz_id})
+def insert_quiz_with_answers(
+    db: Session,
+    *,
+    user_id: int,
+    category_id: int,
+    t_start,
+    t_end,
+    answers: List[dict],
+) -> Tuple[int, float]:
+    """
+    Whole submission in one statement: insert the quiz with its final correct_rate,
+    bulk-insert its quizquestion rows and fold the score into user_category_stats.
+    The score is read from choice.is_correct in the same statement, so it always
+    matches the committed answer key.
+    """
+    row = db.execute(text("""
+        WITH ans AS (
+          SELECT a.question_id, a.choice_id
+          FROM unnest(CAST(:qids AS bigint[]), CAST(:cids AS bigint[])) AS a(question_id, choice_id)
+        ),
+        quiz AS (
+          INSERT INTO quizzes(user_id, category_id, name, time_start, time_end, correct_rate, question_count)
+          VALUES (:uid, :cid, 'Quiz', :ts, :te,
+            (SELECT COALESCE(AVG(CASE WHEN c.is_correct THEN 1.0 ELSE 0.0 END), 0)
+             FROM ans LEFT JOIN choice c ON c.choice_id = ans.choice_id),
+            cardinality(CAST(:qids AS bigint[])))
+          RETURNING quiz_id, correct_rate, time_start
+        ),
+        ins AS (
+          INSERT INTO quizquestion(quiz_id, question_id, user_choice_id)
+          SELECT quiz.quiz_id, ans.question_id, ans.choice_id
+          FROM quiz, ans
+        ),
+        stats AS (
+          INSERT INTO user_category_stats AS s
+            (user_id, category_id, attempts, score_sum, best_score, best_at, last_at)
+          SELECT :uid, :cid, 1, quiz.correct_rate, quiz.correct_rate, quiz.time_start, quiz.time_start
+          FROM quiz
+          ON CONFLICT (user_id, category_id) DO UPDATE SET
+            -- same rows as stats.rebuild_user_category_stats: best_at is the earliest
+            -- time_start among the best scores, last_at the latest time_start
+            attempts   = s.attempts + 1,
+            score_sum  = s.score_sum + EXCLUDED.score_sum,
+            best_at    = CASE
+                           WHEN EXCLUDED.best_score > s.best_score THEN EXCLUDED.best_at
+                           WHEN EXCLUDED.best_score = s.best_score THEN LEAST(s.best_at, EXCLUDED.best_at)
+                           ELSE s.best_at
+                         END,
+            best_score = GREATEST(s.best_score, EXCLUDED.best_score),
+            last_at    = GREATEST(s.last_at, EXCLUDED.last_at)
+        )
+        SELECT quiz_id, correct_rate FROM quiz
+    """), {
+        "uid": user_id, "cid": category_id, "ts": t_start, "te": t_end,
+        "qids": [a["questionId"] for a in answers],
+        "cids": [a["choiceId"] for a in answers],
+    }).mappings().first()
+    return int(row["quiz_id"]), float(row["correct_rate"] or 0.0)
 
 def get_quiz_header(db: Session, quiz_id: int) -> dict | None:
     row = db.execute(text("""
@@ -78,6 +153,51 @@ def get_quiz_items_with_all_choices(db: Session, quiz_id: int) -> List[Dict[str,
     """), {"id": quiz_id}).mappings().all()
     return [dict(r) for r in rows]
 
+def get_quiz_result_nested_json(db: Session, quiz_id: int) -> Optional[str]:
+    """
+    The whole nested result ({quiz, items: [{..., is_correct, choices: [...]}],
+    correctness_rate}) built by Postgres in one statement and returned as JSON text,
+    so it can be embedded in the response body without a decode/encode round trip.
+    """
+    return db.execute(text("""
+        SELECT json_build_object(
+          'quiz', json_build_object(
+            'quiz_id', q.quiz_id,
+            'time_start', q.time_start,
+            'time_end', q.time_end,
+            'correct_rate', q.correct_rate,
+            'category', c.name
+          ),
+          'items', COALESCE(it.items, '[]'::json),
+          'correctness_rate', COALESCE(q.correct_rate, 0)
+        )::text
+        FROM quizzes q
+        JOIN category c ON c.category_id = q.category_id
+        LEFT JOIN LATERAL (
+          SELECT json_agg(json_build_object(
+                   'question_id', qq.question_id,
+                   'question', qs.description,
+                   'user_choice_id', qq.user_choice_id,
+                   'is_correct', COALESCE(uc.is_correct, FALSE),
+                   'choices', ch.choices
+                 ) ORDER BY qq.question_id) AS items
+          FROM quizquestion qq
+          JOIN questions qs ON qs.question_id = qq.question_id
+          LEFT JOIN choice uc ON uc.choice_id = qq.user_choice_id
+          CROSS JOIN LATERAL (
+            SELECT json_agg(json_build_object(
+                     'choice_id', x.choice_id,
+                     'description', x.description,
+                     'is_correct', x.is_correct
+                   ) ORDER BY x.choice_id) AS choices
+            FROM choice x
+            WHERE x.question_id = qq.question_id
+          ) ch
+          WHERE qq.quiz_id = q.quiz_id
+        ) it ON TRUE
+        WHERE q.quiz_id = :id
+    """), {"id": quiz_id}).scalar_one_or_none()
+
 def list_quizzes_for_user(db: Session, user_id: int) -> List[Dict[str, Any]]:
     rows = db.execute(text("""
         SELECT quiz_id, user_id, category_id, name, time_start, time_end, correct_rate
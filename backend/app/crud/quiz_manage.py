@@ -1,24 +1,37 @@
 # app/crud/quiz_manage.py
-from typing import Optional, Dict, Any, List
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterator, List, Sequence, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from sqlalchemy.engine import RowMapping
 
-def list_quizzes(
-    db: Session,
-    *,
-    category_id: Optional[int],
-    user_id: Optional[int],
-    limit: int,
-    offset: int,
-) -> List[Dict[str, Any]]:
+def _quiz_filters(*, category_id: Optional[int], user_id: Optional[int]) -> Tuple[List[str], Dict[str, Any]]:
+    """WHERE terms (on alias q = quizzes) shared by the admin listing and export."""
     where = ["1=1"]
-    params: Dict[str, Any] = {"limit": limit, "offset": offset}
+    params: Dict[str, Any] = {}
     if category_id is not None:
         where.append("q.category_id = :cid")
         params["cid"] = category_id
     if user_id is not None:
         where.append("q.user_id = :uid")
         params["uid"] = user_id
+    return where, params
+
+def list_quizzes(
+    db: Session,
+    *,
+    category_id: Optional[int],
+    user_id: Optional[int],
+    limit: int,
+    offset: int,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> Sequence[RowMapping]:
+    where, params = _quiz_filters(category_id=category_id, user_id=user_id)
+    params.update(limit=limit, offset=offset)
+    if after is not None:
+        # keyset: rows strictly after (time_start, quiz_id) of the previous page, in DESC order
+        where.append("(q.time_start, q.quiz_id) < (:after_ts, :after_id)")
+        params["after_ts"], params["after_id"] = after
 
     sql = f"""
       SELECT
@@ -31,41 +44,113 @@ def list_quizzes(
         u.email AS user_email,
         c.category_id,
         c.name AS category,
-        qc.question_count
+        q.question_count
       FROM quizzes q                              
       JOIN users u ON u.user_id = q.user_id
       JOIN category c ON c.category_id = q.category_id
-      LEFT JOIN LATERAL (
-        SELECT COUNT(*)::int AS question_count
-        FROM quizquestion qq
-        WHERE qq.quiz_id = q.quiz_id
-      ) qc ON TRUE
-      WHERE 1=1
-      ORDER BY q.time_start DESC
+      WHERE {" AND ".join(where)}
+      ORDER BY q.time_start DESC, q.quiz_id DESC
       LIMIT :limit OFFSET :offset;
     """
-    rows = db.execute(text(sql), params).mappings().all()
-    return [dict(r) for r in rows]
+    # RowMappings go to the response as-is (app.core.responses serializes them)
+    return db.execute(text(sql), params).mappings().all()
 
-# (Optional) If you want server-side pagination metadata, expose a count:
-def count_quizzes(
+def stream_quizzes(
     db: Session,
     *,
     category_id: Optional[int],
     user_id: Optional[int],
-) -> int:
-    where = ["1=1"]
-    params: Dict[str, Any] = {}
-    if category_id is not None:
-        where.append("category_id = :cid")
-        params["cid"] = category_id
-    if user_id is not None:
-        where.append("user_id = :uid")
-        params["uid"] = user_id
+    include_answers: bool,
+    batch_size: int = 1000,
+) -> Iterator[RowMapping]:
+    """
+    Same rows and order as list_quizzes, without paging, read through a server-side
+    cursor `batch_size` rows at a time. With include_answers each row also carries
+    `answers`: [{question_id, choice_id, is_correct}, ...] in question order.
+    """
+    where, params = _quiz_filters(category_id=category_id, user_id=user_id)
+    answers_sql = ""
+    answers_col = ""
+    if include_answers:
+        answers_col = ", qa.answers"
+        answers_sql = """
+      LEFT JOIN LATERAL (
+        SELECT COALESCE(json_agg(json_build_object(
+                 'question_id', qq.question_id,
+                 'choice_id', qq.user_choice_id,
+                 'is_correct', COALESCE(ch.is_correct, FALSE)
+               ) ORDER BY qq.qq_id), '[]'::json) AS answers
+        FROM quizquestion qq
+        LEFT JOIN choice ch ON ch.choice_id = qq.user_choice_id
+        WHERE qq.quiz_id = q.quiz_id
+      ) qa ON TRUE"""
 
     sql = f"""
-      SELECT COUNT(*)::int AS n
-      FROM quizzes
+      SELECT
+        q.quiz_id,
+        q.time_start,
+        q.time_end,
+        q.correct_rate,
+        u.user_id,
+        concat_ws(' ', u.firstname, u.lastname) AS user_full_name,
+        u.email AS user_email,
+        c.category_id,
+        c.name AS category,
+        q.question_count{answers_col}
+      FROM quizzes q
+      JOIN users u ON u.user_id = q.user_id
+      JOIN category c ON c.category_id = q.category_id{answers_sql}
       WHERE {" AND ".join(where)}
+      ORDER BY q.time_start DESC, q.quiz_id DESC
     """
-    return int(db.execute(text(sql), params).scalar_one())
+    stmt = text(sql).execution_options(stream_results=True, yield_per=batch_size)
+    yield from db.execute(stmt, params).mappings()
+
+def count_quizzes(
+    db: Session,
+    *,
+    category_id: Optional[int],
+    user_id: Optional[int],
+) -> Tuple[int, bool]:
+    """
+    (total, exact) for the admin listing filters. One filter: a primary-key read of
+    quiz_counts. Both: a count over that user's quizzes on idx_quiz_user
+    (user_category_stats.attempts is not decremented when quizzes are deleted).
+    Unfiltered, it is the planner's row estimate for quizzes (exact=False) unless the
+    table has never been analyzed.
+    """
+    if category_id is not None and user_id is not None:
+        n = db.execute(text("""
+            SELECT COUNT(*) FROM quizzes WHERE user_id = :uid AND category_id = :cid
+        """), {"uid": user_id, "cid": category_id}).scalar_one()
+        return int(n), True
+    if category_id is not None or user_id is not None:
+        scope, key = ("category", category_id) if category_id is not None else ("user", user_id)
+        n = db.execute(text("SELECT n FROM quiz_counts WHERE scope = :scope AND id = :id"),
+                       {"scope": scope, "id": key}).scalar_one_or_none()
+        return int(n or 0), True
+
+    est = db.execute(text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'quizzes'::regclass")).scalar_one()
+    if est >= 0:
+        return int(est), False
+    # reltuples = -1: never vacuumed/analyzed, so probably small enough to count
+    return int(db.execute(text("SELECT COUNT(*) FROM quizzes")).scalar_one()), True
+
+def rebuild_quiz_counts(db: Session) -> int:
+    """Recompute quiz_counts from quizzes under an EXCLUSIVE lock (see rebuild_user_category_stats)."""
+    db.execute(text("LOCK TABLE quiz_counts IN EXCLUSIVE MODE"))
+    db.execute(text("DELETE FROM quiz_counts"))
+    return db.execute(text("""
+        INSERT INTO quiz_counts(scope, id, n)
+        SELECT 'category', category_id, COUNT(*) FROM quizzes GROUP BY category_id
+        UNION ALL
+        SELECT 'user', user_id, COUNT(*) FROM quizzes GROUP BY user_id
+    """)).rowcount
+
+def backfill_question_counts(db: Session) -> int:
+    """Set quizzes.question_count where it disagrees with quizquestion (rows from before the column)."""
+    return db.execute(text("""
+        UPDATE quizzes q SET question_count = c.n
+        FROM (SELECT quiz_id, COUNT(*)::int AS n FROM quizquestion GROUP BY quiz_id) c
+        WHERE c.quiz_id = q.quiz_id AND q.question_count <> c.n
+    """)).rowcount
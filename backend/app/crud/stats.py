@@ -0,0 +1,76 @@
+# app/crud/stats.py
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+
+def get_user_stats(db: Session, user_id: int, category_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    params: Dict[str, Any] = {"uid": user_id}
+    cat_sql = ""
+    if category_id is not None:
+        cat_sql = "AND s.category_id = :cid"
+        params["cid"] = category_id
+    rows = db.execute(text(f"""
+        SELECT
+          s.category_id,
+          c.name AS category,
+          s.attempts,
+          s.score_sum / NULLIF(s.attempts, 0) AS mean_score,
+          s.best_score,
+          s.best_at,
+          s.last_at
+        FROM user_category_stats s
+        JOIN category c ON c.category_id = s.category_id
+        WHERE s.user_id = :uid {cat_sql}
+        ORDER BY c.name
+    """), params).mappings().all()
+    return [dict(r) for r in rows]
+
+def get_leaderboard(db: Session, category_id: int, limit: int) -> List[Dict[str, Any]]:
+    # reads the first `limit` entries of idx_stats_leaderboard; ties go to whoever got there first
+    rows = db.execute(text("""
+        SELECT
+          s.user_id,
+          concat_ws(' ', u.firstname, u.lastname) AS user_full_name,
+          s.best_score,
+          s.best_at,
+          s.attempts,
+          s.score_sum / NULLIF(s.attempts, 0) AS mean_score
+        FROM user_category_stats s
+        JOIN users u ON u.user_id = s.user_id
+        WHERE s.category_id = :cid
+        ORDER BY s.best_score DESC, s.best_at, s.user_id
+        LIMIT :limit
+    """), {"cid": category_id, "limit": limit}).mappings().all()
+    return [dict(r) for r in rows]
+
+def rebuild_user_category_stats(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recompute the aggregates from quizzes (all users, or one). Takes an EXCLUSIVE lock
+    on the table so concurrent submissions wait and are folded in after the rebuild
+    rather than lost. Run inside a transaction; returns the number of rows written.
+    """
+    params: Dict[str, Any] = {}
+    user_sql = ""
+    if user_id is not None:
+        user_sql = "WHERE user_id = :uid"
+        params["uid"] = user_id
+    db.execute(text("LOCK TABLE user_category_stats IN EXCLUSIVE MODE"))
+    db.execute(text(f"DELETE FROM user_category_stats {user_sql}"), params)
+    return db.execute(text(f"""
+        INSERT INTO user_category_stats
+          (user_id, category_id, attempts, score_sum, best_score, best_at, last_at)
+        SELECT
+          user_id,
+          category_id,
+          COUNT(*),
+          SUM(score),
+          MAX(score),
+          (array_agg(time_start ORDER BY score DESC, time_start))[1],
+          MAX(time_start)
+        FROM (
+          SELECT user_id, category_id, COALESCE(correct_rate, 0) AS score, time_start
+          FROM quizzes
+          {user_sql}
+        ) z
+        GROUP BY user_id, category_id
+    """), params).rowcount
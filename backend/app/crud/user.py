@@ -10,6 +10,9 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     return db.get(User, user_id)
 
+def get_user_is_active(db: Session, user_id: int) -> Optional[bool]:
+    return db.execute(select(User.is_active).where(User.user_id == user_id)).scalar_one_or_none()
+
 def create_user(
     db: Session,
     *,
@@ -42,6 +45,13 @@ def set_user_status(db: Session, user_id: int, is_active: bool) -> Optional[User
     db.flush()
     return db.get(User, user_id)
 
+def update_password_hash(db: Session, user_id: int, password_hash: str) -> None:
+    db.execute(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(password_hash=password_hash)
+    )
+
 def list_users(db: Session) -> List[Dict[str, Any]]:
     rows = db.execute(text("""
         SELECT
@@ -0,0 +1,70 @@
+# app/db/listener.py
+"""Postgres LISTEN/NOTIFY fan-in for cross-worker cache invalidation."""
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+import psycopg
+from psycopg import sql
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import raw
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[[Optional[str]], None]
+
+_handlers: Dict[str, List[Handler]] = {}
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+def subscribe(channel: str, handler: Handler) -> None:
+    """handler(payload); payload is None after a reconnect, when notifications may have been missed."""
+    _handlers.setdefault(channel, []).append(handler)
+
+def notify(db: Session, channel: str, payload: str) -> None:
+    """Queue a NOTIFY on `db`'s transaction; Postgres delivers it on commit."""
+    db.execute(text("SELECT pg_notify(:ch, :p)"), {"ch": channel, "p": payload})
+
+def _dispatch(channel: str, payload: Optional[str]) -> None:
+    for handler in _handlers.get(channel, ()):
+        try:
+            handler(payload)
+        except Exception:
+            log.exception("notify handler for %s failed", channel)
+
+def _run() -> None:
+    # LISTEN needs a session-pinned connection, so go around PgBouncer when configured
+    url = (settings.DATABASE_DIRECT_URL or raw).replace("postgresql+psycopg://", "postgresql://", 1)
+    url = url.replace("postgres://", "postgresql://", 1)
+    backoff = 1.0
+    while not _stop.is_set():
+        try:
+            with psycopg.connect(url, autocommit=True) as conn:
+                listening = set()
+                backoff = 1.0
+                while not _stop.is_set():
+                    for channel in list(_handlers):
+                        if channel not in listening:
+                            conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+                            listening.add(channel)
+                            _dispatch(channel, None)  # anything before this point may be missed
+                    for n in conn.notifies(timeout=1.0):
+                        _dispatch(n.channel, n.payload)
+        except Exception:
+            log.warning("LISTEN connection lost, retrying in %.0fs", backoff, exc_info=True)
+            _stop.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+def start() -> None:
+    global _thread
+    if not settings.DB_LISTEN or not _handlers or (_thread and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="db-listener", daemon=True)
+    _thread.start()
+
+def stop() -> None:
+    _stop.set()
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
-from sqlalchemy import BigInteger, Text, Boolean, ForeignKey, DateTime, func, Identity
+from sqlalchemy import BigInteger, Text, Boolean, ForeignKey, DateTime, Float, func, Identity
 
 class Base(DeclarativeBase): pass
 
@@ -33,6 +33,7 @@ class Question(Base):
     description: Mapped[str] = mapped_column(Text, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    rand_key: Mapped[float] = mapped_column(Float, server_default=func.random(), nullable=False)
 
 class Choice(Base):
     __tablename__ = "choice"
@@ -0,0 +1,161 @@
+# app/db/pool.py
+"""Connection pool options and per-engine checkout/churn instrumentation."""
+import logging
+import time
+from typing import Any, Dict
+
+import anyio.to_thread
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DisconnectionError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core import metrics
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+CONNECTS = metrics.Counter("db_pool_connects_total", "Physical connections opened", ("engine",))
+CLOSES = metrics.Counter("db_pool_closes_total", "Physical connections closed", ("engine",))
+INVALIDATIONS = metrics.Counter(
+    "db_pool_invalidations_total", "Connections invalidated (errors, failed pings)", ("engine",),
+)
+PINGS = metrics.Counter("db_pool_idle_pings_total", "Liveness pings of idle connections", ("engine", "result"))
+
+def _observe_checkout(pool: "_LabelledPool", t0: float) -> None:
+    waited = time.perf_counter() - t0
+    metrics.POOL_CHECKOUT_WAIT.observe((pool.engine_label,), waited)
+    if waited >= settings.DB_POOL_SLOW_CHECKOUT_SECONDS:
+        log.warning("waited %.2fs for a DB connection on %s (%s)", waited, pool.engine_label, pool.status())
+
+# QueuePool variants that record how long a checkout waited (including connect time
+# when the pool had to open a new connection) into db_pool_checkout_wait_seconds.
+
+class _LabelledPool:
+    engine_label = "primary"  # set by install_pool_hooks
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting under the same engine
+        new = super().recreate()
+        new.engine_label = self.engine_label
+        return new
+
+class TimedQueuePool(_LabelledPool, QueuePool):
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _observe_checkout(self, t0)
+
+class TimedAsyncQueuePool(_LabelledPool, AsyncAdaptedQueuePool):
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _observe_checkout(self, t0)
+
+def engine_options(*, is_async: bool = False) -> Dict[str, Any]:
+    """Keyword arguments for create_engine / create_async_engine."""
+    opts: Dict[str, Any] = {
+        "poolclass": TimedAsyncQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_PGBOUNCER:
+        opts["connect_args"] = {"prepare_threshold": None}
+    return opts
+
+def install_pool_hooks(engine: Engine, label: str) -> None:
+    """`label` names the engine in the pool metrics, e.g. "primary" or "primary-async"."""
+    idle_ping = settings.DB_POOL_IDLE_PING_SECONDS
+    engine.pool.engine_label = label
+    labels = (label,)
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_conn, record):
+        CONNECTS.inc(labels)
+
+    @event.listens_for(engine, "close")
+    def _close(dbapi_conn, record):
+        CLOSES.inc(labels)
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_conn, record, exc):
+        INVALIDATIONS.inc(labels)
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_conn, record):
+        record.info["idle_since"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_conn, record, proxy):
+        idle_since = record.info.pop("idle_since", None)
+        if idle_ping < 0 or idle_since is None or time.monotonic() - idle_since < idle_ping:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_conn)
+        except Exception:
+            PINGS.inc((label, "failed"))
+            # the pool discards this connection and retries the checkout with a new one
+            raise DisconnectionError("idle connection failed liveness ping")
+        PINGS.inc((label, "ok"))
+
+def _threadpool_tokens() -> Any:
+    # the limiter belongs to the running event loop; None when called from elsewhere
+    try:
+        return anyio.to_thread.current_default_thread_limiter().total_tokens
+    except RuntimeError:
+        return None
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """Snapshot for GET /admin/db/pool: utilization, checkout wait and connection churn of one engine."""
+    pool = engine.pool
+    label = getattr(pool, "engine_label", "primary")
+    capacity = pool.size() + max(settings.DB_MAX_OVERFLOW, 0)
+    checked_out = pool.checkedout()
+    wait_count, wait_sum = metrics.POOL_CHECKOUT_WAIT.summary((label,))
+    pings = {result: n for (eng, result), n in PINGS.values().items() if eng == label}
+    return {
+        "engine": label,
+        "pool": {
+            "size": pool.size(),
+            "maxOverflow": settings.DB_MAX_OVERFLOW,
+            "capacity": capacity,
+            "checkedOut": checked_out,
+            "idle": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "utilization": checked_out / capacity if capacity else None,
+            "threadpoolTokens": _threadpool_tokens(),
+            "pgbouncer": settings.DB_PGBOUNCER,
+        },
+        "checkoutWait": {
+            "count": int(wait_count),
+            "avgMs": wait_sum / wait_count * 1000 if wait_count else 0.0,
+            "buckets": metrics.POOL_CHECKOUT_WAIT.cumulative((label,)),
+        },
+        "churn": {
+            "connects": int(CONNECTS.values().get((label,), 0)),
+            "closes": int(CLOSES.values().get((label,), 0)),
+            "invalidations": int(INVALIDATIONS.values().get((label,), 0)),
+            "idlePingsOk": int(pings.get("ok", 0)),
+            "idlePingsFailed": int(pings.get("failed", 0)),
+        },
+    }
+
+def log_pool_sizing(engine: Engine) -> None:
+    """Called at startup: warn when the sync pool can't serve every threadpool thread at once."""
+    tokens = _threadpool_tokens()
+    capacity = engine.pool.size() + max(settings.DB_MAX_OVERFLOW, 0)
+    if tokens is not None and capacity < tokens:
+        log.warning(
+            "DB pool capacity %d (DB_POOL_SIZE + DB_MAX_OVERFLOW) < %d threadpool threads: "
+            "under load requests will queue on checkout (up to DB_POOL_TIMEOUT=%ss)",
+            capacity, tokens, settings.DB_POOL_TIMEOUT,
+        )
+    if settings.DB_PGBOUNCER and settings.DB_LISTEN and not settings.DATABASE_DIRECT_URL:
+        log.warning("DB_PGBOUNCER without DATABASE_DIRECT_URL: LISTEN does not work through transaction pooling")
@@ -0,0 +1,250 @@
+# app/db/replicas.py
+"""Read replicas for read-only endpoints: round-robin over healthy replicas, falling back to the primary."""
+import itertools
+import logging
+import threading
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.core import metrics
+from app.core.config import settings
+from app.core.security import optional_auth
+from app.core.timing import install_db_hooks
+from app.db import listener
+from app.db.pool import engine_options, install_pool_hooks
+from app.db.session import AnySession, async_engine, engine, psycopg_url
+
+log = logging.getLogger(__name__)
+
+STICKY_CHANNEL = "read_after_write"
+
+READ_SESSIONS = metrics.Counter("db_read_sessions_total", "Read sessions by the engine they were routed to", ("target",))
+
+# Seconds the replica is behind; 0 on a primary (two independent instances in dev) and
+# on a standby that has replayed everything it received.
+LAG_SQL = text("""
+    SELECT CASE
+      WHEN NOT pg_is_in_recovery() THEN 0
+      WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+      ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+def _replica_options(*, is_async: bool) -> Dict[str, Any]:
+    opts = engine_options(is_async=is_async)
+    opts["connect_args"] = {**opts.get("connect_args", {}), "connect_timeout": settings.REPLICA_CONNECT_TIMEOUT}
+    return opts
+
+class Replica:
+    def __init__(self, url: str):
+        url = psycopg_url(url)
+        self.engine = create_engine(url, future=True, **_replica_options(is_async=False))
+        self.async_engine = (
+            create_async_engine(url, **_replica_options(is_async=True)) if settings.DB_ASYNC else None
+        )
+        u = self.engine.url
+        self.name = f"{u.host}:{u.port or 5432}/{u.database}"
+        self.down_until = 0.0
+        self.reason: Optional[str] = None
+        self.lag: Optional[float] = None
+        for eng, label in ((self.engine, self.name),
+                           (self.async_engine.sync_engine if self.async_engine else None, f"{self.name}-async")):
+            if eng is not None:
+                install_db_hooks(eng)
+                install_pool_hooks(eng, label)
+                event.listen(eng, "handle_error", self._on_error)
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def _on_error(self, ctx: Any) -> None:
+        # connection lost mid-query, or no connection at all (refused, timed out)
+        if ctx.is_disconnect or ctx.connection is None:
+            self.eject(f"connection error: {type(ctx.original_exception).__name__}")
+
+    def eject(self, reason: str) -> None:
+        if self.healthy:
+            log.warning("replica %s ejected for %.0fs: %s", self.name, settings.REPLICA_EJECT_SECONDS, reason)
+        self.down_until = time.monotonic() + settings.REPLICA_EJECT_SECONDS
+        self.reason = reason
+
+    def restore(self) -> None:
+        if not self.healthy:
+            log.info("replica %s back in rotation", self.name)
+        self.down_until = 0.0
+        self.reason = None
+
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as conn:
+                lag = float(conn.execute(LAG_SQL).scalar_one())
+        except Exception as e:
+            self.eject(f"health check failed: {type(e).__name__}")
+            return
+        self.lag = lag
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            self.eject(f"lagging {lag:.1f}s behind")
+        else:
+            self.restore()
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self.engine.pool
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "ejectedForSeconds": max(0.0, self.down_until - time.monotonic()),
+            "reason": self.reason,
+            "lagSeconds": self.lag,
+            "checkedOut": pool.checkedout(),
+            "idle": pool.checkedin(),
+        }
+
+replicas: List[Replica] = [Replica(u) for u in settings.DATABASE_REPLICA_URLS]
+_rr = itertools.count()
+
+def _choose(is_async: bool, primary: bool) -> Engine:
+    if not primary and replicas:
+        healthy = [r for r in replicas if r.healthy]
+        if healthy:
+            r = healthy[next(_rr) % len(healthy)]
+            READ_SESSIONS.inc((r.name,))
+            return r.async_engine.sync_engine if is_async else r.engine
+    READ_SESSIONS.inc(("primary",))
+    return async_engine.sync_engine if is_async else engine
+
+class ReadSession(Session):
+    """Session for read-only work whose engine is chosen lazily by _choose()."""
+    use_async = False
+
+    def get_bind(self, mapper=None, **kw):
+        bind = self.info.get("bind")
+        if bind is None:
+            bind = self.info["bind"] = _choose(self.use_async, self.info.get("primary", False))
+        return bind
+
+class AsyncReadSession(ReadSession):
+    use_async = True
+
+ReadSessionLocal = sessionmaker(
+    autoflush=False,
+    autocommit=False,
+    expire_on_commit=False,
+    class_=ReadSession,
+    future=True,
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=AsyncReadSession,
+)
+
+def pin_primary(db: AnySession) -> None:
+    """Route a read session to the primary; only effective before its first statement."""
+    getattr(db, "sync_session", db).info["primary"] = True
+
+class PrimaryWindow:
+    """After open(), apply() pins cache refills to the primary for REPLICA_MAX_LAG_SECONDS."""
+
+    def __init__(self) -> None:
+        self.until = 0.0
+
+    def open(self) -> None:
+        self.until = time.monotonic() + settings.REPLICA_MAX_LAG_SECONDS
+
+    def apply(self, db: Session) -> None:
+        if replicas and time.monotonic() < self.until:
+            pin_primary(db)
+
+# ---- read-after-write stickiness ----
+
+_STICKY_MAX = 100_000
+_sticky: Dict[int, float] = {}  # user_id -> monotonic deadline
+_all_until = 0.0                # everyone sticks after the LISTEN connection (re)connects
+
+def _mark(user_id: int) -> None:
+    now = time.monotonic()
+    if len(_sticky) >= _STICKY_MAX:
+        for uid, until in list(_sticky.items()):
+            if until <= now:
+                _sticky.pop(uid, None)
+    _sticky[user_id] = now + settings.READ_AFTER_WRITE_SECONDS
+
+def publish_write(db: Session, user_id: Optional[int]) -> None:
+    """Call inside the write's transaction: the user's reads go to the primary for a while."""
+    # Sticky on this worker at once; other workers follow when the NOTIFY reaches them
+    if not replicas or user_id is None:  # None: no caller to pin (scripts)
+        return
+    _mark(user_id)
+    listener.notify(db, STICKY_CHANNEL, str(user_id))
+
+def _on_sticky(payload: Optional[str]) -> None:
+    global _all_until
+    if payload is None:
+        _all_until = time.monotonic() + settings.READ_AFTER_WRITE_SECONDS
+    else:
+        _mark(int(payload))
+
+def _wrote_recently(request: Request) -> bool:
+    if not replicas:
+        return False
+    now = time.monotonic()
+    if now < _all_until:
+        return True
+    user = optional_auth(request)
+    return user is not None and _sticky.get(user.get("user_id"), 0.0) > now
+
+if replicas:
+    listener.subscribe(STICKY_CHANNEL, _on_sticky)
+
+async def get_read_db(request: Request) -> AsyncGenerator[AnySession, None]:
+    """get_request_db for read-only endpoints: reads from a replica unless the caller wrote recently."""
+    primary = _wrote_recently(request)
+    if settings.DB_ASYNC:
+        async with AsyncReadSessionLocal() as db:
+            if primary:
+                pin_primary(db)
+            yield db
+        return
+    db = ReadSessionLocal()
+    if primary:
+        pin_primary(db)
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+# ---- health checks ----
+
+_thread: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+def _check_loop() -> None:
+    while True:
+        for r in replicas:
+            r.check()
+        if _stop.wait(settings.REPLICA_CHECK_SECONDS):
+            return
+
+def start() -> None:
+    global _thread
+    if not replicas or settings.REPLICA_CHECK_SECONDS <= 0 or (_thread and _thread.is_alive()):
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_check_loop, name="replica-health", daemon=True)
+    _thread.start()
+
+def stop() -> None:
+    _stop.set()
+
+def replica_stats() -> List[Dict[str, Any]]:
+    return [r.stats() for r in replicas]
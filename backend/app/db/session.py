@@ -1,8 +1,12 @@
 # app/db/session.py
-from typing import Generator
+from typing import Any, AsyncGenerator, Callable, Generator, TypeVar, Union
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.core.timing import install_db_hooks
+from app.db.pool import engine_options, install_pool_hooks
 
 # Create engine (sync)
 # engine = create_engine(
@@ -11,18 +15,25 @@ from app.core.config import settings
 #     future=True,
 # )
 
-raw = settings.DATABASE_URL  # from env
-if raw.startswith("postgres://"):
-    raw = raw.replace("postgres://", "postgresql+psycopg://", 1)
-elif raw.startswith("postgresql://"):
-    raw = raw.replace("postgresql://", "postgresql+psycopg://", 1)
+def psycopg_url(url: str) -> str:
+    """Point a plain postgres:// / postgresql:// URL at the psycopg (v3) driver."""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+psycopg://", 1)
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+psycopg://", 1)
+    return url
+
+raw = psycopg_url(settings.DATABASE_URL)  # from env
 
 engine = create_engine(
     raw,
-    pool_pre_ping=True,
     future=True,
+    **engine_options(),
 )
 
+install_db_hooks(engine)
+install_pool_hooks(engine, "primary")
+
 # Session factory
 SessionLocal = sessionmaker(
     bind=engine,
@@ -33,6 +44,25 @@ SessionLocal = sessionmaker(
     future=True,
 )
 
+# Async engine (psycopg async), only built when DB_ASYNC is on so we don't keep two pools
+async_engine = (
+    create_async_engine(raw, **engine_options(is_async=True))
+    if settings.DB_ASYNC else None
+)
+if async_engine is not None:
+    install_db_hooks(async_engine.sync_engine)
+    install_pool_hooks(async_engine.sync_engine, "primary-async")
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
+AnySession = Union[Session, AsyncSession]
+T = TypeVar("T")
+
 def get_db() -> Generator[Session, None, None]:
     """FastAPI dependency that provides a DB session and makes sure it's closed."""
     db = SessionLocal()
@@ -40,3 +70,32 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that provides an AsyncSession (requires DB_ASYNC=true)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_request_db() -> AsyncGenerator[AnySession, None]:
+    """
+    Dependency for `async def` routers: an AsyncSession when DB_ASYNC is on, otherwise a
+    regular Session. Either way, hand it to run_db() rather than using it directly.
+    """
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+async def run_db(db: AnySession, fn: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """
+    Run a sync crud/service function `fn(session, *args, **kwargs)` without blocking the
+    event loop: on the async connection via run_sync (DB_ASYNC), or in the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
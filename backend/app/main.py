@@ -9,13 +9,23 @@ from app.routers import auth, categories, quiz, contact
 from app.routers import user as user_router
 from app.routers import quiz_manage as quiz_router
 from app.routers import question as question_router
+from app.routers import metrics as metrics_router
+from app.routers import stats as stats_router
+from app.routers import db_admin
 
 from app.core.logging import setup_logging, get_logger
 from app.middleware.request_id import RequestIDMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.core.responses import EnvelopeResponse
 from app.core.errors import handle_http, handle_validation, handle_unexpected
+from app.core.hashing import hasher
+from app.db import listener, replicas
+from app.db.pool import log_pool_sizing
+from app.db.session import engine
 
 setup_logging()
-app = FastAPI(title="Quiz API")
+app = FastAPI(title="Quiz API", default_response_class=EnvelopeResponse)
 log = get_logger("app")
 
 allow_origins = [o.rstrip("/") for o in settings.CORS_ORIGINS]
@@ -29,9 +39,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Server-Timing / request log (added first so it runs inside RequestIDMiddleware)
+if settings.SERVER_TIMING:
+    app.add_middleware(ServerTimingMiddleware)
+
 # Request ID middleware
 app.add_middleware(RequestIDMiddleware)
 
+# Prometheus request metrics (outermost, so it times everything above)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Global exception handlers
 app.add_exception_handler(StarletteHTTPException, handle_http)
 app.add_exception_handler(RequestValidationError, handle_validation)
@@ -40,6 +58,18 @@ app.add_exception_handler(Exception, handle_unexpected)
 @app.get("/healthz")
 def health(): return {"ok": True}
 
+@app.on_event("startup")
+def start_background():
+    log_pool_sizing(engine)
+    listener.start()
+    replicas.start()
+
+@app.on_event("shutdown")
+def shutdown_background():
+    hasher.shutdown()
+    listener.stop()
+    replicas.stop()
+
 log = logging.getLogger("app")   # your app-wide logger
 log.info("FastAPI starting…")
 
@@ -50,3 +80,7 @@ app.include_router(contact.router)
 app.include_router(user_router.router)
 app.include_router(quiz_router.router)
 app.include_router(question_router.router)
+app.include_router(stats_router.router)
+app.include_router(db_admin.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics_router.router)
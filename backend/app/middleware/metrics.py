@@ -0,0 +1,35 @@
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.metrics import IN_FLIGHT, REQUESTS, REQUEST_LATENCY
+
+class MetricsMiddleware:
+    """
+    Pure ASGI (no BaseHTTPMiddleware task hop): records latency and status per route
+    template, read from scope["route"] once the router has matched, plus in-flight count.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        t0 = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            route = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            method = scope["method"]
+            REQUEST_LATENCY.observe((method, route), time.perf_counter() - t0)
+            REQUESTS.inc((method, route, str(status)))
@@ -0,0 +1,37 @@
+import time
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from app.core.logging import get_logger
+from app.core.timing import RequestTimings, request_timings_ctx
+
+log = get_logger("app.request")
+
+class ServerTimingMiddleware(BaseHTTPMiddleware):
+    """
+    Adds `Server-Timing: db, render, app, total` and logs one line per request.
+    Must sit inside RequestIDMiddleware so the log line carries the rid.
+    """
+    async def dispatch(self, request: Request, call_next) -> Response:
+        timings = RequestTimings()
+        token = request_timings_ctx.set(timings)
+        t0 = time.perf_counter()
+        try:
+            response: Response = await call_next(request)
+        finally:
+            request_timings_ctx.reset(token)
+        total = (time.perf_counter() - t0) * 1000
+        db = timings.db_time * 1000
+        render = timings.render_time * 1000
+        app_ms = max(total - db - render, 0.0)
+
+        response.headers["Server-Timing"] = (
+            f'db;dur={db:.1f};desc="{timings.db_count} queries", '
+            f"render;dur={render:.1f}, app;dur={app_ms:.1f}, total;dur={total:.1f}"
+        )
+        log.info(
+            "%s %s -> %s %.1fms db=%d/%.1fms render=%.1fms",
+            request.method, request.url.path, response.status_code,
+            total, timings.db_count, db, render,
+        )
+        return response
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal, get_db
-from app.db.models import Category
+from fastapi import APIRouter, Depends, Request
+from app.db.replicas import get_read_db
+from app.db.session import AnySession, run_db
+from app.services import category as category_svc
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 @router.get("", response_model=dict)
-def list_categories(db: Session = Depends(get_db)):
-    rows = db.query(Category).order_by(Category.name).all()
-    return {"ok": True, "data": rows}
+async def list_categories(req: Request, db: AnySession = Depends(get_read_db)):
+    # the session is lazy: on a cache hit it never checks out a connection
+    snap = category_svc.cached_categories()
+    if snap is None:
+        snap = await run_db(db, category_svc.load_categories)
+    return snap.respond(req)
@@ -6,6 +6,7 @@ from typing import Optional
 from app.db.session import get_db
 from app.schemas.schemas import ContactIn
 from app.core.security import require_admin
+from app.core.responses import ok
 from app.services import contact as contact_svc
 
 router = APIRouter(prefix="/contact", tags=["contact"])
@@ -18,15 +19,15 @@ def submit_contact(body: ContactIn, db: Session = Depends(get_db)):
         message=body.message,
         email=body.email,
     )
-    return {"ok": True, "data": data}
+    return ok(data)
 
 @router.get("", response_model=dict, dependencies=[Depends(require_admin)])
 def list_contacts(db: Session = Depends(get_db)):
     rows = contact_svc.admin_list_contacts(db)
-    return {"ok": True, "data": rows}
+    return ok(rows)
 
 @router.get("/{contact_id}", response_model=dict, dependencies=[Depends(require_admin)])
 def contact_detail(contact_id: int, db: Session = Depends(get_db)):
     row = contact_svc.admin_get_contact(db, contact_id)
     # keep original behavior: return {"data": null} if not found (no 404)
-    return {"ok": True, "data": row}
+    return ok(row)
@@ -0,0 +1,17 @@
+# app/routers/db_admin.py
+from fastapi import APIRouter, Depends
+from app.core.responses import ok
+from app.core.security import require_admin
+from app.db.pool import pool_stats
+from app.db.replicas import replica_stats
+from app.db.session import async_engine, engine
+
+router = APIRouter(prefix="/admin/db", tags=["admin:db"])
+
+@router.get("/pool", response_model=dict, dependencies=[Depends(require_admin)])
+async def get_pool_stats():  # async: reads the event loop's threadpool limiter
+    data = {"sync": pool_stats(engine)}
+    if async_engine is not None:
+        data["async"] = pool_stats(async_engine.sync_engine)
+    data["replicas"] = replica_stats()
+    return ok(data)
@@ -0,0 +1,43 @@
+# app/routers/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core import metrics
+from app.core.hashing import hasher
+from app.core.security import token_cache
+from app.db.replicas import replicas
+from app.db.session import engine
+from app.services import quiz as quiz_svc
+
+router = APIRouter(tags=["metrics"])
+
+def _pool_gauges():
+    pool = engine.pool
+    yield ("checked_out",), pool.checkedout()
+    yield ("idle",), pool.checkedin()
+    yield ("size",), pool.size()
+    yield ("overflow",), pool.overflow()
+
+def _cache_gauges():
+    for name, stats in (("jwt", token_cache.stats()), ("quiz_result", quiz_svc._results.stats())):
+        for key in ("size", "weight", "hits", "misses", "evictions"):
+            yield (name, key), stats[key]
+
+def _replica_gauges():
+    for r in replicas:
+        yield (r.name, "up"), 1 if r.healthy else 0
+        if r.lag is not None:
+            yield (r.name, "lag_seconds"), r.lag
+
+def _hasher_gauges():
+    stats = hasher.stats()
+    for key in ("waiting", "in_flight", "completed", "rejected"):
+        yield (key,), stats[key]
+
+metrics.GaugeFunc("db_pool_connections", "Sync engine pool state", ("state",), _pool_gauges)
+metrics.GaugeFunc("cache_stats", "In-process cache counters", ("cache", "stat"), _cache_gauges)
+metrics.GaugeFunc("db_replica", "Read replica health and replication lag", ("replica", "stat"), _replica_gauges)
+metrics.GaugeFunc("password_hasher", "Password hashing executor counters", ("stat",), _hasher_gauges)
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
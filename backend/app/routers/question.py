@@ -1,12 +1,14 @@
 # app/routers/question.py
-from fastapi import APIRouter, Depends, HTTPException, Request, Query
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Query, UploadFile
 from pydantic import BaseModel
-from typing import Optional, Literal
 from sqlalchemy.orm import Session
+from typing import Optional, Literal
 
-from app.db.session import get_db
+from app.db.replicas import get_read_db
+from app.db.session import AnySession, get_db, get_request_db, run_db
 from app.core.security import require_auth
-from app.schemas.schemas import QuestionCreateIn, QuestionUpdateIn, QuestionPutIn
+from app.core.responses import ok
+from app.schemas.schemas import QuestionCreateIn, QuestionUpdateIn, QuestionPutIn, QuestionBatchIn, QuestionBatchItem
 from app.services import question as q_svc
 from app.services.question import admin_put_question
 from app.core.security import require_admin
@@ -18,51 +20,107 @@ class StatusIn(BaseModel):
     isActive: bool
 
 @router.get("", response_model=dict, dependencies=[Depends(require_admin)])
-def list_questions(
-    db: Session = Depends(get_db),
+async def list_questions(
+    db: AnySession = Depends(get_read_db),
     categoryId: Optional[int] = Query(None),
-    q: Optional[str] = Query(None, description="search in question text"),
+    q: Optional[str] = Query(None, description="full-text search in question text (ranked)"),
+    searchChoices: bool = Query(False, description="with q: also match choice text"),
     includeChoices: bool = Query(False),
     limit: int = Query(100, ge=1, le=500),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page; overrides offset"),
 ):
-    data = q_svc.admin_list_questions(
+    data, next_cursor = await run_db(
         db,
+        q_svc.admin_list_questions,
         category_id=categoryId,
         query_text=q,
         include_choices=includeChoices,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        search_choices=searchChoices,
     )
-    return {"ok": True, "data": data}
+    return ok(data, nextCursor=next_cursor)
+
+@router.post("/batch", response_model=dict)
+async def batch_questions(
+    payload: QuestionBatchIn,
+    db: AnySession = Depends(get_request_db),
+    admin: dict = Depends(require_admin),
+):
+    data = await run_db(db, q_svc.admin_batch_questions, payload.items, actor_id=admin["user_id"])
+    return ok(data)
+
+@router.post("/import", response_model=dict)
+def import_questions(
+    file: UploadFile = File(..., description="CSV or JSONL question bank"),
+    format: Optional[Literal["csv", "jsonl"]] = Query(None, description="defaults from the file extension"),
+    dryRun: bool = Query(False, description="validate and report without inserting"),
+    db: Session = Depends(get_db),  # sync session: COPY runs on the psycopg connection
+    admin: dict = Depends(require_admin),
+):
+    fmt = format or ("jsonl" if (file.filename or "").lower().endswith((".jsonl", ".ndjson")) else "csv")
+    data = q_svc.admin_import_questions(db, file.file, fmt=fmt, dry_run=dryRun, actor_id=admin["user_id"])
+    return ok(data)
 
 @router.get("/{question_id}", response_model=dict, dependencies=[Depends(require_admin)])
-def get_question(question_id: int, db: Session = Depends(get_db)):
-    data = q_svc.admin_get_question(db, question_id=question_id)
-    return {"ok": True, "data": data}
+async def get_question(question_id: int, db: AnySession = Depends(get_read_db)):
+    data = await run_db(db, q_svc.admin_get_question, question_id=question_id)
+    return ok(data)
 
-@router.post("", response_model=dict, dependencies=[Depends(require_admin)])
-def create_question(payload: QuestionCreateIn, db: Session = Depends(get_db)):
-    data = q_svc.admin_create_question(db, payload)
-    return {"ok": True, "data": data}
+@router.post("", response_model=dict)
+async def create_question(
+    payload: QuestionCreateIn,
+    db: AnySession = Depends(get_request_db),
+    admin: dict = Depends(require_admin),
+):
+    data = await run_db(db, q_svc.admin_create_question, payload, actor_id=admin["user_id"])
+    return ok(data)
 
-@router.patch("/{question_id}", response_model=dict, dependencies=[Depends(require_admin)])
-def update_question(question_id: int, payload: QuestionUpdateIn, db: Session = Depends(get_db)):
-    q_svc.admin_update_question(db, question_id, payload)
-    return {"ok": True}
+@router.patch("/{question_id}", response_model=dict)
+async def update_question(
+    question_id: int,
+    payload: QuestionUpdateIn,
+    db: AnySession = Depends(get_request_db),
+    admin: dict = Depends(require_admin),
+):
+    if payload.choices is not None:
+        # PATCH choices carry no ids; the batch path would add them next to the old ones
+        raise HTTPException(status_code=400, detail="choices are edited with PUT /admin/questions/{id}")
+    item = QuestionBatchItem(
+        questionId=question_id,
+        description=payload.description,
+        categoryId=payload.categoryId,
+        isActive=payload.isActive,
+    )
+    data = await run_db(db, q_svc.admin_batch_questions, [item], actor_id=admin["user_id"])
+    res = data["items"][0]
+    if not res["ok"]:
+        code = 404 if res["error"] == q_svc.QUESTION_NOT_FOUND else 400
+        raise HTTPException(status_code=code, detail=res["error"])
+    return ok()
 
-@router.patch("/{question_id}/status", response_model=dict, dependencies=[Depends(require_admin)])
-def set_question_status(question_id: int, payload: StatusIn, db: Session = Depends(get_db)):
-    row = q_svc.admin_set_question_status(db, question_id=question_id, is_active=payload.isActive)
-    return {"ok": True, "data": row}
+@router.patch("/{question_id}/status", response_model=dict)
+async def set_question_status(
+    question_id: int,
+    payload: StatusIn,
+    db: AnySession = Depends(get_request_db),
+    admin: dict = Depends(require_admin),
+):
+    row = await run_db(
+        db, q_svc.admin_set_question_status,
+        question_id=question_id, is_active=payload.isActive, actor_id=admin["user_id"],
+    )
+    return ok(row)
 
 @router.put("/{question_id}", response_model=dict)
-def put_question(
+async def put_question(
     question_id: int,
     payload: QuestionPutIn,
     req: Request,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_request_db),
 ):
-    require_admin(req)
-    admin_put_question(db, question_id, payload)
-    return {"ok": True}
\ No newline at end of file
+    admin = require_admin(req)
+    await run_db(db, admin_put_question, question_id, payload, actor_id=admin["user_id"])
+    return ok()
\ No newline at end of file
@@ -1,7 +1,9 @@
+from typing import Literal
 from fastapi import APIRouter, Depends, Request, Query, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.replicas import get_read_db
+from app.db.session import AnySession, get_request_db, run_db
 from app.core.security import require_auth
+from app.core.responses import ok
 from app.schemas.schemas import QuizSubmitIn  # your existing Pydantic schema
 from app.services import quiz as quiz_svc
 
@@ -12,27 +14,28 @@ log = logging.getLogger(__name__)
 router = APIRouter(prefix="/quiz", tags=["quiz"])
 
 @router.get("", response_model=dict)
-def get_quiz_questions(
+async def get_quiz_questions(
     req: Request,
     categoryId: int = Query(..., description="category_id"),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_read_db)
 ):
     require_auth(req)
-    data = quiz_svc.generate_quiz(db, category_id=categoryId)
+    data = await run_db(db, quiz_svc.generate_quiz, category_id=categoryId)
     if not data:
         return {"ok": False, "error": "No questions found for the specified category."}
-    return {"ok": True, "data": data}
+    return ok(data)
 
 @router.post("", response_model=dict)
-def submit_quiz(
+async def submit_quiz(
     payload: QuizSubmitIn,
     req: Request,
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_request_db)
 ):
     user = require_auth(req)
     try:
-        data = quiz_svc.submit_quiz(
+        data = await run_db(
             db,
+            quiz_svc.submit_quiz,
             user_id=user["user_id"],
             category_id=payload.categoryId,
             answers=[{"questionId": a.questionId, "choiceId": a.choiceId} for a in payload.answers],
@@ -41,19 +44,27 @@ def submit_quiz(
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    return {"ok": True, "data": data}
+    return ok(data)
 
 @router.get("/result/{quiz_id}", response_model=dict)
-def quiz_result(quiz_id: int, req: Request, db: Session = Depends(get_db)):
+async def quiz_result(
+    quiz_id: int,
+    req: Request,
+    format: Literal["flat", "nested"] = Query("flat", description="nested: one item per question with its choices"),
+    db: AnySession = Depends(get_read_db),
+):
     require_auth(req)
-    data = quiz_svc.get_quiz_result(db, quiz_id=quiz_id)
-    if not data:
-        return {"ok": False, "error": "Quiz not found"}
-    return {"ok": True, "data": data}
+    nested = format == "nested"
+    entry = quiz_svc.cached_quiz_result(quiz_id, nested=nested)
+    if entry is None:
+        entry = await run_db(db, quiz_svc.load_quiz_result, quiz_id=quiz_id, nested=nested)
+        if entry is None:
+            return {"ok": False, "error": "Quiz not found"}
+    return entry.respond(req)
 
 @router.get("/result", response_model=dict)
-def user_quiz_list(req: Request, db: Session = Depends(get_db)):
+async def user_quiz_list(req: Request, db: AnySession = Depends(get_read_db)):
     # log.info(f"/result request: {Request}")
     user = require_auth(req)
-    data = quiz_svc.list_user_quizzes(db, user_id=user["user_id"])
-    return {"ok": True, "data": data}
+    data = await run_db(db, quiz_svc.list_user_quizzes, user_id=user["user_id"])
+    return ok(data)
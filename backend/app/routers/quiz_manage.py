@@ -1,31 +1,56 @@
 # app/routers/quizManage.py
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException, Request, Query
-from sqlalchemy.orm import Session
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
 
-from app.db.session import get_db
+from app.db.replicas import get_read_db
+from app.db.session import AnySession, run_db
 from app.core.security import require_auth
+from app.core.responses import ok
 from app.services import quiz_manage as qm_svc
 from app.core.security import require_admin
 
 router = APIRouter(prefix="/admin/quizzes", tags=["admin:quizzes"])
 
 @router.get("", response_model=dict, dependencies=[Depends(require_admin)])
-def list_quizzes(
-    db: Session = Depends(get_db),
+async def list_quizzes(
+    db: AnySession = Depends(get_read_db),
     categoryId: Optional[int] = Query(None),
     userId: Optional[int] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page; overrides offset"),
 ):
-    data = qm_svc.admin_list_quizzes(
+    data, next_cursor, meta = await run_db(
         db,
+        qm_svc.admin_list_quizzes_page,
         category_id=categoryId,
         user_id=userId,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+    )
+    return ok(data, nextCursor=next_cursor, meta=meta)
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+
+@router.get("/export", dependencies=[Depends(require_admin)])
+def export_quizzes(
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    categoryId: Optional[int] = Query(None),
+    userId: Optional[int] = Query(None),
+    includeAnswers: bool = Query(False, description="csv: one line per answer; ndjson: an answers array per quiz"),
+):
+    body = qm_svc.admin_export_quizzes(
+        category_id=categoryId,
+        user_id=userId,
+        fmt=format,
+        include_answers=includeAnswers,
+    )
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="quizzes-{stamp}.{format}"'},
     )
-    # If you want pagination meta, uncomment the next two lines and include it in the response
-    # total = qm_svc.admin_count_quizzes(db, category_id=categoryId, user_id=userId)
-    # return {"ok": True, "data": data, "meta": {"total": total, "limit": limit, "offset": offset}}
-    return {"ok": True, "data": data}
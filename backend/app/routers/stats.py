@@ -0,0 +1,41 @@
+# app/routers/stats.py
+from fastapi import APIRouter, Depends, Request, Query
+from typing import Optional
+
+from app.db.replicas import get_read_db
+from app.db.session import AnySession, run_db
+from app.core.security import require_auth, require_admin
+from app.core.responses import ok
+from app.services import stats as stats_svc
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+@router.get("/me", response_model=dict)
+async def my_stats(
+    req: Request,
+    categoryId: Optional[int] = Query(None),
+    db: AnySession = Depends(get_read_db),
+):
+    user = require_auth(req)
+    data = await run_db(db, stats_svc.user_stats, user_id=user["user_id"], category_id=categoryId)
+    return ok(data)
+
+@router.get("/leaderboard/{category_id}", response_model=dict)
+async def leaderboard(
+    category_id: int,
+    req: Request,
+    limit: int = Query(10, ge=1, le=stats_svc.LEADERBOARD_MAX),
+    db: AnySession = Depends(get_read_db),
+):
+    require_auth(req)
+    data = await run_db(db, stats_svc.leaderboard, category_id=category_id, limit=limit)
+    return ok(data)
+
+@router.get("/users/{user_id}", response_model=dict, dependencies=[Depends(require_admin)])
+async def user_stats(
+    user_id: int,
+    categoryId: Optional[int] = Query(None),
+    db: AnySession = Depends(get_read_db),
+):
+    data = await run_db(db, stats_svc.user_stats, user_id=user_id, category_id=categoryId)
+    return ok(data)
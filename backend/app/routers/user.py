@@ -2,10 +2,11 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing import Literal
-from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.replicas import get_read_db
+from app.db.session import AnySession, get_request_db, run_db
 from app.core.security import require_auth
+from app.core.responses import ok
 from app.services import user as user_svc
 from app.core.security import require_admin
 
@@ -15,11 +16,18 @@ class StatusIn(BaseModel):
     status: Literal["active", "suspended"]
 
 @router.get("", response_model=dict, dependencies=[Depends(require_admin)])
-def list_users(db: Session = Depends(get_db)):
-    data = user_svc.admin_list_users(db)
-    return {"ok": True, "data": data}
+async def list_users(db: AnySession = Depends(get_read_db)):
+    data = await run_db(db, user_svc.admin_list_users)
+    return ok(data)
 
-@router.patch("/{user_id}/status", response_model=dict, dependencies=[Depends(require_admin)])
-def set_user_status(user_id: int, payload: StatusIn, db: Session = Depends(get_db)):
-    row = user_svc.admin_set_user_status(db, user_id=user_id, status=payload.status)
-    return {"ok": True, "data": row}
+@router.patch("/{user_id}/status", response_model=dict)
+async def set_user_status(
+    user_id: int,
+    payload: StatusIn,
+    db: AnySession = Depends(get_request_db),
+    admin: dict = Depends(require_admin),
+):
+    row = await run_db(
+        db, user_svc.admin_set_user_status, user_id=user_id, status=payload.status, actor_id=admin["user_id"],
+    )
+    return ok(row)
@@ -85,7 +85,7 @@ class QuestionUpdateIn(BaseModel):
     categoryId: Optional[int] = Field(None, alias="categoryId")
     description: Optional[str] = None
     isActive: Optional[bool] = Field(None, alias="isActive")
-    # If provided, we REPLACE all choices in a simple, atomic way
+    # Rejected by PATCH (400): choices are edited with PUT, which matches them by choiceId
     choices: Optional[List[ChoiceIn]] = None
 
 class ChoicePutIn(BaseModel):
@@ -99,4 +99,15 @@ class QuestionPutIn(BaseModel):
     isActive: bool = True
     choices: List[ChoicePutIn]
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class QuestionBatchItem(BaseModel):
+    questionId: int
+    description: Optional[str] = None
+    categoryId: Optional[int] = None
+    isActive: Optional[bool] = None
+    # Upserted like PUT /admin/questions/{id}; when given, exactly one must be correct
+    choices: Optional[List[ChoicePutIn]] = None
+
+class QuestionBatchIn(BaseModel):
+    items: List[QuestionBatchItem] = Field(..., min_length=1, max_length=1000)
@@ -1,4 +1,5 @@
 # app/services/auth.py
+import logging
 from fastapi import HTTPException, Response, Request
 from sqlalchemy.orm import Session
 from typing import Optional
@@ -7,6 +8,10 @@ from app.crud import user as user_crud
 from app.core.security import hash_password, verify_password, make_token, get_user_from_cookie
 from app.core.config import settings
 from app.core.security import get_payload_from_token 
+from app.core.hashing import needs_rehash
+from app.services import user_status
+
+log = logging.getLogger(__name__)
 
 def register_user(
     db: Session,
@@ -48,6 +53,16 @@ def authenticate_user(db: Session, *, email: str, password: str):
         raise HTTPException(status_code=400, detail="Invalid credentials")
     if not u.is_active:
         raise HTTPException(status_code=400, detail="User suspended")
+
+    # BCRYPT_ROUNDS changed since this hash was made: upgrade it while we have the password
+    if needs_rehash(u.password_hash):
+        try:
+            new_hash = hash_password(password)
+            user_crud.update_password_hash(db, u.user_id, new_hash)
+            db.commit()
+        except Exception:
+            db.rollback()
+            log.warning("password rehash failed for user_id=%s", u.user_id, exc_info=True)
     return u
 
 def issue_login_token(res: Optional[Response], *, user) -> str:
@@ -74,11 +89,13 @@ def clear_login_cookie(res: Response):
     if settings.USE_COOKIE_AUTH:
         res.delete_cookie(settings.COOKIE_NAME, path="/")
 
-def get_current_user(req: Request, db: Session):
+def get_current_user(req: Request, db: Session) -> dict:
     """
     Header-first auth:
       - Prefer 'Authorization: Bearer <token>'
       - If USE_COOKIE_AUTH=True and no header, fall back to cookie
+    Returns the verified token payload once the user is known to be active; the status
+    comes from services.user_status, so a warm request doesn't touch the database.
     """
     payload = None
 
@@ -95,8 +112,7 @@ def get_current_user(req: Request, db: Session):
     if not payload:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
-    user = user_crud.get_user_by_id(db, payload["user_id"])
-    if not user or not user.is_active:
+    if not user_status.is_active(db, payload["user_id"]):
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    return user
+    return payload
@@ -0,0 +1,47 @@
+# app/services/category.py
+"""GET /categories from a per-worker serialized snapshot, dropped on NOTIFY category_changed."""
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import CachedBody, dumps
+from app.crud import category as category_crud
+from app.db import listener, replicas
+
+CHANNEL = "category_changed"
+
+_snapshot: Optional[CachedBody] = None
+_generation = 0  # bumped by invalidate(); a load that raced an invalidation isn't stored
+_refill = replicas.PrimaryWindow()
+
+def list_categories(db: Session) -> List[Dict[str, Any]]:
+    return category_crud.list_categories(db)
+
+def cached_categories() -> Optional[CachedBody]:
+    snap = _snapshot
+    if snap is None or snap.expires_at <= time.monotonic():
+        return None
+    return snap
+
+def load_categories(db: Session) -> CachedBody:
+    global _snapshot
+    gen = _generation
+    _refill.apply(db)
+    snap = CachedBody(
+        dumps({"ok": True, "data": category_crud.list_categories(db)}),
+        cache_control=f"public, max-age={settings.CATEGORIES_MAX_AGE}",
+        expires_at=time.monotonic() + settings.CATEGORIES_CACHE_TTL_SECONDS,
+    )
+    if gen == _generation:
+        _snapshot = snap
+    return snap
+
+def invalidate() -> None:
+    global _snapshot, _generation
+    _generation += 1
+    _snapshot = None
+    _refill.open()
+
+listener.subscribe(CHANNEL, lambda payload: invalidate())
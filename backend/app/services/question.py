@@ -1,9 +1,17 @@
 # app/services/question.py
-from typing import Optional, List, Dict, Any
+import csv
+import io
+import json
+from typing import Optional, List, Dict, Any, Tuple, BinaryIO, Iterator, Set
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from app.core.pagination import encode_cursor, decode_cursor, decode_float, decode_int
+from app.crud import category as category_crud
 from app.crud import question as q_crud
-from app.schemas.schemas import QuestionCreateIn, QuestionPutIn  # if you have them
+from app.db import replicas
+from app.services import question_bank
+from app.services import quiz as quiz_svc
+from app.schemas.schemas import QuestionCreateIn, QuestionPutIn, QuestionBatchItem  # if you have them
 
 def _ensure_single_correct(choices: List[Dict[str, Any]]):
     # choices like {"description": str, "isCorrect": bool}
@@ -20,20 +28,48 @@ def admin_list_questions(
     include_choices: bool,
     limit: int,
     offset: int,
-) -> List[Dict[str, Any]]:
-    data = q_crud.list_questions(
-        db,
-        category_id=category_id,
-        query_text=query_text,
-        limit=limit,
-        offset=offset,
-    )
+    cursor: Optional[str] = None,
+    search_choices: bool = False,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Returns (page, next_cursor); a cursor takes precedence over offset. With query_text
+    the page is ranked full-text search results and the cursor carries (rank, id).
+    """
+    query_text = (query_text or "").strip()
+    if query_text:
+        after = None
+        if cursor:
+            rank, qid = decode_cursor(cursor, 2)
+            after = (decode_float(rank), decode_int(qid))
+        data = q_crud.search_questions(
+            db,
+            query_text=query_text,
+            category_id=category_id,
+            include_choice_text=search_choices,
+            limit=limit + 1,
+            offset=0 if cursor else offset,
+            after=after,
+        )
+        key = lambda d: [d["rank"], d["question_id"]]
+    else:
+        after_id = decode_int(decode_cursor(cursor, 1)[0]) if cursor else None
+        data = q_crud.list_questions(
+            db,
+            category_id=category_id,
+            limit=limit + 1,  # one extra row tells us whether there is a next page
+            offset=0 if cursor else offset,
+            after_id=after_id,
+        )
+        key = lambda d: [d["question_id"]]
+    next_cursor = None
+    if len(data) > limit:
+        data = data[:limit]
+        next_cursor = encode_cursor(key(data[-1]))
     if include_choices and data:
         ids = [d["question_id"] for d in data]
         by_q = q_crud.get_choices_for_questions(db, ids)
-        for d in data:
-            d["choices"] = by_q.get(d["question_id"], [])
-    return data
+        data = [{**d, "choices": by_q.get(d["question_id"], [])} for d in data]
+    return data, next_cursor
 
 def admin_get_question(db: Session, *, question_id: int) -> Dict[str, Any]:
     head = q_crud.get_question_header(db, question_id)
@@ -43,50 +79,265 @@ def admin_get_question(db: Session, *, question_id: int) -> Dict[str, Any]:
     head["choices"] = choices
     return head
 
-def admin_create_question(db: Session, payload: QuestionCreateIn) -> Dict[str, Any]:
+def admin_create_question(db: Session, payload: QuestionCreateIn, *, actor_id: Optional[int] = None) -> Dict[str, Any]:
     # Convert pydantic choices to dicts
     choices = [{"description": c.description, "isCorrect": c.isCorrect} for c in payload.choices]
     _ensure_single_correct(choices)
     with db.begin():
         qid = q_crud.insert_question(db, category_id=payload.categoryId, description=payload.description)
         q_crud.insert_choices(db, question_id=qid, choices=choices)
+        q_crud.bump_bank_version(db, [payload.categoryId])
+        replicas.publish_write(db, actor_id)
+    question_bank.invalidate([payload.categoryId])
     return {"question_id": qid}
 
-def admin_put_question(db: Session, question_id: int, payload: QuestionPutIn) -> None:
-    if not payload.choices:
-        raise HTTPException(status_code=400, detail="choices must not be empty")
+QUESTION_NOT_FOUND = "question not found"
 
-    num_correct = sum(1 for c in payload.choices if c.isCorrect)
-    if num_correct != 1:
-        raise HTTPException(status_code=400, detail="exactly one choice must be correct")
+def _apply_question_batch(
+    db: Session, items: List[QuestionBatchItem],
+) -> Tuple[List[Dict[str, Any]], Set[int], bool]:
+    """
+    Validate and apply `items` inside the caller's transaction with a fixed number of
+    statements: lock the questions, check categories and choice ownership, then one
+    UPDATE for question fields, one to clear correct flags, one UPDATE for existing
+    choices and one executemany INSERT for new ones. Items that fail a check are left
+    out and reported. Returns (per-item results, touched category ids, whether any
+    question text or choices changed).
+    """
+    results = [{"questionId": it.questionId, "ok": True} for it in items]
+
+    def fail(i: int, error: str) -> None:
+        results[i].update(ok=False, error=error)
 
+    seen: Set[int] = set()
+    for i, it in enumerate(items):
+        if it.questionId in seen:
+            fail(i, "duplicate questionId in batch")
+            continue
+        seen.add(it.questionId)
+        if it.description is not None and not it.description.strip():
+            fail(i, "description must not be empty")
+        elif it.choices is not None:
+            try:
+                _ensure_single_correct([{"isCorrect": c.isCorrect} for c in it.choices])
+            except HTTPException as e:
+                fail(i, e.detail)
+
+    live = [i for i, r in enumerate(results) if r["ok"]]
+    old_cats = q_crud.lock_questions(db, [items[i].questionId for i in live])
+    new_cats = {items[i].categoryId for i in live if items[i].categoryId is not None}
+    known_cats = category_crud.existing_category_ids(db, new_cats) if new_cats else set()
+    owners = q_crud.get_choice_owners(
+        db, [c.choiceId for i in live for c in (items[i].choices or []) if c.choiceId is not None],
+    )
+    for i in live:
+        it = items[i]
+        if it.questionId not in old_cats:
+            fail(i, QUESTION_NOT_FOUND)
+        elif it.categoryId is not None and it.categoryId not in known_cats:
+            fail(i, f"unknown categoryId {it.categoryId}")
+        else:
+            foreign = [c.choiceId for c in it.choices or []
+                       if c.choiceId is not None and owners.get(c.choiceId) != it.questionId]
+            if foreign:
+                fail(i, f"choiceId {foreign[0]} does not belong to question {it.questionId}")
+
+    live_items = [items[i] for i, r in enumerate(results) if r["ok"]]
+    with_choices = [it for it in live_items if it.choices is not None]
+    q_crud.batch_update_questions(db, [
+        (it.questionId, it.description, it.categoryId, it.isActive)
+        for it in live_items
+        if (it.description, it.categoryId, it.isActive) != (None, None, None)
+    ])
+    q_crud.clear_correct(db, [it.questionId for it in with_choices])
+    q_crud.batch_update_choices(db, [
+        (c.choiceId, c.description, c.isCorrect)
+        for it in with_choices for c in it.choices if c.choiceId is not None
+    ])
+    q_crud.insert_choice_rows(db, [
+        (it.questionId, c.description, c.isCorrect)
+        for it in with_choices for c in it.choices if c.choiceId is None
+    ])
+
+    touched = {old_cats[it.questionId] for it in live_items}
+    touched |= {it.categoryId for it in live_items if it.categoryId is not None}
+    content_changed = any(it.description is not None or it.choices is not None for it in live_items)
+    return results, touched, content_changed
+
+def admin_batch_questions(
+    db: Session, items: List[QuestionBatchItem], *, actor_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Apply status changes, category moves and edits to many questions in one transaction.
+    actor_id (the admin) reads from the primary for a while afterwards; see replicas.publish_write.
+    """
     with db.begin():
-        # 1) Update question fields
-        q_crud.update_question_fields(
-            db,
-            question_id=question_id,
-            description=payload.description,
-            category_id=payload.categoryId,
-            is_active=payload.isActive,
-        )
+        results, touched, content_changed = _apply_question_batch(db, items)
+        q_crud.bump_bank_version(db, touched)
+        replicas.publish_write(db, actor_id)
+        if content_changed:
+            quiz_svc.publish_results_stale(db)
+    question_bank.invalidate(touched)
+    if content_changed:
+        quiz_svc.clear_result_cache()
+    applied = sum(1 for r in results if r["ok"])
+    return {"applied": applied, "failed": len(results) - applied, "items": results}
+
+def admin_put_question(
+    db: Session, question_id: int, payload: QuestionPutIn, *, actor_id: Optional[int] = None,
+) -> None:
+    item = QuestionBatchItem(
+        questionId=question_id,
+        description=payload.description,
+        categoryId=payload.categoryId,
+        isActive=payload.isActive,
+        choices=payload.choices,
+    )
+    res = admin_batch_questions(db, [item], actor_id=actor_id)["items"][0]
+    if not res["ok"]:
+        code = 404 if res["error"] == QUESTION_NOT_FOUND else 400
+        raise HTTPException(status_code=code, detail=res["error"])
 
-        # 2) Enforce single-correct:
-        #    Clear all first, then apply flags from payload (exactly one true)
-        q_crud.clear_all_correct(db, question_id=question_id)
-
-        # 3) Upsert all provided choices (update existing by choiceId, insert new if missing)
-        for ch in payload.choices:
-            q_crud.upsert_choice(
-                db,
-                question_id=question_id,
-                choice_id=ch.choiceId,
-                description=ch.description,
-                is_correct=ch.isCorrect,
-            )
-
-def admin_set_question_status(db: Session, *, question_id: int, is_active: bool) -> Dict[str, Any]:
+def admin_set_question_status(
+    db: Session, *, question_id: int, is_active: bool, actor_id: Optional[int] = None,
+) -> Dict[str, Any]:
     with db.begin():
         res = q_crud.set_question_status(db, question_id=question_id, is_active=is_active)
         if not res:
             raise HTTPException(status_code=404, detail="Question not found")
-        return res
+        q_crud.bump_bank_version(db, [res["category_id"]])
+        replicas.publish_write(db, actor_id)
+    question_bank.invalidate([res["category_id"]])
+    return res
+
+# ---- bulk import ----
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_MAX_ERRORS = 1000  # errors listed in the report; all of them are counted
+_TRUE = {"1", "true", "t", "yes", "y"}
+_FALSE = {"0", "false", "f", "no", "n"}
+
+def _import_records(f: BinaryIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """
+    (line number, record) per question, read lazily from the upload. A record is a dict
+    shaped like QuestionCreateIn (+ optional isActive), or the exception that made the
+    line unreadable.
+
+    CSV header: categoryId, description, correct (1-based number of the correct choice
+    column), any number of choice* columns (empty cells skipped), optional isActive.
+    """
+    text_f = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+    if fmt == "jsonl":
+        for line_no, line in enumerate(text_f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except ValueError as e:
+                yield line_no, ValueError(f"invalid JSON: {e}")
+        return
+
+    reader = csv.DictReader(text_f)
+    choice_cols = [c for c in (reader.fieldnames or []) if c.lower().startswith("choice")]
+    end = reader.line_num
+    for rec in reader:
+        start, end = end + 1, reader.line_num  # report where a (possibly multi-line) record starts
+        correct = (rec.get("correct") or "").strip()
+        choices = []
+        for i, col in enumerate(choice_cols, 1):
+            desc = (rec.get(col) or "").strip()
+            if desc:
+                choices.append({"description": desc, "isCorrect": correct == str(i)})
+        yield start, {
+            "categoryId": rec.get("categoryId"),
+            "description": rec.get("description"),
+            "choices": choices,
+            "isActive": rec.get("isActive"),
+        }
+
+def _import_text(value: Any, what: str) -> str:
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(f"{what} must be a non-empty string")
+    if "\x00" in value:
+        raise ValueError(f"{what} contains a NUL character")
+    return value.strip()
+
+def _import_row(line: int, rec: Any, category_ids: Set[int]) -> q_crud.ImportRow:
+    """Validate one record the same way admin_create_question does; raises on a bad row."""
+    if isinstance(rec, Exception):
+        raise rec
+    if not isinstance(rec, dict):
+        raise ValueError("each line must be a JSON object")
+    try:
+        category_id = int(rec.get("categoryId"))
+    except (TypeError, ValueError):
+        raise ValueError("categoryId must be an integer")
+    if category_id not in category_ids:
+        raise ValueError(f"unknown categoryId {category_id}")
+    description = _import_text(rec.get("description"), "description")
+
+    is_active = rec.get("isActive")
+    if is_active is None or is_active == "":
+        is_active = True
+    elif isinstance(is_active, str):
+        if is_active.strip().lower() not in _TRUE | _FALSE:
+            raise ValueError("isActive must be a boolean")
+        is_active = is_active.strip().lower() in _TRUE
+    elif not isinstance(is_active, bool):
+        raise ValueError("isActive must be a boolean")
+
+    choices = rec.get("choices")
+    if not isinstance(choices, list) or not all(isinstance(c, dict) for c in choices):
+        raise ValueError("choices must be a list of objects")
+    _ensure_single_correct(choices)
+    texts = [_import_text(c.get("description"), "choice description") for c in choices]
+    correct = next(i for i, c in enumerate(choices, 1) if c.get("isCorrect"))
+    return line, category_id, description, is_active, texts, correct
+
+def admin_import_questions(
+    db: Session, f: BinaryIO, *, fmt: str, dry_run: bool = False, actor_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Import a CSV/JSONL question bank in one transaction. Rows are validated as they are
+    read and the valid ones COPYed straight into a temp staging table, so memory does
+    not grow with the file; invalid rows are skipped and reported by line number.
+    dry_run validates and stages without inserting anything.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {', '.join(IMPORT_FORMATS)}")
+
+    errors: List[Dict[str, Any]] = []
+    rejected = 0
+    category_ids: Set[int] = set()
+
+    def valid_rows() -> Iterator[q_crud.ImportRow]:
+        nonlocal rejected
+        for line, rec in _import_records(f, fmt):
+            try:
+                yield _import_row(line, rec, category_ids)
+            except (ValueError, HTTPException) as e:
+                rejected += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({"line": line, "error": getattr(e, "detail", None) or str(e)})
+
+    touched: List[int] = []
+    try:
+        with db.begin():
+            category_ids.update(c["category_id"] for c in category_crud.list_categories(db))
+            q_crud.create_import_staging(db)
+            staged = q_crud.copy_import_rows(db, valid_rows())
+            if staged and not dry_run:
+                touched = q_crud.merge_import(db)
+                q_crud.bump_bank_version(db, touched)
+                replicas.publish_write(db, actor_id)
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"unreadable {fmt} file: {e}")
+    question_bank.invalidate(touched)
+
+    return {
+        "imported": 0 if dry_run else staged,
+        "valid": staged,
+        "rejected": rejected,
+        "errors": errors,
+        "dryRun": dry_run,
+    }
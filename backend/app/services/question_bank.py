@@ -0,0 +1,107 @@
+# app/services/question_bank.py
+"""In-process snapshot of each category's active questions and choices, used by GET /quiz."""
+import random
+import time
+from array import array
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import question as q_crud
+
+class _Snapshot:
+    __slots__ = (
+        "version", "checked_at", "too_big",
+        "question_ids", "descriptions", "offsets",
+        "choice_ids", "choice_descs", "correct_ids", "index",
+    )
+
+    def __init__(self, version: int):
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.too_big = False
+        self.question_ids = array("q")
+        self.descriptions: List[str] = []
+        self.offsets = array("l", [0])     # choices of question i: offsets[i]:offsets[i+1]
+        self.choice_ids = array("q")
+        self.choice_descs: List[str] = []
+        self.correct_ids = array("q")      # 0 when a question has no correct choice
+        self.index: Dict[int, int] = {}    # question_id -> position
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def options(self, i: int) -> List[Dict[str, Any]]:
+        lo, hi = self.offsets[i], self.offsets[i + 1]
+        opts = [
+            {"choiceId": self.choice_ids[j], "description": self.choice_descs[j]}
+            for j in range(lo, hi)
+        ]
+        random.shuffle(opts)
+        return opts
+
+_snapshots: Dict[int, _Snapshot] = {}
+
+def _load(db: Session, category_id: int) -> _Snapshot:
+    version = q_crud.get_bank_version(db, category_id)
+    snap = _Snapshot(version)
+    if q_crud.count_active_questions(db, category_id) > settings.QUESTION_BANK_MAX_QUESTIONS:
+        snap.too_big = True
+        return snap
+
+    last_qid = None
+    for qid, desc, cid, cdesc, is_correct in q_crud.get_active_bank_rows(db, category_id):
+        if qid != last_qid:
+            if last_qid is not None:
+                snap.offsets.append(len(snap.choice_ids))
+            snap.index[qid] = len(snap.question_ids)
+            snap.question_ids.append(qid)
+            snap.descriptions.append(desc)
+            snap.correct_ids.append(0)
+            last_qid = qid
+        snap.choice_ids.append(cid)
+        snap.choice_descs.append(cdesc)
+        if is_correct:
+            snap.correct_ids[-1] = cid
+    if last_qid is not None:
+        snap.offsets.append(len(snap.choice_ids))
+    return snap
+
+def get_snapshot(db: Session, category_id: int) -> _Snapshot:
+    # No lock on purpose: concurrent misses just load the same category twice, which is
+    # cheaper than making every GET /quiz wait behind a reload.
+    snap = _snapshots.get(category_id)
+    now = time.monotonic()
+    if snap is not None and now - snap.checked_at < settings.QUESTION_BANK_CHECK_SECONDS:
+        return snap
+    # versions only grow: an older one comes from a replica that hasn't caught up yet
+    if snap is not None and q_crud.get_bank_version(db, category_id) <= snap.version:
+        snap.checked_at = now
+        return snap
+    snap = _load(db, category_id)
+    _snapshots[category_id] = snap
+    return snap
+
+def sample(db: Session, category_id: int, size: int) -> Optional[List[Dict[str, Any]]]:
+    """Up to `size` random questions, shaped like the crud query; None if the category is too big."""
+    snap = get_snapshot(db, category_id)
+    if snap.too_big:
+        return None
+    picks = random.sample(range(len(snap)), min(size, len(snap)))
+    return [
+        {
+            "question_id": snap.question_ids[i],
+            "question": snap.descriptions[i],
+            "options": snap.options(i),
+        }
+        for i in picks
+    ]
+
+def invalidate(category_ids: Iterable[Optional[int]]) -> None:
+    for cid in category_ids:
+        if cid is not None:
+            _snapshots.pop(int(cid), None)
+
+def clear() -> None:
+    _snapshots.clear()
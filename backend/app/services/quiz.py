@@ -1,12 +1,47 @@
 # app/services/quiz.py
+import random
 from datetime import datetime, timezone
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any, Optional
 
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.core.responses import CachedBody, dumps
 from app.crud import quiz as quiz_crud
+from app.db import listener, replicas
+from app.services import question_bank
 
-def generate_quiz(db: Session, *, category_id: int) -> List[Dict[str, Any]]:
-    return quiz_crud.get_random_questions_with_options(db, category_id)
+QUIZ_SIZE = 5
+# Probes per requested question; extra probes absorb collisions on the random-key index
+PROBE_FACTOR = 2
+
+# Submitted quizzes never change, so their result bodies are cached by quiz_id (bounded by
+# total bytes). Editing a question's text or choices still changes how old results render:
+# the question edits NOTIFY RESULT_CHANNEL and every worker empties its cache. Clients
+# must therefore revalidate (no-cache); the strong ETag makes that a 304 when nothing changed.
+RESULT_CHANNEL = "quiz_result_stale"
+RESULT_CACHE_CONTROL = "private, no-cache"
+_results = LRUCache(
+    1_000_000,
+    weigher=lambda entry: len(entry.body),
+    maxweight=settings.QUIZ_RESULT_CACHE_MB * 1024 * 1024,
+)
+_results_generation = 0
+_results_refill = replicas.PrimaryWindow()
+
+def generate_quiz(db: Session, *, category_id: int, size: int = QUIZ_SIZE) -> List[Dict[str, Any]]:
+    if settings.QUESTION_BANK_CACHE:
+        rows = question_bank.sample(db, category_id, size)
+        if rows is not None:
+            return rows
+
+    keys = [random.random() for _ in range(size * PROBE_FACTOR)]
+    rows = quiz_crud.sample_questions_with_options(db, category_id, keys, size)
+    if len(rows) < size:
+        # Probes collided or the category is tiny: sorting it whole is cheap enough here
+        rows = quiz_crud.get_random_questions_with_options(db, category_id, size)
+    return rows
 
 def submit_quiz(
     db: Session,
@@ -22,13 +57,21 @@ def submit_quiz(
     t_end = time_end or t_start
     if t_end < t_start:
         raise ValueError("timeEnd must be >= timeStart")
+    if len({a["questionId"] for a in answers}) != len(answers):
+        raise ValueError("each question may be answered only once")
 
-    with db.begin():
-        quiz_id = quiz_crud.insert_quiz(db, user_id=user_id, category_id=category_id,
-                                        t_start=t_start, t_end=t_end)
-        quiz_crud.insert_user_answers(db, quiz_id, answers)
-        score = quiz_crud.compute_score(db, quiz_id)
-        quiz_crud.update_quiz_score(db, quiz_id, score)
+    try:
+        with db.begin():
+            quiz_id, score = quiz_crud.insert_quiz_with_answers(
+                db, user_id=user_id, category_id=category_id,
+                t_start=t_start, t_end=t_end, answers=answers,
+            )
+            replicas.publish_write(db, user_id)  # their result/history reads stick to the primary
+    except DBAPIError as e:
+        # trg_choice_matches_question rejects a choice that belongs to another question
+        if getattr(e.orig, "sqlstate", None) == "P0001":
+            raise ValueError("choiceId does not belong to questionId")
+        raise
 
     return {
         "quizId": quiz_id,
@@ -49,5 +92,43 @@ def get_quiz_result(db: Session, *, quiz_id: int) -> Dict[str, Any] | None:
         "correctness_rate": header.get("correct_rate", 0),
     }
 
+def cached_quiz_result(quiz_id: int, *, nested: bool = False) -> Optional[CachedBody]:
+    return _results.get((quiz_id, nested))
+
+def load_quiz_result(db: Session, *, quiz_id: int, nested: bool = False) -> Optional[CachedBody]:
+    """
+    Flat: one item per (question, choice) row, as before. Nested: one item per question
+    with its choices and an is_correct flag, built as JSON by Postgres and spliced into
+    the envelope as-is.
+    """
+    gen = _results_generation
+    _results_refill.apply(db)
+    if nested:
+        data_json = quiz_crud.get_quiz_result_nested_json(db, quiz_id)
+        if data_json is None:
+            return None
+        body = b'{"ok":true,"data":' + data_json.encode("utf-8") + b"}"
+    else:
+        data = get_quiz_result(db, quiz_id=quiz_id)
+        if data is None:
+            return None
+        body = dumps({"ok": True, "data": data})
+    entry = CachedBody(body, cache_control=RESULT_CACHE_CONTROL)
+    if gen == _results_generation:
+        _results.set((quiz_id, nested), entry)
+    return entry
+
+def publish_results_stale(db: Session) -> None:
+    """Call inside a transaction that edits question text or choices."""
+    listener.notify(db, RESULT_CHANNEL, "")
+
+def clear_result_cache() -> None:
+    global _results_generation
+    _results_generation += 1
+    _results.clear()
+    _results_refill.open()
+
+listener.subscribe(RESULT_CHANNEL, lambda payload: clear_result_cache())
+
 def list_user_quizzes(db: Session, *, user_id: int) -> List[Dict[str, Any]]:
     return quiz_crud.list_quizzes_for_user(db, user_id)
@@ -1,7 +1,20 @@
 # app/services/quiz_manage.py
-from typing import Optional, Dict, Any, List
+import csv
+import io
+from datetime import datetime
+from typing import Optional, Dict, Any, Iterator, List, Tuple
 from sqlalchemy.orm import Session
+from app.core.pagination import encode_cursor, decode_cursor, decode_datetime, decode_int
+from app.core.responses import dumps
 from app.crud import quiz_manage as qm_crud
+from app.db.replicas import ReadSessionLocal
+
+EXPORT_COLUMNS = [
+    "quiz_id", "time_start", "time_end", "correct_rate", "user_id", "user_full_name",
+    "user_email", "category_id", "category", "question_count",
+]
+ANSWER_COLUMNS = ["question_id", "choice_id", "is_correct"]
+EXPORT_CHUNK_ROWS = 500  # rows per chunk written to the socket
 
 def admin_list_quizzes(
     db: Session,
@@ -10,20 +23,116 @@ def admin_list_quizzes(
     user_id: Optional[int],
     limit: int,
     offset: int,
-) -> List[Dict[str, Any]]:
-    return qm_crud.list_quizzes(
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Returns (page, next_cursor); a cursor takes precedence over offset."""
+    after = None
+    if cursor:
+        ts, qid = decode_cursor(cursor, 2)
+        after = (decode_datetime(ts), decode_int(qid))
+    rows = qm_crud.list_quizzes(
         db,
         category_id=category_id,
         user_id=user_id,
-        limit=limit,
-        offset=offset,
+        limit=limit + 1,
+        offset=0 if cursor else offset,
+        after=after,
     )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1]["time_start"], rows[-1]["quiz_id"]])
+    return rows, next_cursor
 
-# (Optional) expose total count for pagination
 def admin_count_quizzes(
     db: Session,
     *,
     category_id: Optional[int],
     user_id: Optional[int],
-) -> int:
+) -> Tuple[int, bool]:
+    """(total, exact); see crud.quiz_manage.count_quizzes."""
     return qm_crud.count_quizzes(db, category_id=category_id, user_id=user_id)
+
+def admin_list_quizzes_page(
+    db: Session,
+    *,
+    category_id: Optional[int],
+    user_id: Optional[int],
+    limit: int,
+    offset: int,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str], Dict[str, Any]]:
+    """admin_list_quizzes plus the meta block, in one trip to the threadpool."""
+    rows, next_cursor = admin_list_quizzes(
+        db, category_id=category_id, user_id=user_id, limit=limit, offset=offset, cursor=cursor,
+    )
+    total, exact = admin_count_quizzes(db, category_id=category_id, user_id=user_id)
+    meta = {"total": total, "totalExact": exact, "limit": limit, "offset": 0 if cursor else offset}
+    return rows, next_cursor, meta
+
+def rebuild_counts(db: Session) -> Dict[str, int]:
+    with db.begin():
+        return {
+            "quiz_counts": qm_crud.rebuild_quiz_counts(db),
+            "question_count": qm_crud.backfill_question_counts(db),
+        }
+
+def _csv_value(v: Any) -> Any:
+    return v.isoformat() if isinstance(v, datetime) else v
+
+def _csv_chunks(rows: Iterator[Dict[str, Any]], include_answers: bool) -> Iterator[bytes]:
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(EXPORT_COLUMNS + (ANSWER_COLUMNS if include_answers else []))
+    n = 0
+    for r in rows:
+        head = [_csv_value(r[c]) for c in EXPORT_COLUMNS]
+        if not include_answers:
+            w.writerow(head)
+        elif not r["answers"]:
+            w.writerow(head + ["", "", ""])
+        else:
+            # long format: one line per answer, quiz columns repeated
+            for a in r["answers"]:
+                w.writerow(head + [a["question_id"], a["choice_id"], a["is_correct"]])
+        n += 1
+        if n % EXPORT_CHUNK_ROWS == 0:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode("utf-8")
+
+def _ndjson_chunks(rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+    lines: List[bytes] = []
+    for r in rows:
+        lines.append(dumps(r))
+        if len(lines) == EXPORT_CHUNK_ROWS:
+            yield b"\n".join(lines) + b"\n"
+            lines = []
+    if lines:
+        yield b"\n".join(lines) + b"\n"
+
+def admin_export_quizzes(
+    *,
+    category_id: Optional[int],
+    user_id: Optional[int],
+    fmt: str,
+    include_answers: bool,
+) -> Iterator[bytes]:
+    """
+    Body of GET /admin/quizzes/export as a lazy iterator of byte chunks. It opens its
+    own (read) session because it is consumed by the StreamingResponse after the endpoint
+    (and its request-scoped session) has returned; memory stays at one cursor batch.
+    """
+    db = ReadSessionLocal()
+    try:
+        rows = qm_crud.stream_quizzes(
+            db, category_id=category_id, user_id=user_id, include_answers=include_answers,
+        )
+        if fmt == "csv":
+            yield from _csv_chunks(rows, include_answers)
+        else:
+            yield from _ndjson_chunks(rows)
+    finally:
+        db.rollback()
+        db.close()
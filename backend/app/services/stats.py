@@ -0,0 +1,16 @@
+# app/services/stats.py
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from app.crud import stats as stats_crud
+
+LEADERBOARD_MAX = 100
+
+def user_stats(db: Session, *, user_id: int, category_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    return stats_crud.get_user_stats(db, user_id, category_id)
+
+def leaderboard(db: Session, *, category_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+    return stats_crud.get_leaderboard(db, category_id, min(limit, LEADERBOARD_MAX))
+
+def rebuild(db: Session, *, user_id: Optional[int] = None) -> int:
+    with db.begin():
+        return stats_crud.rebuild_user_category_stats(db, user_id)
@@ -1,15 +1,17 @@
 # app/services/user.py
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.crud import user as user_crud
+from app.db import replicas
+from app.services import user_status
 
 VALID_STATUSES = {"active", "suspended"}
 
 def admin_list_users(db: Session) -> List[Dict[str, Any]]:
     return user_crud.list_users(db)
 
-def admin_set_user_status(db: Session, user_id: int, status: str) -> Dict[str, Any]:
+def admin_set_user_status(db: Session, user_id: int, status: str, *, actor_id: Optional[int] = None) -> Dict[str, Any]:
     status = (status or "").lower()
     if status not in VALID_STATUSES:
         raise HTTPException(status_code=400, detail="status must be 'active' or 'suspended'")
@@ -19,4 +21,7 @@ def admin_set_user_status(db: Session, user_id: int, status: str) -> Dict[str, A
         row = user_crud.update_user_status(db, user_id, status)
         if not row:
             raise HTTPException(status_code=404, detail="User not found")
-        return row
+        user_status.publish_change(db, user_id)
+        replicas.publish_write(db, actor_id)  # the admin's next GET /admin/users
+    user_status.invalidate(user_id)
+    return row
@@ -0,0 +1,41 @@
+# app/services/user_status.py
+"""Cached users.is_active lookups, dropped on NOTIFY user_status."""
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.crud import user as user_crud
+from app.db import listener
+
+CHANNEL = "user_status"
+
+_cache = LRUCache(settings.USER_STATUS_CACHE_SIZE)
+_MISSING = object()
+
+def is_active(db: Session, user_id: int) -> Optional[bool]:
+    """is_active of `user_id`, or None if the user doesn't exist (not cached)."""
+    hit = _cache.get(user_id, _MISSING)
+    if hit is not _MISSING:
+        return hit
+    active = user_crud.get_user_is_active(db, user_id)
+    if active is not None:
+        _cache.set(user_id, bool(active), expires_at=time.time() + settings.USER_STATUS_TTL_SECONDS)
+    return active
+
+def publish_change(db: Session, user_id: int) -> None:
+    """Call inside the transaction that changes the user's status."""
+    listener.notify(db, CHANNEL, str(user_id))
+
+def invalidate(user_id: int) -> None:
+    _cache.pop(user_id)
+
+def _on_notify(payload: Optional[str]) -> None:
+    if payload is None:
+        _cache.clear()
+    else:
+        _cache.pop(int(payload))
+
+listener.subscribe(CHANNEL, _on_notify)
@@ -0,0 +1,40 @@
+# scripts/backfill_stats.py
+"""
+Rebuild the maintained aggregates from quizzes / quizquestion: user_category_stats,
+quiz_counts and quizzes.question_count.
+
+    cd backend
+    DATABASE_URL=... python -m scripts.backfill_stats [--user 42]
+
+--user only rebuilds that user's statistics rows (the counters are left alone).
+
+Safe to run on a live database: submissions arriving meanwhile wait on the table lock
+and are counted once the rebuild commits.
+"""
+import argparse
+import time
+
+from app.db.session import SessionLocal
+from app.services import quiz_manage as qm_svc
+from app.services import stats as stats_svc
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--user", type=int, default=None, help="only rebuild this user's statistics rows")
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        n = stats_svc.rebuild(db, user_id=args.user)
+        print(f"user_category_stats: {n} rows in {time.perf_counter() - t0:.1f}s")
+        if args.user is None:
+            t0 = time.perf_counter()
+            counts = qm_svc.rebuild_counts(db)
+            print(f"quiz_counts: {counts['quiz_counts']} rows, question_count: "
+                  f"{counts['question_count']} quizzes fixed in {time.perf_counter() - t0:.1f}s")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
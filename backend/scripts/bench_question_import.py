@@ -0,0 +1,69 @@
+# scripts/bench_question_import.py
+"""
+Throughput of the bulk question import (POST /admin/questions/import) on generated
+CSV and JSONL files. Target: >= 10k questions/sec against a local Postgres.
+
+    cd backend
+    DATABASE_URL=... python -m scripts.bench_question_import --questions 100000 --choices 4
+
+Imports into a throw-away category and deletes it (with its questions) afterwards.
+"""
+import argparse
+import io
+import json
+import time
+import uuid
+
+from sqlalchemy import text
+
+from app.db.session import SessionLocal
+from app.services import question as q_svc
+
+def _csv(category_id: int, n: int, k: int) -> bytes:
+    buf = io.StringIO()
+    buf.write("categoryId,description,correct," + ",".join(f"choice{i}" for i in range(1, k + 1)) + "\n")
+    for i in range(n):
+        buf.write(f"{category_id},Imported question {i}: which option is right?,{1 + i % k},"
+                  + ",".join(f"option {j} of {i}" for j in range(1, k + 1)) + "\n")
+    return buf.getvalue().encode()
+
+def _jsonl(category_id: int, n: int, k: int) -> bytes:
+    lines = (
+        json.dumps({
+            "categoryId": category_id,
+            "description": f"Imported question {i}: which option is right?",
+            "choices": [{"description": f"option {j} of {i}", "isCorrect": j == 1 + i % k} for j in range(1, k + 1)],
+        })
+        for i in range(n)
+    )
+    return ("\n".join(lines) + "\n").encode()
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--questions", type=int, default=100_000)
+    ap.add_argument("--choices", type=int, default=4)
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    with db.begin():
+        cid = db.execute(text("INSERT INTO category(name) VALUES (:n) RETURNING category_id"),
+                         {"n": f"bench-{uuid.uuid4().hex[:8]}"}).scalar_one()
+    try:
+        print(f"{'format':<6} {'questions':>10} {'seconds':>8} {'q/s':>9}")
+        for fmt, build in (("csv", _csv), ("jsonl", _jsonl)):
+            body = build(cid, args.questions, args.choices)
+            t0 = time.perf_counter()
+            report = q_svc.admin_import_questions(db, io.BytesIO(body), fmt=fmt)
+            dt = time.perf_counter() - t0
+            assert report["rejected"] == 0, report["errors"][:5]
+            print(f"{fmt:<6} {report['imported']:>10} {dt:>8.2f} {report['imported'] / dt:>9.0f}")
+    finally:
+        db.rollback()
+        with db.begin():
+            db.execute(text("DELETE FROM choice WHERE question_id IN (SELECT question_id FROM questions WHERE category_id = :c)"), {"c": cid})
+            db.execute(text("DELETE FROM questions WHERE category_id = :c"), {"c": cid})
+            db.execute(text("DELETE FROM category WHERE category_id = :c"), {"c": cid})
+        db.close()
+
+if __name__ == "__main__":
+    main()
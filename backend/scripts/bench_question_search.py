@@ -0,0 +1,97 @@
+# scripts/bench_question_search.py
+"""
+Latency of the admin question search (GET /admin/questions?q=...) on a synthetic bank.
+
+    cd backend
+    DATABASE_URL=... python -m scripts.bench_question_search --questions 1000000 --runs 30
+
+Seeds a throw-away category with random-word questions (4 choices each) inside one
+transaction that is rolled back at the end, then times common, rare and multi-word
+searches with and without the category filter and with choice text included. The
+target is p95 < 20 ms at 1M questions.
+"""
+import argparse
+import statistics
+import time
+import uuid
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud import question as q_crud
+from app.db.session import SessionLocal
+
+# Zipf-ish vocabulary: earlier words are picked far more often than later ones
+WORDS = (
+    "energy force mass velocity atom molecule reaction equation integer prime matrix vector "
+    "algorithm compiler network protocol entropy photon electron neutron proton isotope acid "
+    "base oxidation catalyst polymer gradient derivative integral limit series theorem proof "
+    "graph tree heap queue stack recursion lattice quantum relativity momentum torque friction "
+    "pressure density viscosity enzyme genome protein allele mitosis osmosis titration valence"
+).split()
+
+SEARCHES = [
+    ("common", "energy"),
+    ("rare", "titration"),
+    ("phrase", "quantum momentum"),
+    ("websearch", "matrix -vector"),
+]
+
+def _seed(db: Session, n: int) -> int:
+    cid = db.execute(text("INSERT INTO category(name) VALUES (:n) RETURNING category_id"),
+                     {"n": f"bench-{uuid.uuid4().hex[:8]}"}).scalar_one()
+    db.execute(text("""
+        INSERT INTO questions(category_id, description)
+        SELECT :cid, (
+          SELECT string_agg(w[1 + floor(power(random(), 2) * array_length(w, 1))::int], ' ')
+          FROM generate_series(1, 6 + g % 6)
+        ) || '?'
+        FROM generate_series(1, :n) g, (SELECT CAST(:words AS text[]) AS w) v
+    """), {"cid": cid, "n": n, "words": WORDS})
+    db.execute(text("""
+        INSERT INTO choice(question_id, description, is_correct)
+        SELECT q.question_id, w[1 + floor(random() * array_length(w, 1))::int] || ' ' || k, k = 1
+        FROM questions q CROSS JOIN generate_series(1, 4) k, (SELECT CAST(:words AS text[]) AS w) v
+        WHERE q.category_id = :cid
+    """), {"cid": cid, "words": WORDS})
+    db.execute(text("ANALYZE questions"))
+    db.execute(text("ANALYZE choice"))
+    return int(cid)
+
+def _time(db: Session, runs: int, **kwargs: Any) -> Dict[str, float]:
+    q_crud.search_questions(db, **kwargs)
+    samples: List[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        q_crud.search_questions(db, **kwargs)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {"p50": statistics.median(samples), "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))]}
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--questions", type=int, default=1_000_000)
+    ap.add_argument("--runs", type=int, default=30)
+    ap.add_argument("--limit", type=int, default=100)
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        cid = _seed(db, args.questions)
+        print(f"seeded {args.questions} questions in {time.perf_counter() - t0:.1f}s")
+        print(f"{'search':<10} {'category':<9} {'choices':<8} {'p50 ms':>8} {'p95 ms':>8}")
+        for label, q in SEARCHES:
+            for category_id in (None, cid):
+                for with_choices in (False, True):
+                    r = _time(db, args.runs, query_text=q, category_id=category_id,
+                              include_choice_text=with_choices, limit=args.limit, offset=0)
+                    print(f"{label:<10} {'yes' if category_id else 'no':<9} {'yes' if with_choices else 'no':<8} "
+                          f"{r['p50']:>8.2f} {r['p95']:>8.2f}")
+    finally:
+        db.rollback()
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# scripts/bench_quiz_result.py
+"""
+Payload size and latency of GET /quiz/result/{id}: the flat format (one item per
+question x choice, regrouped by the client) vs ?format=nested (one item per question,
+aggregated in SQL). Times the full uncached build: queries plus serialization.
+
+    cd backend
+    DATABASE_URL=... python -m scripts.bench_quiz_result --questions 5,20,50 --choices 4 --runs 200
+
+Seeds a throw-away user, category, questions and one answered quiz per size inside a
+transaction that is rolled back at the end.
+"""
+import argparse
+import statistics
+import time
+import uuid
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.services import quiz as quiz_svc
+
+def _seed_quiz(db: Session, user_id: int, n_questions: int, n_choices: int) -> int:
+    cid = db.execute(text("INSERT INTO category(name) VALUES (:n) RETURNING category_id"),
+                     {"n": f"bench-{uuid.uuid4().hex[:8]}"}).scalar_one()
+    db.execute(text("""
+        INSERT INTO questions(category_id, description)
+        SELECT :cid, 'Benchmark question ' || g || ': which of the following statements is true?'
+        FROM generate_series(1, :n) g
+    """), {"cid": cid, "n": n_questions})
+    db.execute(text("""
+        INSERT INTO choice(question_id, description, is_correct)
+        SELECT q.question_id, 'Option ' || k || ' for question ' || q.question_id, k = 1
+        FROM questions q CROSS JOIN generate_series(1, :k) k
+        WHERE q.category_id = :cid
+    """), {"cid": cid, "k": n_choices})
+    quiz_id = db.execute(text("""
+        INSERT INTO quizzes(user_id, category_id, time_start, time_end, correct_rate)
+        VALUES (:uid, :cid, now() - interval '5 minutes', now(), 0.5)
+        RETURNING quiz_id
+    """), {"uid": user_id, "cid": cid}).scalar_one()
+    db.execute(text("""
+        INSERT INTO quizquestion(quiz_id, question_id, user_choice_id)
+        SELECT :qz, q.question_id, (SELECT min(c.choice_id) + (q.question_id % 2) FROM choice c
+                                    WHERE c.question_id = q.question_id)
+        FROM questions q WHERE q.category_id = :cid
+    """), {"qz": quiz_id, "cid": cid})
+    return int(quiz_id)
+
+def _time(db: Session, quiz_id: int, nested: bool, runs: int) -> Dict[str, float]:
+    size = len(quiz_svc.load_quiz_result(db, quiz_id=quiz_id, nested=nested).body)
+    samples: List[float] = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        quiz_svc.load_quiz_result(db, quiz_id=quiz_id, nested=nested)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {"bytes": size, "p50": statistics.median(samples),
+            "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))]}
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--questions", default="5,20,50", help="comma-separated quiz lengths")
+    ap.add_argument("--choices", type=int, default=4)
+    ap.add_argument("--runs", type=int, default=200)
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    try:
+        user_id = db.execute(text("""
+            INSERT INTO users(email, password_hash, firstname, lastname)
+            VALUES (:e, 'x', 'Bench', 'User') RETURNING user_id
+        """), {"e": f"bench-{uuid.uuid4().hex[:8]}@example.com"}).scalar_one()
+        print(f"{'questions':>9} {'format':<7} {'bytes':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        for n in (int(x) for x in args.questions.split(",")):
+            quiz_id = _seed_quiz(db, user_id, n, args.choices)
+            for nested in (False, True):
+                r = _time(db, quiz_id, nested, args.runs)
+                print(f"{n:>9} {'nested' if nested else 'flat':<7} {r['bytes']:>8} {r['p50']:>8.2f} {r['p95']:>8.2f}")
+    finally:
+        db.rollback()
+        db.close()
+        quiz_svc.clear_result_cache()
+
+if __name__ == "__main__":
+    main()
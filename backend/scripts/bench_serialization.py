@@ -0,0 +1,90 @@
+# scripts/bench_serialization.py
+"""
+Serialization cost per endpoint: FastAPI's default path (jsonable_encoder + stdlib
+json, what a `return {"ok": True, "data": rows}` costs) vs app.core.responses (orjson).
+
+    cd backend
+    python -m scripts.bench_serialization --runs 200
+
+No database connection needed: payloads are synthetic rows shaped like each endpoint's crud output,
+at the largest page size the endpoint allows.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import dumps
+
+def _stdlib(body: Any) -> bytes:
+    # starlette JSONResponse.render after FastAPI's serialize_response
+    return json.dumps(jsonable_encoder(body), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+def _text(rnd: random.Random, words: int) -> str:
+    return " ".join(rnd.choice(("energy", "matrix", "proton", "theorem", "enzyme", "vector")) for _ in range(words))
+
+def _payloads() -> Dict[str, Any]:
+    rnd = random.Random(42)
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    categories = [{"category_id": i, "name": f"Category {i}"} for i in range(1, 21)]
+    questions = [
+        {"question_id": 100000 - i, "description": _text(rnd, 12) + "?", "category_id": 1 + i % 20,
+         "category": f"Category {1 + i % 20}", "is_active": True}
+        for i in range(500)
+    ]
+    with_choices = [
+        {**q, "choices": [{"choice_id": q["question_id"] * 4 + k, "description": _text(rnd, 3), "isCorrect": k == 0}
+                          for k in range(4)]}
+        for q in questions
+    ]
+    quizzes = [
+        {"quiz_id": 50000 - i, "time_start": now - timedelta(minutes=i), "time_end": now - timedelta(minutes=i - 3),
+         "correct_rate": Decimal("0.8"), "user_id": i % 97, "user_full_name": "Ada Lovelace",
+         "user_email": f"user{i % 97}@example.com", "category_id": 1 + i % 20, "category": f"Category {1 + i % 20}",
+         "question_count": 5}
+        for i in range(200)
+    ]
+    quiz = [
+        {"question_id": i, "description": _text(rnd, 12) + "?",
+         "options": [{"choice_id": i * 4 + k, "description": _text(rnd, 3)} for k in range(4)]}
+        for i in range(5)
+    ]
+    return {
+        "GET /categories": {"ok": True, "data": categories},
+        "GET /quiz": {"ok": True, "data": quiz},
+        "GET /admin/questions (500)": {"ok": True, "data": questions, "nextCursor": "WzEwMF0"},
+        "GET /admin/questions?includeChoices (500)": {"ok": True, "data": with_choices, "nextCursor": "WzEwMF0"},
+        "GET /admin/quizzes (200)": {"ok": True, "data": quizzes, "nextCursor": "WzEwMF0"},
+    }
+
+def _time(fn: Callable[[Any], bytes], body: Any, runs: int) -> List[float]:
+    fn(body)
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn(body)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return samples
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=200)
+    args = ap.parse_args()
+
+    print(f"{'endpoint':<44} {'bytes':>8} {'stdlib p50':>11} {'orjson p50':>11} {'speedup':>8}")
+    for name, body in _payloads().items():
+        assert json.loads(_stdlib(body)) == json.loads(dumps(body)), name
+        base = statistics.median(_time(_stdlib, body, args.runs))
+        fast = statistics.median(_time(dumps, body, args.runs))
+        print(f"{name:<44} {len(dumps(body)):>8} {base:>9.3f}ms {fast:>9.3f}ms {base / fast:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
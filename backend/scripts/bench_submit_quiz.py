@@ -0,0 +1,93 @@
+# scripts/bench_submit_quiz.py
+"""
+p50/p99 of the quiz submission path: crud.quiz.insert_quiz_with_answers on its own
+versus services.quiz.submit_quiz (validation plus the same statement).
+
+    cd backend
+    DATABASE_URL=... python -m scripts.bench_submit_quiz --runs 500 --category 1
+
+Uses the first non-admin user and deletes every quiz it created when done (then
+rebuilds that user's statistics rows).
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.crud import quiz as quiz_crud
+from app.db.session import SessionLocal
+from app.services import quiz as quiz_svc
+from app.services import stats as stats_svc
+
+def _sql_submit(db: Session, *, user_id: int, category_id: int, answers: List[Dict[str, int]]) -> int:
+    t = datetime.now(timezone.utc)
+    with db.begin():
+        quiz_id, _ = quiz_crud.insert_quiz_with_answers(
+            db, user_id=user_id, category_id=category_id, t_start=t, t_end=t, answers=answers,
+        )
+    return quiz_id
+
+def _svc_submit(db: Session, *, user_id: int, category_id: int, answers: List[Dict[str, int]]) -> int:
+    data = quiz_svc.submit_quiz(db, user_id=user_id, category_id=category_id, answers=answers,
+                                time_start=None, time_end=None)
+    return data["quizId"]
+
+def _answer_pool(db: Session, category_id: int) -> Dict[int, List[int]]:
+    rows = db.execute(text("""
+        SELECT q.question_id, c.choice_id
+        FROM questions q JOIN choice c ON c.question_id = q.question_id
+        WHERE q.category_id = :cid AND q.is_active
+    """), {"cid": category_id}).all()
+    db.rollback()
+    pool: Dict[int, List[int]] = {}
+    for qid, cid in rows:
+        pool.setdefault(qid, []).append(cid)
+    return pool
+
+def _pct(samples: List[float], p: float) -> float:
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=500)
+    ap.add_argument("--category", type=int, default=1)
+    ap.add_argument("--answers", type=int, default=quiz_svc.QUIZ_SIZE)
+    args = ap.parse_args()
+
+    db = SessionLocal()
+    created: List[int] = []
+    try:
+        user_id = db.execute(text("SELECT user_id FROM users WHERE NOT is_admin ORDER BY user_id LIMIT 1")).scalar_one()
+        db.rollback()
+        pool = _answer_pool(db, args.category)
+        qids = list(pool)
+        if len(qids) < args.answers:
+            raise SystemExit(f"category {args.category} has only {len(qids)} active questions")
+
+        print(f"{'path':<10} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+        for name, fn in (("sql", _sql_submit), ("service", _svc_submit)):
+            samples: List[float] = []
+            for _ in range(args.runs):
+                answers = [{"questionId": q, "choiceId": random.choice(pool[q])}
+                           for q in random.sample(qids, args.answers)]
+                t0 = time.perf_counter()
+                created.append(fn(db, user_id=user_id, category_id=args.category, answers=answers))
+                samples.append((time.perf_counter() - t0) * 1000)
+            samples.sort()
+            print(f"{name:<10} {statistics.median(samples):>9.2f} {_pct(samples, 0.99):>9.2f} "
+                  f"{statistics.fmean(samples):>9.2f}")
+    finally:
+        db.rollback()
+        if created:
+            with db.begin():
+                db.execute(text("DELETE FROM quizzes WHERE quiz_id = ANY(:ids)"), {"ids": created})
+            stats_svc.rebuild(db, user_id=user_id)  # both paths also updated stats
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+# scripts/gen_data.py
+"""
+Synthetic data at production-like scale: users, categories, questions with choices,
+and submitted quizzes with their answers, written over COPY.
+
+    cd backend
+    DATABASE_URL=... python -m scripts.gen_data --users 1000000 --questions 100000 \\
+        --quizzes 10000000 --per-quiz 5 --seed 42 --jobs 8 --skip-triggers
+
+(10M quizzes x 5 answers = 50M quizquestion rows.) Rows are appended next to whatever
+is already there, so run it on a freshly loaded schema or a dedicated database. The
+output is valid by construction:
+  - every question has exactly one correct choice (uniq_one_correct_per_question)
+  - every chosen choice belongs to its question (trg_choice_matches_question)
+  - quizzes carry the correct_rate and question_count that submitting them would give
+
+Popularity is skewed the way real traffic is. Quizzes pick their category with a Zipf
+distribution (--zipf), so a few categories get most attempts. Bigger categories also
+get more questions, and a small share of users take most quizzes. Each user's hit rate
+follows a fixed per-user skill.
+
+The output depends only on --seed, --until and the sizes, not on --jobs. Quiz chunks
+are seeded by (seed, chunk) and can be written by any worker. Ids are reserved from
+each table's sequence up front, so only their offset depends on the existing rows.
+
+--skip-triggers loads with session_replication_role = replica (superuser only). This
+skips the per-row FK checks and the choice/question trigger on quizquestion, and it is
+by far the largest cost at 50M rows.
+
+Without it, the quiz_counts insert trigger is disabled for the quiz load. Every chunk
+would otherwise upsert the same category rows and hold their locks until its big
+quizquestion COPY commits, which serializes the --jobs writers (and can deadlock them).
+Either way quiz_counts and user_category_stats are rebuilt from the generated quizzes
+afterwards, and the tables are ANALYZEd at the end.
+
+Each quiz chunk is committed on its own; an interrupted run leaves the chunks written
+so far (and, if killed outright, the counter trigger disabled: re-enable it with
+ALTER TABLE quizzes ENABLE TRIGGER trg_quiz_counts_insert and run scripts.backfill_stats).
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from bisect import bisect
+from datetime import datetime, timedelta, timezone
+from itertools import accumulate
+from typing import Iterable, List, Optional, Tuple
+
+from passlib.hash import bcrypt
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import quiz_manage as qm_crud
+from app.db.session import SessionLocal, engine
+from app.services import stats as stats_svc
+from scripts.bench_question_search import WORDS
+
+FIRST_NAMES = "Ada Alan Grace Linus Barbara Donald Edsger Margaret Ken Dennis Frances John Katherine Tim Radia".split()
+LAST_NAMES = "Lovelace Turing Hopper Torvalds Liskov Knuth Dijkstra Hamilton Thompson Ritchie Allen Backus Johnson Lee Perlman".split()
+TOPICS = "Math Physics Chemistry Biology History Geography Literature Music Art Astronomy Economics Computing".split()
+
+COPY_FLUSH = 8192  # lines buffered per COPY write
+
+def _ts(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+def _cdf(n: int, s: float) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..n; pick with bisect(cdf, random() * cdf[-1])."""
+    return list(accumulate(1.0 / (k ** s) for k in range(1, n + 1)))
+
+def _pick(rng: random.Random, cdf: List[float]) -> int:
+    return min(bisect(cdf, rng.random() * cdf[-1]), len(cdf) - 1)
+
+def _copy(db: Session, sql: str, lines: Iterable[str]) -> int:
+    """COPY text-format `lines` (tab separated, newline terminated) on the session's connection."""
+    raw_conn = db.connection().connection.driver_connection
+    n = 0
+    buf: List[str] = []
+    with raw_conn.cursor() as cur:
+        with cur.copy(sql) as cp:
+            for line in lines:
+                buf.append(line)
+                if len(buf) == COPY_FLUSH:
+                    cp.write("".join(buf))
+                    n += len(buf)
+                    buf.clear()
+            if buf:
+                cp.write("".join(buf))
+                n += len(buf)
+    return n
+
+def _reserve(db: Session, table: str, column: str, n: int) -> int:
+    """First of `n` consecutive ids taken from the table's sequence (assumes nobody else is inserting)."""
+    return int(db.execute(text("""
+        SELECT setval(s.seq, nextval(s.seq) + :n - 1) - :n + 1
+        FROM (SELECT pg_get_serial_sequence(:t, :c) AS seq) s
+    """), {"t": table, "c": column, "n": max(n, 1)}).scalar_one())
+
+class Plan:
+    """Everything a quiz worker needs; built once, inherited by the forked workers."""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.until = args.until.timestamp()
+        self.span = args.days * 86400.0
+        self.user_base = 0
+        self.category_base = 0
+        self.question_base = 0
+        self.choice_base = 0
+        self.quiz_base = 0
+        self.question_category: List[int] = []   # category index per question index
+        self.correct: List[int] = []             # correct choice offset per question index
+        self.active: List[bool] = []
+        self.active_by_category: List[List[int]] = []
+        self.category_cdf = _cdf(args.categories, args.zipf)
+
+    def rng(self, *parts: object) -> random.Random:
+        return random.Random(":".join(str(p) for p in (self.args.seed,) + parts))
+
+    # ---- users, categories, questions, choices (main process) ----
+
+    def user_lines(self, password_hash: str) -> Iterable[str]:
+        rng = self.rng("users")
+        for i in range(self.args.users):
+            uid = self.user_base + i
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            active = "t" if rng.random() < 0.98 else "f"
+            created = self.until - self.span - rng.random() * self.span
+            yield f"{uid}\tuser{uid}@example.com\t{password_hash}\t{first}\t{last}\t{active}\tf\t{_ts(created)}\n"
+
+    def category_lines(self) -> Iterable[str]:
+        for i in range(self.args.categories):
+            cid = self.category_base + i
+            yield f"{cid}\t{TOPICS[i % len(TOPICS)]} {cid}\n"
+
+    def build_questions(self) -> None:
+        rng = self.rng("questions")
+        cdf = _cdf(self.args.categories, self.args.zipf / 2)  # milder skew than the traffic
+        self.active_by_category = [[] for _ in range(self.args.categories)]
+        for qi in range(self.args.questions):
+            ci = _pick(rng, cdf)
+            self.question_category.append(ci)
+            self.correct.append(rng.randrange(self.args.choices))
+            active = rng.random() < 0.97
+            self.active.append(active)
+            if active:
+                self.active_by_category[ci].append(qi)
+
+    def question_lines(self) -> Iterable[str]:
+        rng = self.rng("question-text")
+        n_words = len(WORDS)
+        for qi in range(self.args.questions):
+            words = " ".join(WORDS[int(rng.random() ** 2 * n_words)] for _ in range(6 + rng.randrange(6)))
+            created = self.until - self.span - rng.random() * self.span
+            yield (f"{self.question_base + qi}\t{self.category_base + self.question_category[qi]}\t"
+                   f"{words.capitalize()}?\t{'t' if self.active[qi] else 'f'}\t{_ts(created)}\t{rng.random()!r}\n")
+
+    def choice_lines(self) -> Iterable[str]:
+        rng = self.rng("choice-text")
+        k = self.args.choices
+        for qi in range(self.args.questions):
+            qid = self.question_base + qi
+            for j in range(k):
+                word = WORDS[rng.randrange(len(WORDS))]
+                yield f"{self.choice_base + qi * k + j}\t{qid}\t{word} {j + 1}\t{'t' if j == self.correct[qi] else 'f'}\n"
+
+    # ---- quizzes and answers (workers, one chunk at a time) ----
+
+    def quiz_chunk(self, chunk: int) -> Tuple[List[str], List[str]]:
+        a = self.args
+        rng = self.rng("quizzes", chunk)
+        lo, hi = chunk * a.chunk, min(a.quizzes, (chunk + 1) * a.chunk)
+        quizzes: List[str] = []
+        answers: List[str] = []
+        for i in range(lo, hi):
+            quiz_id = self.quiz_base + i
+            ci = _pick(rng, self.category_cdf)
+            uid_off = int(a.users * rng.random() ** 3)  # low offsets are the heavy users
+            skill = 0.3 + 0.6 * ((uid_off * 2654435761) % 1000) / 1000
+            picks = rng.sample(self.active_by_category[ci], min(a.per_quiz, len(self.active_by_category[ci])))
+            correct = 0
+            for qi in picks:
+                first = self.choice_base + qi * a.choices
+                offset = self.correct[qi] if rng.random() < skill else rng.randrange(a.choices)
+                correct += offset == self.correct[qi]
+                answers.append(f"{quiz_id}\t{self.question_base + qi}\t{first + offset}\n")
+            start = self.until - rng.random() * self.span
+            end = start + rng.uniform(20, 600)
+            rate = correct / len(picks) if picks else 0.0
+            quizzes.append(f"{quiz_id}\t{self.user_base + uid_off}\t{self.category_base + ci}\t"
+                           f"{_ts(start)}\t{_ts(end)}\t{rate!r}\t{len(picks)}\n")
+        return quizzes, answers
+
+_plan: Optional[Plan] = None
+
+COUNTS_TRIGGER = "trg_quiz_counts_insert"
+
+def _set_counts_trigger(enabled: bool) -> None:
+    db = SessionLocal()
+    try:
+        with db.begin():
+            db.execute(text(f"ALTER TABLE quizzes {'ENABLE' if enabled else 'DISABLE'} TRIGGER {COUNTS_TRIGGER}"))
+    finally:
+        db.close()
+
+def _write_chunk(chunk: int) -> Tuple[int, int]:
+    quizzes, answers = _plan.quiz_chunk(chunk)
+    db = SessionLocal()
+    try:
+        with db.begin():
+            if _plan.args.skip_triggers:
+                db.execute(text("SET LOCAL session_replication_role = replica"))
+            _copy(db, "COPY quizzes (quiz_id, user_id, category_id, time_start, time_end, correct_rate, "
+                      "question_count) FROM STDIN", quizzes)
+            _copy(db, "COPY quizquestion (quiz_id, question_id, user_choice_id) FROM STDIN", answers)
+    finally:
+        db.close()
+    return len(quizzes), len(answers)
+
+def _init_worker() -> None:
+    # connections inherited from the parent must not be used here
+    engine.dispose(close=False)
+
+def _step(label: str, t0: float, n: int) -> None:
+    dt = time.perf_counter() - t0
+    print(f"{label:<14} {n:>12,} rows {dt:>8.1f}s {n / dt if dt else 0:>12,.0f} rows/s", flush=True)
+
+def main() -> None:
+    global _plan
+    today = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=1_000_000)
+    ap.add_argument("--categories", type=int, default=24)
+    ap.add_argument("--questions", type=int, default=100_000)
+    ap.add_argument("--choices", type=int, default=4, help="choices per question (one correct)")
+    ap.add_argument("--quizzes", type=int, default=10_000_000)
+    ap.add_argument("--per-quiz", type=int, default=5, help="answers per quiz (the app's QUIZ_SIZE is 5)")
+    ap.add_argument("--zipf", type=float, default=1.1, help="category popularity skew (0 = uniform)")
+    ap.add_argument("--days", type=float, default=365, help="quizzes are spread over this many days before --until")
+    ap.add_argument("--until", type=lambda s: datetime.fromisoformat(s).replace(tzinfo=timezone.utc), default=today,
+                    help="ISO date the history ends at (default: today, UTC midnight)")
+    ap.add_argument("--password", default="password", help="every generated user gets this password")
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--jobs", type=int, default=min(8, os.cpu_count() or 1), help="parallel quiz writers")
+    ap.add_argument("--chunk", type=int, default=20_000, help="quizzes per COPY transaction")
+    ap.add_argument("--skip-triggers", action="store_true", help="load with session_replication_role = replica")
+    args = ap.parse_args()
+    if args.choices < 1 or args.per_quiz < 1 or args.categories < 1:
+        ap.error("--choices, --per-quiz and --categories must be >= 1")
+
+    plan = _plan = Plan(args)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with db.begin():
+            plan.user_base = _reserve(db, "users", "user_id", args.users)
+            plan.category_base = _reserve(db, "category", "category_id", args.categories)
+            plan.question_base = _reserve(db, "questions", "question_id", args.questions)
+            plan.choice_base = _reserve(db, "choice", "choice_id", args.questions * args.choices)
+            plan.quiz_base = _reserve(db, "quizzes", "quiz_id", args.quizzes)
+
+        password_hash = bcrypt.using(rounds=settings.BCRYPT_ROUNDS).hash(args.password)
+        plan.build_questions()
+        with db.begin():
+            if args.skip_triggers:
+                db.execute(text("SET LOCAL session_replication_role = replica"))
+            t0 = time.perf_counter()
+            n = _copy(db, "COPY users (user_id, email, password_hash, firstname, lastname, is_active, is_admin, "
+                          "created_at) FROM STDIN", plan.user_lines(password_hash))
+            _step("users", t0, n)
+            t0 = time.perf_counter()
+            n = _copy(db, "COPY category (category_id, name) FROM STDIN", plan.category_lines())
+            _step("categories", t0, n)
+            t0 = time.perf_counter()
+            n = _copy(db, "COPY questions (question_id, category_id, description, is_active, created_at, rand_key) "
+                          "FROM STDIN", plan.question_lines())
+            _step("questions", t0, n)
+            t0 = time.perf_counter()
+            n = _copy(db, "COPY choice (choice_id, question_id, description, is_correct) FROM STDIN",
+                      plan.choice_lines())
+            _step("choices", t0, n)
+    finally:
+        db.close()
+
+    t0 = time.perf_counter()
+    chunks = range((args.quizzes + args.chunk - 1) // args.chunk)
+    n_quizzes = n_answers = 0
+    if not args.skip_triggers:
+        _set_counts_trigger(False)
+    pool = None
+    try:
+        if args.jobs <= 1:
+            results: Iterable[Tuple[int, int]] = map(_write_chunk, chunks)
+        else:
+            engine.dispose()
+            pool = multiprocessing.get_context("fork").Pool(args.jobs, initializer=_init_worker)
+            results = pool.imap_unordered(_write_chunk, chunks)
+        for i, (q, a) in enumerate(results, 1):
+            n_quizzes += q
+            n_answers += a
+            if i % 50 == 0:
+                print(f"  {n_quizzes:,} quizzes / {n_answers:,} answers", flush=True)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if not args.skip_triggers:
+            _set_counts_trigger(True)  # before the rebuild, which then folds in any concurrent inserts
+    _step("quizzes", t0, n_quizzes)
+    _step("quizquestion", t0, n_answers)
+
+    db = SessionLocal()
+    try:
+        t0 = time.perf_counter()
+        with db.begin():
+            n = qm_crud.rebuild_quiz_counts(db)
+        _step("quiz_counts", t0, n)
+        t0 = time.perf_counter()
+        _step("user stats", t0, stats_svc.rebuild(db))
+        t0 = time.perf_counter()
+        with db.begin():
+            db.execute(text("ANALYZE users, category, questions, choice, quizzes, quizquestion, "
+                            "user_category_stats, quiz_counts"))
+        print(f"{'analyze':<14} {time.perf_counter() - t0:>21.1f}s")
+    finally:
+        db.close()
+    print(f"done in {timedelta(seconds=round(time.perf_counter() - started))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+# scripts/loadtest.py
+"""
+HTTP load generator for the API: virtual users run weighted scenarios against a running
+server and the run is summarized per route (throughput, errors, p50/p95/p99) as JSON.
+
+    cd backend
+    uvicorn app.main:app --workers 4 &
+    python -m scripts.loadtest run --base-url http://127.0.0.1:8000 --concurrency 50 \\
+        --duration 60 --mix player=6,browser=2,login=1,admin=1 \\
+        --admin-email admin@example.com --admin-password ... --out before.json
+    python -m scripts.loadtest compare before.json after.json --threshold 10
+
+Scenarios (one iteration each, repeated until the run ends):
+  player   GET /categories, GET /quiz, POST /quiz, GET /quiz/result/{id}, sometimes the history
+  browser  GET /categories, leaderboard, GET /stats/me, GET /quiz/result history
+  login    POST /auth/login (the bcrypt path)
+  admin    question listing (two pages) and search, quiz listing, user listing
+
+Accounts loadtest+<n>@example.com are logged in up front and registered first if they
+don't exist, so the target database only needs categories with questions (seed it at the
+scale under test). The admin scenario needs --admin-email/--admin-password and is dropped
+from the mix without them. Requests made during --warmup are not recorded.
+
+`compare` prints per-route deltas and exits 1 when p95/p99 got slower or throughput got
+lower by more than --threshold percent, or the error rate rose by more than a point.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+SCENARIOS = ("player", "browser", "login", "admin")
+SEARCH_TERMS = ("energy", "matrix", "protein", "theorem", "acid")
+
+class Recorder:
+    def __init__(self) -> None:
+        self.recording = False
+        self.samples: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.statuses: Dict[str, Dict[str, int]] = {}
+
+    def add(self, route: str, ms: float, status: str, failed: bool) -> None:
+        if not self.recording:
+            return
+        self.samples.setdefault(route, []).append(ms)
+        by_status = self.statuses.setdefault(route, {})
+        by_status[status] = by_status.get(status, 0) + 1
+        if failed:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+def _pct(xs: List[float], p: float) -> float:
+    # nearest rank on a sorted list
+    return xs[max(0, min(len(xs) - 1, math.ceil(p / 100 * len(xs)) - 1))]
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, rec: Recorder, rng: random.Random, email: str, password: str):
+        self.client = client
+        self.rec = rec
+        self.rng = rng
+        self.email = email
+        self.password = password
+        self.token: Optional[str] = None
+        self.categories: List[int] = []
+        self.categories_etag: Optional[str] = None
+        self.last_quiz_id: Optional[int] = None
+
+    async def call(self, method: str, route: str, url: Optional[str] = None, *, auth: bool = True,
+                   expect: Tuple[int, ...] = (200,), **kwargs: Any) -> Optional[httpx.Response]:
+        """One request, recorded under `route` (the path template). None on a transport error."""
+        headers = kwargs.pop("headers", {})
+        if auth and self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        t0 = time.perf_counter()
+        try:
+            res = await self.client.request(method, url or route, headers=headers, **kwargs)
+        except httpx.HTTPError as e:
+            self.rec.add(f"{method} {route}", (time.perf_counter() - t0) * 1000, type(e).__name__, True)
+            return None
+        ms = (time.perf_counter() - t0) * 1000
+        failed = res.status_code not in expect
+        if not failed and res.status_code == 200 and res.headers.get("content-type", "").startswith("application/json"):
+            failed = res.json().get("ok") is False
+        self.rec.add(f"{method} {route}", ms, str(res.status_code), failed)
+        return None if failed else res
+
+    async def login(self) -> bool:
+        creds = {"email": self.email, "password": self.password}
+        res = await self.call("POST", "/auth/login", auth=False, json=creds, expect=(200,))
+        if res is None:
+            return False
+        self.token = res.json()["data"]["token"]
+        return True
+
+    async def ensure_account(self) -> bool:
+        if await self.login():
+            return True
+        await self.call("POST", "/auth/register", auth=False, json={
+            "email": self.email, "password": self.password, "firstname": "Load", "lastname": "Test",
+            "is_active": True,
+        })
+        return await self.login()
+
+    async def fetch_categories(self) -> None:
+        headers = {"If-None-Match": self.categories_etag} if self.categories_etag else {}
+        res = await self.call("GET", "/categories", headers=headers, expect=(200, 304))
+        if res is not None and res.status_code == 200:
+            self.categories = [c["category_id"] for c in res.json()["data"]]
+            self.categories_etag = res.headers.get("etag")
+
+    async def player(self) -> None:
+        await self.fetch_categories()
+        if not self.categories:
+            return
+        cid = self.rng.choice(self.categories)
+        res = await self.call("GET", "/quiz", params={"categoryId": cid})
+        if res is None:
+            return
+        questions = res.json()["data"]
+        answers = [
+            {"questionId": q["question_id"], "choiceId": self.rng.choice(q["options"])["choiceId"]}
+            for q in questions if q["options"]
+        ]
+        res = await self.call("POST", "/quiz", json={"categoryId": cid, "answers": answers})
+        if res is None:
+            return
+        self.last_quiz_id = res.json()["data"]["quizId"]
+        fmt = self.rng.choice(("flat", "nested"))
+        await self.call("GET", "/quiz/result/{id}", f"/quiz/result/{self.last_quiz_id}", params={"format": fmt})
+        if self.rng.random() < 0.3:
+            await self.call("GET", "/quiz/result")
+
+    async def browser(self) -> None:
+        await self.fetch_categories()
+        if self.categories:
+            cid = self.rng.choice(self.categories)
+            await self.call("GET", "/stats/leaderboard/{id}", f"/stats/leaderboard/{cid}")
+        await self.call("GET", "/stats/me")
+        await self.call("GET", "/quiz/result")
+
+    async def admin(self) -> None:
+        res = await self.call("GET", "/admin/questions", params={"limit": 50})
+        if res is not None and res.json().get("nextCursor"):
+            await self.call("GET", "/admin/questions?cursor", "/admin/questions",
+                            params={"limit": 50, "cursor": res.json()["nextCursor"]})
+        await self.call("GET", "/admin/questions?q", "/admin/questions",
+                        params={"q": self.rng.choice(SEARCH_TERMS), "limit": 20})
+        await self.call("GET", "/admin/quizzes", params={"limit": 50})
+        await self.call("GET", "/admin/users")
+
+async def _run_user(vu: VirtualUser, mix: List[Tuple[str, float]], deadline: float, think: float) -> None:
+    names = [n for n, _ in mix]
+    weights = [w for _, w in mix]
+    while time.monotonic() < deadline:
+        scenario = vu.rng.choices(names, weights)[0]
+        await (vu.login() if scenario == "login" else getattr(vu, scenario)())
+        if think:
+            await asyncio.sleep(vu.rng.expovariate(1 / think))
+
+def _parse_mix(spec: str) -> List[Tuple[str, float]]:
+    mix = []
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}; expected one of {', '.join(SCENARIOS)}")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+def _summarize(rec: Recorder, seconds: float) -> Dict[str, Any]:
+    routes: Dict[str, Any] = {}
+    total = errors = 0
+    for route in sorted(rec.samples):
+        xs = sorted(rec.samples[route])
+        n_err = rec.errors.get(route, 0)
+        total += len(xs)
+        errors += n_err
+        routes[route] = {
+            "count": len(xs),
+            "errors": n_err,
+            "errorRate": n_err / len(xs),
+            "rps": len(xs) / seconds,
+            "mean": statistics.fmean(xs),
+            "p50": _pct(xs, 50),
+            "p95": _pct(xs, 95),
+            "p99": _pct(xs, 99),
+            "max": xs[-1],
+            "statuses": rec.statuses.get(route, {}),
+        }
+    return {
+        "totals": {"requests": total, "errors": errors, "rps": total / seconds if seconds else 0.0},
+        "routes": routes,
+    }
+
+async def _run(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = _parse_mix(args.mix)
+    if any(n == "admin" for n, _ in mix) and not args.admin_email:
+        print("no --admin-email: dropping the admin scenario", file=sys.stderr)
+        mix = [(n, w) for n, w in mix if n != "admin"]
+    # The admin weight is the share of virtual users that browse as the admin account and
+    # run only that scenario; everyone else draws from the rest of the mix.
+    admin_mix = [(n, w) for n, w in mix if n == "admin"]
+    user_mix = [(n, w) for n, w in mix if n != "admin"]
+    share = sum(w for _, w in admin_mix) / sum(w for _, w in mix) if mix else 0.0
+    n_admins = args.concurrency if not user_mix else (max(1, round(args.concurrency * share)) if share else 0)
+
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        users = []
+        for i in range(args.concurrency):
+            rng = random.Random(args.seed * 1_000_003 + i)
+            if i < n_admins:
+                users.append(VirtualUser(client, rec, rng, args.admin_email, args.admin_password))
+            else:
+                n = i % args.users
+                users.append(VirtualUser(client, rec, rng, f"loadtest+{n}@example.com", args.password))
+        sem = asyncio.Semaphore(min(args.concurrency, 16))  # bcrypt-bound: don't stampede at start
+
+        # one login (or registration) per distinct account; virtual users sharing it share the token
+        first: Dict[str, VirtualUser] = {}
+        for vu in users:
+            first.setdefault(vu.email, vu)
+
+        async def _setup(vu: VirtualUser) -> None:
+            async with sem:
+                await vu.ensure_account()
+
+        await asyncio.gather(*(_setup(vu) for vu in first.values()))
+        for vu in users:
+            vu.token = first[vu.email].token
+        users = [vu for vu in users if vu.token]
+        if not users:
+            raise SystemExit("no virtual user could log in; is the server up and seeded?")
+        print(f"{len(users)} virtual users logged in; running {args.warmup}s warmup + {args.duration}s",
+              file=sys.stderr)
+
+        start = time.monotonic()
+        deadline = start + args.warmup + args.duration
+
+        async def _start_recording() -> None:
+            await asyncio.sleep(args.warmup)
+            rec.recording = True
+
+        tasks = [asyncio.create_task(_start_recording())]
+        for vu in users:
+            vu_mix = admin_mix if vu.email == args.admin_email else user_mix
+            tasks.append(asyncio.create_task(_run_user(vu, vu_mix, deadline, args.think_ms / 1000)))
+        await asyncio.gather(*tasks)
+        measured = max(1e-9, time.monotonic() - start - args.warmup)
+
+    out = {
+        "meta": {
+            "label": args.label,
+            "baseUrl": args.base_url,
+            "startedAt": datetime.now(timezone.utc).isoformat(),
+            "concurrency": args.concurrency,
+            "virtualUsers": len(users),
+            "durationSeconds": round(measured, 2),
+            "mix": dict(mix),
+            "seed": args.seed,
+        },
+        **_summarize(rec, measured),
+    }
+    return out
+
+def _print_summary(report: Dict[str, Any]) -> None:
+    t = report["totals"]
+    print(f"{t['requests']} requests, {t['errors']} errors, {t['rps']:.1f} req/s", file=sys.stderr)
+    print(f"{'route':<32} {'count':>7} {'rps':>8} {'err%':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}",
+          file=sys.stderr)
+    for route, r in report["routes"].items():
+        print(f"{route:<32} {r['count']:>7} {r['rps']:>8.1f} {r['errorRate'] * 100:>6.2f} "
+              f"{r['p50']:>8.1f} {r['p95']:>8.1f} {r['p99']:>8.1f}", file=sys.stderr)
+
+def _compare(base: Dict[str, Any], new: Dict[str, Any], threshold: float) -> int:
+    for key in ("concurrency", "mix"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"warning: runs differ in {key}: {base['meta'].get(key)} vs {new['meta'].get(key)}")
+    limit = threshold / 100
+    flagged = 0
+    print(f"{'route':<32} {'rps':>16} {'p95 ms':>20} {'p99 ms':>20} {'err%':>12}")
+    for route in sorted(set(base["routes"]) | set(new["routes"])):
+        b, n = base["routes"].get(route), new["routes"].get(route)
+        if b is None or n is None:
+            print(f"{route:<32} only in {'new' if b is None else 'base'} run")
+            continue
+        reasons = []
+        if n["p95"] > b["p95"] * (1 + limit):
+            reasons.append("p95")
+        if n["p99"] > b["p99"] * (1 + limit):
+            reasons.append("p99")
+        if n["rps"] < b["rps"] * (1 - limit):
+            reasons.append("rps")
+        if n["errorRate"] > b["errorRate"] + 0.01:
+            reasons.append("errors")
+        flagged += bool(reasons)
+
+        def col(k: str, w: int) -> str:
+            delta = (n[k] - b[k]) / b[k] * 100 if b[k] else 0.0
+            return f"{b[k]:.1f}->{n[k]:.1f} ({delta:+.0f}%)".rjust(w)
+
+        err = f"{b['errorRate'] * 100:.1f}->{n['errorRate'] * 100:.1f}".rjust(12)
+        mark = f"  REGRESSION: {', '.join(reasons)}" if reasons else ""
+        print(f"{route:<32} {col('rps', 16)} {col('p95', 20)} {col('p99', 20)} {err}{mark}")
+    print(f"{flagged} route(s) regressed beyond {threshold:g}%" if flagged else "no regressions")
+    return 1 if flagged else 0
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    run = sub.add_parser("run", help="drive a running server and write a JSON report")
+    run.add_argument("--base-url", default="http://127.0.0.1:8000")
+    run.add_argument("--concurrency", type=int, default=50, help="virtual users")
+    run.add_argument("--duration", type=float, default=60, help="measured seconds")
+    run.add_argument("--warmup", type=float, default=5, help="unrecorded seconds before measuring")
+    run.add_argument("--mix", default="player=6,browser=2,login=1,admin=1")
+    run.add_argument("--think-ms", type=float, default=0, help="mean pause between scenarios (exponential)")
+    run.add_argument("--users", type=int, default=200, help="distinct loadtest accounts")
+    run.add_argument("--password", default="loadtest-pw")
+    run.add_argument("--admin-email")
+    run.add_argument("--admin-password")
+    run.add_argument("--timeout", type=float, default=30)
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--label", default="", help="free text stored in the report, e.g. the data scale")
+    run.add_argument("--out", help="write the JSON report here (default: stdout)")
+
+    cmp_ = sub.add_parser("compare", help="diff two reports and flag regressions")
+    cmp_.add_argument("base")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=10, help="percent")
+
+    args = ap.parse_args()
+    if args.cmd == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        sys.exit(_compare(base, new, args.threshold))
+
+    report = asyncio.run(_run(args))
+    _print_summary(report)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
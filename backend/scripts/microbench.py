@@ -0,0 +1,474 @@
+# scripts/microbench.py
+"""
+Microbenchmarks for the crud and service functions: latency, statement count and the
+query plan of every statement, compared against a stored baseline so that SQL or schema
+edits that change plans (or add round trips) are caught before deploy.
+
+    cd backend
+    DATABASE_URL=... python -m scripts.gen_data --users 100000 --quizzes 1000000 --seed 1
+    DATABASE_URL=... python -m scripts.microbench --save        # record the baseline
+    ... edit SQL / schema ...
+    DATABASE_URL=... python -m scripts.microbench               # compare, exit 1 on regressions
+
+Runs against whatever the database holds. A baseline is keyed by a dataset label
+(--dataset, default derived from the table sizes), so baselines for several seeded
+scales live side by side in one file. The committed baselines were recorded on two
+seeded scales (both with --seed 42 --until 2026-01-01):
+
+    --users 1000  --questions 1000 --quizzes 20000     # users=1k,...,quizquestion=100k
+    --users 10000 --questions 5000 --quizzes 200000    # users=10k,...,quizquestion=1M
+
+Timings are machine-specific: record your own baseline (--save) before comparing, or
+compare plans and statement counts only (--threshold with a large value).
+
+Everything runs inside one outer transaction that is rolled back at the end, and each
+call gets its own savepoint that is rolled back after it. The write cases therefore see
+the same data on every run and leave nothing behind. (Services that open their own
+transaction get a nested savepoint.)
+
+For each case the first call is a warm-up. That call records the statements issued,
+each with its fingerprint (see app.core.metrics) and the shape of its EXPLAIN plan: node
+types, plus index and relation names. Costs and row estimates are left out. The timed
+calls then run in --runs rounds of one call per case, so a burst of load on the machine
+spreads over every case instead of landing on one. Each round starts with the
+in-process caches warm again, because the write cases invalidate them.
+
+A case regresses when it issues more statements, when a statement's plan shape
+changes, or when both its p50 and p95 are more than --threshold percent and --noise-ms
+slower (a real slowdown moves the median too; a noisy tail alone does not count). New
+or removed statements are reported but are not flagged.
+
+The app tables are VACUUMed first (--no-vacuum skips it). Rolled-back writes leave dead
+tuples and clear visibility-map bits, and without the VACUUM, index-only scans and
+small-table plans would drift from one run to the next.
+
+Every public function in app/crud and app/services has a case, except:
+  - the full rebuilds (crud.quiz_manage.rebuild_quiz_counts, backfill_question_counts,
+    crud.stats.rebuild_user_category_stats, services.quiz_manage.rebuild_counts,
+    services.stats.rebuild): they take EXCLUSIVE locks and scan whole tables; timed by
+    scripts.backfill_stats
+  - the import (services.question.admin_import_questions, crud.question.create_import_staging,
+    copy_import_rows, merge_import): COPY throughput, see scripts.bench_question_import
+  - the export (services.quiz_manage.admin_export_quizzes, crud.quiz_manage.stream_quizzes):
+    a server-side cursor over every matching row, measured end to end by the load test
+  - services.auth: bcrypt-bound (register_user, authenticate_user) or no SQL (the token
+    helpers; get_current_user's warm path is a cache hit); see scripts.loadtest
+  - the in-process cache drops (services.category.invalidate, question_bank.invalidate,
+    quiz.clear_result_cache, user_status.invalidate): no SQL
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.core.metrics import fingerprint
+from app.crud import category as category_crud
+from app.crud import contact as contact_crud
+from app.crud import question as q_crud
+from app.crud import quiz as quiz_crud
+from app.crud import quiz_manage as qm_crud
+from app.crud import stats as stats_crud
+from app.crud import user as user_crud
+from app.db.session import engine
+from app.schemas.schemas import ChoiceIn, ChoicePutIn, QuestionBatchItem, QuestionCreateIn, QuestionPutIn
+from app.services import category as category_svc
+from app.services import contact as contact_svc
+from app.services import question as q_svc
+from app.services import question_bank
+from app.services import quiz as quiz_svc
+from app.services import quiz_manage as qm_svc
+from app.services import stats as stats_svc
+from app.services import user as user_svc
+from app.services import user_status
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "microbench_baseline.json")
+SEARCH_TERM = "energy"
+_TX_STATEMENTS = ("savepoint", "release", "rollback", "begin", "commit")
+
+Ctx = Dict[str, Any]
+Case = Tuple[str, Callable[[Session, Ctx], Any], bool]  # name, fn, heavy (fewer runs)
+
+def _cases() -> List[Case]:
+    """Read-only cases first; writes last so they can't disturb the reads' caches."""
+    def case(name: str, fn: Callable[[Session, Ctx], Any], heavy: bool = False) -> Case:
+        return name, fn, heavy
+
+    return [
+        # ---- crud ----
+        case("crud.category.list_categories", lambda db, c: category_crud.list_categories(db)),
+        case("crud.category.existing_category_ids",
+             lambda db, c: category_crud.existing_category_ids(db, [c["category_id"], -1])),
+        case("crud.question.list_questions", lambda db, c: q_crud.list_questions(
+            db, category_id=None, limit=100, offset=0)),
+        case("crud.question.list_questions[category]", lambda db, c: q_crud.list_questions(
+            db, category_id=c["category_id"], limit=100, offset=0)),
+        case("crud.question.list_questions[keyset]", lambda db, c: q_crud.list_questions(
+            db, category_id=c["category_id"], limit=100, offset=0, after_id=c["mid_question_id"])),
+        case("crud.question.search_questions", lambda db, c: q_crud.search_questions(
+            db, query_text=SEARCH_TERM, category_id=None, include_choice_text=False, limit=100, offset=0)),
+        case("crud.question.search_questions[category]", lambda db, c: q_crud.search_questions(
+            db, query_text=SEARCH_TERM, category_id=c["category_id"], include_choice_text=False, limit=100, offset=0)),
+        case("crud.question.search_questions[choices]", lambda db, c: q_crud.search_questions(
+            db, query_text=SEARCH_TERM, category_id=None, include_choice_text=True, limit=100, offset=0)),
+        case("crud.question.get_choices_for_questions",
+             lambda db, c: q_crud.get_choices_for_questions(db, c["question_ids"])),
+        case("crud.question.get_question_header", lambda db, c: q_crud.get_question_header(db, c["question_id"])),
+        case("crud.question.get_question_choices", lambda db, c: q_crud.get_question_choices(db, c["question_id"])),
+        case("crud.question.lock_questions", lambda db, c: q_crud.lock_questions(db, c["question_ids"])),
+        case("crud.question.get_choice_owners", lambda db, c: q_crud.get_choice_owners(db, c["choice_ids"])),
+        case("crud.question.get_bank_version", lambda db, c: q_crud.get_bank_version(db, c["category_id"])),
+        case("crud.question.count_active_questions",
+             lambda db, c: q_crud.count_active_questions(db, c["category_id"])),
+        case("crud.question.get_active_bank_rows",
+             lambda db, c: q_crud.get_active_bank_rows(db, c["category_id"]), heavy=True),
+        case("crud.quiz.get_random_questions_with_options",
+             lambda db, c: quiz_crud.get_random_questions_with_options(db, c["category_id"], 5)),
+        case("crud.quiz.sample_questions_with_options", lambda db, c: quiz_crud.sample_questions_with_options(
+            db, c["category_id"], [i / 10 + 0.05 for i in range(10)], 5)),
+        case("crud.quiz.get_quiz_header", lambda db, c: quiz_crud.get_quiz_header(db, c["quiz_id"])),
+        case("crud.quiz.get_quiz_items_with_all_choices",
+             lambda db, c: quiz_crud.get_quiz_items_with_all_choices(db, c["quiz_id"])),
+        case("crud.quiz.get_quiz_result_nested_json",
+             lambda db, c: quiz_crud.get_quiz_result_nested_json(db, c["quiz_id"])),
+        case("crud.quiz.list_quizzes_for_user", lambda db, c: quiz_crud.list_quizzes_for_user(db, c["user_id"])),
+        case("crud.quiz_manage.list_quizzes", lambda db, c: qm_crud.list_quizzes(
+            db, category_id=None, user_id=None, limit=50, offset=0)),
+        case("crud.quiz_manage.list_quizzes[category]", lambda db, c: qm_crud.list_quizzes(
+            db, category_id=c["category_id"], user_id=None, limit=50, offset=0)),
+        case("crud.quiz_manage.list_quizzes[user]", lambda db, c: qm_crud.list_quizzes(
+            db, category_id=None, user_id=c["user_id"], limit=50, offset=0)),
+        case("crud.quiz_manage.list_quizzes[keyset]", lambda db, c: qm_crud.list_quizzes(
+            db, category_id=None, user_id=None, limit=50, offset=0, after=c["quiz_after"])),
+        case("crud.quiz_manage.count_quizzes", lambda db, c: qm_crud.count_quizzes(
+            db, category_id=None, user_id=None)),
+        case("crud.quiz_manage.count_quizzes[category]", lambda db, c: qm_crud.count_quizzes(
+            db, category_id=c["category_id"], user_id=None)),
+        case("crud.quiz_manage.count_quizzes[category,user]", lambda db, c: qm_crud.count_quizzes(
+            db, category_id=c["category_id"], user_id=c["user_id"])),
+        case("crud.stats.get_user_stats", lambda db, c: stats_crud.get_user_stats(db, c["user_id"])),
+        case("crud.stats.get_leaderboard", lambda db, c: stats_crud.get_leaderboard(db, c["category_id"], 10)),
+        case("crud.user.get_user_by_email", lambda db, c: user_crud.get_user_by_email(db, c["email"])),
+        case("crud.user.get_user_by_id", lambda db, c: user_crud.get_user_by_id(db, c["user_id"])),
+        case("crud.user.get_user_is_active", lambda db, c: user_crud.get_user_is_active(db, c["user_id"])),
+        case("crud.user.list_users", lambda db, c: user_crud.list_users(db), heavy=True),
+        case("crud.contact.list_contacts", lambda db, c: contact_crud.list_contacts(db), heavy=True),
+        case("crud.contact.get_contact", lambda db, c: contact_crud.get_contact(db, c["contact_id"])),
+        # ---- services ----
+        case("svc.quiz.generate_quiz", lambda db, c: quiz_svc.generate_quiz(db, category_id=c["category_id"])),
+        case("svc.quiz.get_quiz_result", lambda db, c: quiz_svc.get_quiz_result(db, quiz_id=c["quiz_id"])),
+        case("svc.quiz.load_quiz_result", lambda db, c: quiz_svc.load_quiz_result(db, quiz_id=c["quiz_id"])),
+        case("svc.quiz.cached_quiz_result", lambda db, c: quiz_svc.cached_quiz_result(c["quiz_id"])),
+        case("svc.quiz.load_quiz_result[nested]",
+             lambda db, c: quiz_svc.load_quiz_result(db, quiz_id=c["quiz_id"], nested=True)),
+        case("svc.quiz.list_user_quizzes", lambda db, c: quiz_svc.list_user_quizzes(db, user_id=c["user_id"])),
+        case("svc.question.admin_list_questions[choices]", lambda db, c: q_svc.admin_list_questions(
+            db, category_id=c["category_id"], query_text=None, include_choices=True, limit=100, offset=0)),
+        case("svc.question.admin_list_questions[search]", lambda db, c: q_svc.admin_list_questions(
+            db, category_id=None, query_text=SEARCH_TERM, include_choices=False, limit=100, offset=0)),
+        case("svc.question.admin_get_question", lambda db, c: q_svc.admin_get_question(
+            db, question_id=c["question_id"])),
+        case("svc.quiz_manage.admin_list_quizzes", lambda db, c: qm_svc.admin_list_quizzes(
+            db, category_id=None, user_id=c["user_id"], limit=50, offset=0)),
+        case("svc.quiz_manage.admin_count_quizzes", lambda db, c: qm_svc.admin_count_quizzes(
+            db, category_id=c["category_id"], user_id=c["user_id"])),
+        case("svc.quiz_manage.admin_list_quizzes_page", lambda db, c: qm_svc.admin_list_quizzes_page(
+            db, category_id=c["category_id"], user_id=None, limit=50, offset=0)),
+        case("svc.category.load_categories", lambda db, c: category_svc.load_categories(db)),
+        case("svc.category.cached_categories", lambda db, c: category_svc.cached_categories()),
+        case("svc.contact.admin_list_contacts", lambda db, c: contact_svc.admin_list_contacts(db), heavy=True),
+        case("svc.contact.admin_get_contact", lambda db, c: contact_svc.admin_get_contact(db, c["contact_id"])),
+        case("svc.stats.user_stats", lambda db, c: stats_svc.user_stats(db, user_id=c["user_id"])),
+        case("svc.stats.leaderboard", lambda db, c: stats_svc.leaderboard(db, category_id=c["category_id"])),
+        case("svc.user.admin_list_users", lambda db, c: user_svc.admin_list_users(db), heavy=True),
+        case("svc.question_bank.get_snapshot[cold]", _cold_snapshot, heavy=True),
+        case("svc.question_bank.sample", lambda db, c: question_bank.sample(db, c["category_id"], 5)),
+        # ---- writes (each call rolled back to its savepoint) ----
+        case("crud.question.set_question_status", lambda db, c: q_crud.set_question_status(
+            db, question_id=c["question_id"], is_active=True)),
+        case("crud.question.insert_question", lambda db, c: q_crud.insert_question(
+            db, category_id=c["category_id"], description="microbench question")),
+        case("crud.question.insert_choices", lambda db, c: q_crud.insert_choices(
+            db, question_id=c["question_id"], choices=[{"description": "extra", "isCorrect": False}] * 3)),
+        case("crud.question.batch_update_questions", lambda db, c: q_crud.batch_update_questions(
+            db, [(qid, None, None, True) for qid in c["question_ids"][:20]])),
+        case("crud.question.clear_correct", lambda db, c: q_crud.clear_correct(db, c["question_ids"][:20])),
+        case("crud.question.batch_update_choices", lambda db, c: q_crud.batch_update_choices(
+            db, [(ch, f"choice {i}", ok) for i, (ch, ok) in enumerate(c["question_choices"])])),
+        case("crud.question.insert_choice_rows", lambda db, c: q_crud.insert_choice_rows(
+            db, [(qid, "extra", False) for qid in c["question_ids"][:20]])),
+        case("crud.question.delete_choices", lambda db, c: q_crud.delete_choices(db, question_id=c["question_id"])),
+        case("crud.question.bump_bank_version", lambda db, c: q_crud.bump_bank_version(db, [c["category_id"]])),
+        case("crud.user.create_user", lambda db, c: user_crud.create_user(
+            db, email="microbench@example.com", password_hash="x", firstname="Micro", lastname="Bench",
+            is_active=True, is_admin=False)),
+        case("crud.user.set_user_status", lambda db, c: user_crud.set_user_status(db, c["user_id"], True)),
+        case("crud.user.update_user_status", lambda db, c: user_crud.update_user_status(db, c["user_id"], "active")),
+        case("crud.user.update_password_hash", lambda db, c: user_crud.update_password_hash(db, c["user_id"], "x")),
+        case("crud.contact.create_contact", lambda db, c: contact_crud.create_contact(
+            db, subject="microbench", message="hello", email=c["email"])),
+        case("svc.contact.submit_contact", lambda db, c: contact_svc.submit_contact(
+            db, subject="microbench", message="hello", email=c["email"])),
+        case("svc.user.admin_set_user_status", lambda db, c: user_svc.admin_set_user_status(
+            db, c["user_id"], "active")),
+        case("svc.user_status.publish_change", lambda db, c: user_status.publish_change(db, c["user_id"])),
+        case("svc.quiz.publish_results_stale", lambda db, c: quiz_svc.publish_results_stale(db)),
+        case("crud.quiz.insert_quiz_with_answers", lambda db, c: quiz_crud.insert_quiz_with_answers(
+            db, user_id=c["user_id"], category_id=c["category_id"], t_start=c["now"], t_end=c["now"],
+            answers=c["answers"])),
+        case("svc.quiz.submit_quiz", lambda db, c: quiz_svc.submit_quiz(
+            db, user_id=c["user_id"], category_id=c["category_id"], answers=c["answers"],
+            time_start=None, time_end=None)),
+        case("svc.question.admin_batch_questions", lambda db, c: q_svc.admin_batch_questions(
+            db, [QuestionBatchItem(questionId=qid, isActive=True) for qid in c["question_ids"][:20]])),
+        case("svc.question.admin_create_question", lambda db, c: q_svc.admin_create_question(
+            db, QuestionCreateIn(categoryId=c["category_id"], description="microbench question", choices=[
+                ChoiceIn(description="right", isCorrect=True), ChoiceIn(description="wrong"),
+                ChoiceIn(description="also wrong"), ChoiceIn(description="still wrong"),
+            ]))),
+        case("svc.question.admin_put_question", lambda db, c: q_svc.admin_put_question(
+            db, c["question_id"], QuestionPutIn(
+                description="microbench question", categoryId=c["category_id"], isActive=True,
+                choices=[ChoicePutIn(choiceId=ch, description=f"choice {i}", isCorrect=ok)
+                         for i, (ch, ok) in enumerate(c["question_choices"])],
+            ))),
+        case("svc.question.admin_set_question_status", lambda db, c: q_svc.admin_set_question_status(
+            db, question_id=c["question_id"], is_active=True)),
+    ]
+
+def _cold_snapshot(db: Session, c: Ctx) -> Any:
+    question_bank.clear()
+    return question_bank.get_snapshot(db, c["category_id"])
+
+def _context(db: Session) -> Ctx:
+    """Ids to aim the cases at: the biggest category, its questions, a busy user, a recent quiz."""
+    row = db.execute(text("""
+        SELECT category_id FROM questions WHERE is_active
+        GROUP BY category_id ORDER BY count(*) DESC LIMIT 1
+    """)).first()
+    quiz = db.execute(text("""
+        SELECT quiz_id, user_id, time_start FROM quizzes
+        WHERE question_count > 0 ORDER BY quiz_id DESC LIMIT 1
+    """)).first()
+    if row is None or quiz is None:
+        raise SystemExit("no active questions or answered quizzes: seed the database first (scripts.gen_data)")
+    cid = row[0]
+    qids = db.execute(text("""
+        SELECT question_id FROM questions WHERE category_id = :cid AND is_active
+        ORDER BY question_id DESC LIMIT 100
+    """), {"cid": cid}).scalars().all()
+    choices = db.execute(text("""
+        SELECT DISTINCT ON (question_id) question_id, choice_id FROM choice
+        WHERE question_id = ANY(:ids) ORDER BY question_id, choice_id
+    """), {"ids": list(qids)}).all()
+    busiest = db.execute(text("""
+        SELECT id FROM quiz_counts WHERE scope = 'user' ORDER BY n DESC LIMIT 1
+    """)).scalar_one_or_none() or quiz.user_id
+    email = db.execute(text("SELECT email FROM users WHERE user_id = :u"), {"u": busiest}).scalar_one()
+    own_choices = db.execute(text("""
+        SELECT choice_id, is_correct FROM choice WHERE question_id = :qid ORDER BY choice_id
+    """), {"qid": qids[0]}).all()
+    contact_id = db.execute(text("SELECT max(contact_id) FROM contacts")).scalar_one()
+    return {
+        "category_id": cid,
+        "question_id": qids[0],
+        "question_choices": [(ch, bool(ok)) for ch, ok in own_choices],
+        "question_ids": list(qids),
+        "mid_question_id": qids[len(qids) // 2],
+        "choice_ids": [ch for _, ch in choices],
+        "answers": [{"questionId": q, "choiceId": ch} for q, ch in choices[:5]],
+        "user_id": busiest,
+        "email": email,
+        "quiz_id": quiz.quiz_id,
+        "quiz_after": (quiz.time_start, quiz.quiz_id),
+        "contact_id": contact_id or 0,  # gen_data writes no contacts: a miss is still one lookup
+        "now": db.execute(text("SELECT now()")).scalar_one(),
+    }
+
+def _dataset_label(db: Session) -> str:
+    """
+    e.g. 'users=100k,questions=20k,quizzes=1M' from exact row counts (reltuples moves
+    with every VACUUM, so it would not give a stable key).
+    """
+    def fmt(n: float) -> str:
+        n = float(f"{n:.2g}")  # two significant digits: small drifts keep the same label
+        for unit, div in (("M", 1e6), ("k", 1e3)):
+            if n >= div:
+                return f"{n / div:g}{unit}"
+        return f"{n:g}"
+
+    tables = ("users", "questions", "quizzes", "quizquestion")
+    counts = db.execute(text("SELECT " + ", ".join(f"(SELECT count(*) FROM {t})" for t in tables))).one()
+    return ",".join(f"{t}={fmt(n)}" for t, n in zip(tables, counts))
+
+# ---- statement capture and plans ----
+
+_captured: Optional[List[Tuple[str, Any]]] = None
+
+@event.listens_for(engine, "before_cursor_execute")
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if _captured is not None and not statement.lstrip().lower().startswith(_TX_STATEMENTS):
+        _captured.append((statement, parameters[0] if executemany and parameters else parameters))
+
+def _shape(node: Dict[str, Any]) -> str:
+    label = node["Node Type"]
+    target = node.get("Index Name") or node.get("Relation Name")
+    if target:
+        label += f"[{target}]"
+    children = node.get("Plans") or []
+    return label + ("(" + ",".join(_shape(ch) for ch in children) + ")" if children else "")
+
+def _plan(db: Session, statement: str, params: Any) -> Optional[str]:
+    if not statement.lstrip().lower().startswith(("select", "with", "insert", "update", "delete")):
+        return None
+    raw_conn = db.connection().connection.driver_connection
+    try:
+        with raw_conn.transaction():  # a savepoint: a failed EXPLAIN must not abort the run
+            with raw_conn.cursor() as cur:
+                cur.execute("EXPLAIN (FORMAT JSON) " + statement, params or None)
+                return _shape(cur.fetchone()[0][0]["Plan"])
+    except Exception as e:
+        return f"(explain failed: {type(e).__name__})"
+
+# ---- running ----
+
+def _call(db: Session, ctx: Ctx, fn: Callable[[Session, Ctx], Any]) -> float:
+    """Milliseconds for one call, inside a savepoint that is rolled back afterwards."""
+    sp = db.get_bind().begin_nested()
+    try:
+        t0 = time.perf_counter()
+        fn(db, ctx)
+        return (time.perf_counter() - t0) * 1000
+    finally:
+        if db.in_transaction():
+            db.rollback()
+        sp.rollback()
+
+HEAVY_RUNS = 3  # timed calls for the heavy cases
+
+def _profile(db: Session, ctx: Ctx, fn: Callable[[Session, Ctx], Any]) -> Dict[str, Any]:
+    """The warm-up call: statement count and plan shapes."""
+    global _captured
+    _captured = []
+    try:
+        _call(db, ctx, fn)
+    finally:
+        statements, _captured = _captured, None
+    plans: Dict[str, Optional[str]] = {}
+    for statement, params in statements:
+        fp = fingerprint(statement)
+        if fp not in plans:
+            plans[fp] = _plan(db, statement, params)
+    if db.in_transaction():
+        db.rollback()
+    return {"statements": len(statements), "plans": plans}
+
+def _warm(db: Session, c: Ctx) -> None:
+    question_bank.get_snapshot(db, c["category_id"])
+    category_svc.load_categories(db)
+    quiz_svc.load_quiz_result(db, quiz_id=c["quiz_id"])
+    quiz_svc.load_quiz_result(db, quiz_id=c["quiz_id"], nested=True)
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {"p50": statistics.median(samples), "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))]}
+
+def _compare(base: Dict[str, Any], cur: Dict[str, Any], threshold: float, noise_ms: float) -> List[str]:
+    problems: List[str] = []
+    if cur["statements"] > base["statements"]:
+        problems.append(f"statements {base['statements']} -> {cur['statements']}")
+    for fp, shape in cur["plans"].items():
+        old = base["plans"].get(fp)
+        if old is not None and shape is not None and old != shape:
+            problems.append(f"plan changed for {fp}:\n      was {old}\n      now {shape}")
+    if all(cur[k] > base[k] * (1 + threshold / 100) and cur[k] - base[k] > noise_ms for k in ("p50", "p95")):
+        problems.append(f"p50 {base['p50']:.2f} -> {cur['p50']:.2f} ms, p95 {base['p95']:.2f} -> {cur['p95']:.2f} ms")
+    return problems
+
+TABLES = ("users", "category", "questions", "choice", "quizzes", "quizquestion", "contacts",
+          "question_bank_version", "quiz_counts", "user_category_stats")
+
+def _vacuum() -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM " + ", ".join(TABLES)))
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--runs", type=int, default=30, help=f"timed calls per case (heavy cases: at most {HEAVY_RUNS})")
+    ap.add_argument("--only", default="", help="comma-separated substrings; run matching cases only")
+    ap.add_argument("--dataset", help="baseline key (default: derived from table sizes)")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE)
+    ap.add_argument("--save", action="store_true", help="store this run as the baseline for the dataset")
+    ap.add_argument("--threshold", type=float, default=50, help="percent p50 and p95 slowdown that counts as a regression")
+    ap.add_argument("--noise-ms", type=float, default=1.0, help="ignore slowdowns smaller than this")
+    ap.add_argument("--out", help="also write this run's results as JSON")
+    ap.add_argument("--no-vacuum", action="store_true", help="don't VACUUM the app tables first")
+    args = ap.parse_args()
+
+    stored: Dict[str, Any] = {"datasets": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+
+    if not args.no_vacuum:
+        _vacuum()
+    conn = engine.connect()
+    outer = conn.begin()
+    db = Session(bind=conn, join_transaction_mode="create_savepoint", autoflush=False, expire_on_commit=False)
+    try:
+        dataset = args.dataset or _dataset_label(db)
+        ctx = _context(db)
+        db.rollback()
+        base_cases = stored["datasets"].get(dataset, {}).get("cases", {})
+        only = [s for s in args.only.split(",") if s]
+        print(f"dataset {dataset}; baseline: {'yes' if base_cases else 'none'}")
+        print(f"{'case':<50} {'stmts':>5} {'p50 ms':>8} {'p95 ms':>8}  vs baseline")
+
+        selected = [c for c in _cases() if not only or any(s in c[0] for s in only)]
+        results: Dict[str, Any] = {name: _profile(db, ctx, fn) for name, fn, _ in selected}
+        samples: Dict[str, List[float]] = {name: [] for name, _, _ in selected}
+        for round_no in range(max(args.runs, 1)):
+            _call(db, ctx, _warm)
+            for name, fn, heavy in selected:
+                if not heavy or round_no < HEAVY_RUNS:
+                    samples[name].append(_call(db, ctx, fn))
+
+        regressions = 0
+        for name, _, _ in selected:
+            r = results[name]
+            r.update(_percentiles(samples[name]))
+            base = base_cases.get(name)
+            if base is None:
+                note = "new"
+            else:
+                problems = _compare(base, r, args.threshold, args.noise_ms)
+                regressions += bool(problems)
+                note = "REGRESSION: " + "; ".join(problems) if problems else f"p95 {base['p95']:.2f}"
+                for fp in set(base["plans"]) ^ set(r["plans"]):
+                    note += f"\n      {'added' if fp in r['plans'] else 'removed'} statement {fp}"
+            print(f"{name:<50} {r['statements']:>5} {r['p50']:>8.2f} {r['p95']:>8.2f}  {note}")
+    finally:
+        db.close()
+        outer.rollback()
+        conn.close()
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"dataset": dataset, "cases": results}, f, indent=2, sort_keys=True)
+    if args.save:
+        entry = stored["datasets"].setdefault(dataset, {"cases": {}})
+        entry["cases"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"baseline for {dataset} saved to {args.baseline}")
+    elif base_cases:
+        print(f"{regressions} case(s) regressed" if regressions else "no regressions")
+        raise SystemExit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+# tests/conftest.py
+import os
+
+# app.core.config needs DATABASE_URL at import time; the unit tests never connect
+if os.environ.get("TEST_DATABASE_URL"):
+    os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/quiz_test")
+os.environ.setdefault("DB_LISTEN", "false")
+
+import pytest
+
+@pytest.fixture
+def db():
+    """Session on TEST_DATABASE_URL (schema loaded) whose writes are rolled back afterwards."""
+    if not os.environ.get("TEST_DATABASE_URL"):
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from sqlalchemy.orm import Session
+    from app.db.session import engine
+
+    conn = engine.connect()
+    outer = conn.begin()
+    session = Session(bind=conn, autoflush=False, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        outer.rollback()
+        conn.close()
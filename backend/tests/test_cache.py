@@ -0,0 +1,55 @@
+# tests/test_cache.py
+from app.core import cache
+from app.core.cache import LRUCache
+
+def test_evicts_least_recently_used():
+    c = LRUCache(2)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "b" is now the oldest
+    c.set("c", 3)
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert c.stats()["evictions"] == 1
+
+def test_weight_bound():
+    c = LRUCache(100, weigher=len, maxweight=10)
+    c.set("a", b"xxxx")
+    c.set("b", b"yyyy")
+    c.set("c", b"zzzz")  # 12 > 10: "a" goes
+    assert c.get("a") is None
+    assert c.weight == 8 and len(c) == 2
+    c.set("b", b"y")  # replacing a key swaps its weight
+    assert c.weight == 5
+
+def test_value_heavier_than_bound_is_not_stored():
+    c = LRUCache(100, weigher=len, maxweight=4)
+    c.set("a", b"xx")
+    c.set("big", b"xxxxx")
+    assert c.get("big") is None
+    assert c.get("a") == b"xx" and c.weight == 2
+
+def test_expired_entry_is_a_miss(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    c = LRUCache(10)
+    c.set("k", "v", expires_at=1010.0)
+    assert c.get("k") == "v"
+    now[0] = 1010.0
+    assert c.get("k") is None
+    stats = c.stats()
+    assert stats["expirations"] == 1 and stats["size"] == 0
+
+def test_pop_and_clear_reset_weight():
+    c = LRUCache(10, weigher=len, maxweight=100)
+    c.set("a", b"xxx")
+    c.set("b", b"yy")
+    c.pop("a")
+    assert c.weight == 2
+    c.clear()
+    assert c.weight == 0 and len(c) == 0
+
+def test_zero_size_disables():
+    c = LRUCache(0)
+    c.set("a", 1)
+    assert c.get("a") is None
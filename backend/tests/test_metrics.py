@@ -0,0 +1,44 @@
+# tests/test_metrics.py
+import threading
+
+from app.core import metrics
+
+def test_counter_sums_thread_shards():
+    c = metrics.Counter("test_counter_total", "test", ("route",))
+    c.inc(("a",))
+    t = threading.Thread(target=lambda: c.inc(("a",), 2))
+    t.start()
+    t.join()
+    c.inc(("b",))
+    assert c.values() == {("a",): 3, ("b",): 1}
+    assert set(c.render()) == {'test_counter_total{route="a"} 3', 'test_counter_total{route="b"} 1'}
+
+def test_histogram_buckets_are_cumulative():
+    h = metrics.Histogram("test_latency_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    for v in (0.05, 0.1, 0.5, 5.0):
+        h.observe(("a",), v)
+    assert h.cumulative(("a",)) == {"0.1": 2, "1.0": 3, "+Inf": 4}
+    count, total = h.summary(("a",))
+    assert count == 4 and abs(total - 5.65) < 1e-9
+    lines = h.render()
+    assert 'test_latency_seconds_bucket{route="a",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_count{route="a"} 4' in lines
+
+def test_gauge_func_and_exposition():
+    metrics.GaugeFunc("test_pool_size", "test", ("engine",), lambda: [(("primary",), 3)])
+    text = metrics.render()
+    assert "# TYPE test_pool_size gauge\n" in text
+    assert 'test_pool_size{engine="primary"} 3\n' in text
+
+def test_label_values_are_escaped():
+    c = metrics.Counter("test_escape_total", "test", ("v",))
+    c.inc(('a"b\\c\n',))
+    assert c.render() == ['test_escape_total{v="a\\"b\\\\c\\n"} 1']
+
+def test_fingerprint_ignores_literals_and_whitespace():
+    a = metrics.fingerprint("SELECT * FROM users WHERE user_id = 1")
+    b = metrics.fingerprint("select *\n  from users where user_id = %(id)s")
+    assert a == b and a.startswith("select:users:")
+    assert metrics.fingerprint("SELECT * FROM users WHERE email = 'x'") != a
+    cte = metrics.fingerprint("WITH q AS (SELECT 1) INSERT INTO quizzes SELECT * FROM q")
+    assert cte.startswith("insert:")
@@ -0,0 +1,47 @@
+# tests/test_pagination.py
+import base64
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, decode_datetime, decode_float, decode_int, encode_cursor
+
+def _raw(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode().rstrip("=")
+
+def test_round_trip():
+    ts = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    cursor = encode_cursor([ts, 42, 0.5])
+    assert "=" not in cursor
+    stamp, qid, rank = decode_cursor(cursor, 3)
+    assert decode_datetime(stamp) == ts
+    assert decode_int(qid) == 42
+    assert decode_float(rank) == 0.5
+
+@pytest.mark.parametrize("cursor", ["not base64!", _raw("{}"), _raw("[1]"), _raw("[1, 2, 3]"), _raw("nope")])
+def test_malformed_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, 2)
+    assert e.value.status_code == 400
+
+@pytest.mark.parametrize("value", ["1", 1.0, True, None, [1]])
+def test_decode_int_rejects_other_types(value):
+    with pytest.raises(HTTPException) as e:
+        decode_int(value)
+    assert e.value.status_code == 400
+
+@pytest.mark.parametrize("value", ["0.5", True, None, float("nan"), float("inf")])
+def test_decode_float_rejects_other_types(value):
+    with pytest.raises(HTTPException) as e:
+        decode_float(value)
+    assert e.value.status_code == 400
+
+def test_decode_float_accepts_int():
+    assert decode_float(3) == 3.0
+
+@pytest.mark.parametrize("value", ["yesterday", 5, None])
+def test_decode_datetime_rejects_garbage(value):
+    with pytest.raises(HTTPException) as e:
+        decode_datetime(value)
+    assert e.value.status_code == 400
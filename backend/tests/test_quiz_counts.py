@@ -0,0 +1,26 @@
+# tests/test_quiz_counts.py
+from sqlalchemy import text
+
+def _counts(db, cid, uids):
+    rows = db.execute(text("""
+        SELECT scope, id, n FROM quiz_counts
+        WHERE (scope = 'category' AND id = :cid) OR (scope = 'user' AND id = ANY(:uids))
+    """), {"cid": cid, "uids": uids}).all()
+    return {(scope, id): n for scope, id, n in rows}
+
+def test_trigger_follows_inserts_and_deletes(db):
+    cid = db.execute(text("INSERT INTO category(name) VALUES ('counts-test') RETURNING category_id")).scalar_one()
+    u1, u2 = db.execute(text("""
+        INSERT INTO users(email, password_hash, firstname, lastname)
+        VALUES ('counts1@example.com', 'x', 'a', 'b'), ('counts2@example.com', 'x', 'a', 'b')
+        RETURNING user_id
+    """)).scalars().all()
+    ids = db.execute(text("""
+        INSERT INTO quizzes(user_id, category_id, name, time_start, time_end, correct_rate, question_count)
+        SELECT u, :cid, 'Quiz', now(), now(), 0, 0 FROM unnest(CAST(:uids AS bigint[])) AS u
+        RETURNING quiz_id
+    """), {"cid": cid, "uids": [u1, u1, u2]}).scalars().all()
+    assert _counts(db, cid, [u1, u2]) == {("category", cid): 3, ("user", u1): 2, ("user", u2): 1}
+
+    db.execute(text("DELETE FROM quizzes WHERE quiz_id = ANY(:ids)"), {"ids": ids[:2]})
+    assert _counts(db, cid, [u1, u2]) == {("category", cid): 1, ("user", u1): 0, ("user", u2): 1}
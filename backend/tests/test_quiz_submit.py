@@ -0,0 +1,42 @@
+# tests/test_quiz_submit.py
+from sqlalchemy import text
+
+from app.crud import question as q_crud
+from app.crud import user as user_crud
+from app.services import question_bank
+from app.services import quiz as quiz_svc
+
+def _seed(db):
+    cid = db.execute(text("INSERT INTO category(name) VALUES ('submit-test') RETURNING category_id")).scalar_one()
+    qid = q_crud.insert_question(db, category_id=cid, description="2 + 2?")
+    q_crud.insert_choices(db, question_id=qid, choices=[
+        {"description": "4", "isCorrect": True},
+        {"description": "5", "isCorrect": False},
+    ])
+    choices = dict(db.execute(text("SELECT description, choice_id FROM choice WHERE question_id = :q"),
+                              {"q": qid}).all())
+    user = user_crud.create_user(db, email="submit-test@example.com", password_hash="x",
+                                 firstname="T", lastname="T", is_active=True, is_admin=False)
+    db.commit()
+    return cid, qid, choices, user.user_id
+
+def test_submit_scores_against_committed_answer_key(db):
+    cid, qid, choices, uid = _seed(db)
+    question_bank.get_snapshot(db, cid)  # this worker now holds the old answer key
+    db.commit()
+
+    # another worker moves the correct answer; this worker's snapshot is not dropped
+    q_crud.clear_correct(db, [qid])
+    q_crud.batch_update_choices(db, [(choices["5"], "5", True)])
+    q_crud.bump_bank_version(db, [cid])
+    db.commit()
+
+    out = quiz_svc.submit_quiz(db, user_id=uid, category_id=cid, time_start=None, time_end=None,
+                               answers=[{"questionId": qid, "choiceId": choices["5"]}])
+    assert out["score"] == 1.0
+    stored = db.execute(text("SELECT correct_rate FROM quizzes WHERE quiz_id = :id"),
+                        {"id": out["quizId"]}).scalar_one()
+    best = db.execute(text("SELECT best_score FROM user_category_stats WHERE user_id = :u AND category_id = :c"),
+                      {"u": uid, "c": cid}).scalar_one()
+    assert stored == 1.0 and best == 1.0
+    question_bank.invalidate([cid])
@@ -0,0 +1,47 @@
+# tests/test_responses.py
+from decimal import Decimal
+
+import orjson
+from starlette.requests import Request
+
+from app.core.responses import CachedBody, dumps, etag_matches, ok
+
+def _request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_dumps_handles_decimals_sets_and_mappings():
+    from types import MappingProxyType
+    out = orjson.loads(dumps({"i": Decimal("3"), "f": Decimal("0.25"), "s": {1}, "m": MappingProxyType({"a": 1})}))
+    assert out == {"i": 3, "f": 0.25, "s": [1], "m": {"a": 1}}
+
+def test_ok_envelope():
+    assert orjson.loads(ok([1]).body) == {"ok": True, "data": [1]}
+    assert orjson.loads(ok().body) == {"ok": True}
+    r = ok(None, status_code=201, nextCursor="c")
+    assert r.status_code == 201
+    assert orjson.loads(r.body) == {"ok": True, "data": None, "nextCursor": "c"}
+
+def test_etag_matches():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"x", "a"', '"a"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
+
+def test_cached_body_answers_304_when_etag_matches():
+    entry = CachedBody(b'{"ok":true}', cache_control="private, no-cache")
+    full = entry.respond(_request())
+    assert full.status_code == 200 and full.body == b'{"ok":true}'
+    assert full.headers["etag"] == entry.etag
+    assert full.headers["cache-control"] == "private, no-cache"
+
+    revalidated = entry.respond(_request(entry.etag))
+    assert revalidated.status_code == 304 and revalidated.body == b""
+    assert revalidated.headers["etag"] == entry.etag
+    assert entry.respond(_request('"stale"')).status_code == 200
+
+def test_etag_follows_content():
+    assert CachedBody(b"a", "x").etag == CachedBody(b"a", "y").etag
+    assert CachedBody(b"a", "x").etag != CachedBody(b"b", "x").etag
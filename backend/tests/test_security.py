@@ -0,0 +1,61 @@
+# tests/test_security.py
+import hashlib
+import time
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+from starlette.requests import Request
+
+from app.core import cache, security
+from app.core.config import settings
+
+def _request(token=None) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+@pytest.fixture(autouse=True)
+def _empty_token_cache():
+    security.token_cache.clear()
+    yield
+    security.token_cache.clear()
+
+def test_token_round_trip_is_cached():
+    token = security.make_token({"user_id": 7, "is_admin": False})
+    assert security.decode_token(token)["user_id"] == 7
+    hits = security.token_cache.hits
+    payload = security.decode_token(token)
+    assert security.token_cache.hits == hits + 1
+    payload["user_id"] = 8  # callers get a copy
+    assert security.decode_token(token)["user_id"] == 7
+
+def test_invalid_tokens():
+    token = security.make_token({"user_id": 7})
+    assert security.decode_token(token[:-2] + "xx") is None
+    expired = jwt.encode({"user_id": 7, "exp": int(time.time()) - 10},
+                         settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+    assert security.decode_token(expired) is None
+
+def test_cached_payload_expires_with_the_token(monkeypatch):
+    token = security.make_token({"user_id": 7})
+    exp = security.decode_token(token)["exp"]
+    monkeypatch.setattr(cache.time, "time", lambda: exp + 1)
+    assert security.token_cache.get(hashlib.sha256(token.encode()).digest()) is None
+
+def test_require_auth_and_admin():
+    with pytest.raises(HTTPException) as e:
+        security.require_auth(_request())
+    assert e.value.status_code == 401
+    with pytest.raises(HTTPException) as e:
+        security.require_auth(_request("garbage"))
+    assert e.value.status_code == 401
+
+    user = security.make_token({"user_id": 1, "is_admin": False})
+    assert security.require_auth(_request(user))["user_id"] == 1
+    with pytest.raises(HTTPException) as e:
+        security.require_admin(_request(user))
+    assert e.value.status_code == 403
+
+    admin = security.make_token({"user_id": 2, "is_admin": True})
+    assert security.require_admin(_request(admin))["user_id"] == 2
+    assert security.optional_auth(_request()) is None
@@ -1,5 +1,6 @@
 -- ===== Extensions (optional but handy) =====
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS btree_gin;  -- lets one GIN index cover (search_tsv, category_id)
 
 -- ===== Drop old (dev only) =====
 DO $$
@@ -16,6 +17,9 @@ DROP TABLE IF EXISTS questions CASCADE;
 DROP TABLE IF EXISTS choice CASCADE;
 DROP TABLE IF EXISTS quizzes CASCADE;
 DROP TABLE IF EXISTS quizquestion CASCADE;
+DROP TABLE IF EXISTS question_bank_version CASCADE;
+DROP TABLE IF EXISTS user_category_stats CASCADE;
+DROP TABLE IF EXISTS quiz_counts CASCADE;
 
 -- ===== Core tables =====
 
@@ -43,7 +47,9 @@ CREATE TABLE questions (
   category_id BIGINT NOT NULL REFERENCES category(category_id) ON DELETE RESTRICT,
   description TEXT NOT NULL,
   is_active   BOOLEAN NOT NULL DEFAULT TRUE,
-  created_at  TIMESTAMPTZ NOT NULL DEFAULT now()
+  created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+  rand_key    DOUBLE PRECISION NOT NULL DEFAULT random(),  -- random sampling key for quiz generation
+  search_tsv  TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', description)) STORED
 );
 
 -- Choice (answers for a question)
@@ -51,7 +57,8 @@ CREATE TABLE choice (
   choice_id   BIGSERIAL PRIMARY KEY,
   question_id BIGINT NOT NULL REFERENCES questions(question_id) ON DELETE CASCADE,
   description TEXT NOT NULL,
-  is_correct  BOOLEAN NOT NULL DEFAULT FALSE
+  is_correct  BOOLEAN NOT NULL DEFAULT FALSE,
+  search_tsv  TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', description)) STORED
 );
 
 -- Enforce: at most ONE correct choice per question
@@ -67,7 +74,8 @@ CREATE TABLE quizzes (
   name         TEXT,  -- optional display name
   time_start   TIMESTAMPTZ NOT NULL DEFAULT now(),
   time_end     TIMESTAMPTZ,
-  correct_rate FLOAT DEFAULT 0  -- <--- add this line
+  correct_rate FLOAT DEFAULT 0,  -- <--- add this line
+  question_count INT NOT NULL DEFAULT 0  -- set on submit; saves a COUNT over quizquestion per listed quiz
 );
 
 -- QuizQuestion (which questions were asked and what user chose)
@@ -90,12 +98,49 @@ CREATE TABLE contacts (
   time       TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
+-- Question bank version per category: admin writes bump it so every API worker
+-- can tell that its in-memory copy of the category is stale
+CREATE TABLE question_bank_version (
+  category_id BIGINT PRIMARY KEY REFERENCES category(category_id) ON DELETE CASCADE,
+  version     BIGINT NOT NULL DEFAULT 0
+);
+
+-- Per-(user, category) aggregates, updated by the quiz submission statement
+-- (rebuild with `python -m scripts.backfill_stats`)
+CREATE TABLE user_category_stats (
+  user_id     BIGINT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+  category_id BIGINT NOT NULL REFERENCES category(category_id) ON DELETE CASCADE,
+  attempts    INT NOT NULL DEFAULT 0,
+  score_sum   DOUBLE PRECISION NOT NULL DEFAULT 0,  -- mean = score_sum / attempts
+  best_score  DOUBLE PRECISION NOT NULL DEFAULT 0,
+  best_at     TIMESTAMPTZ,                          -- when best_score was first reached
+  last_at     TIMESTAMPTZ,
+  PRIMARY KEY (user_id, category_id)
+);
+
+-- Number of quizzes per category / per user, maintained by trg_quiz_counts_* below;
+-- gives the admin listing exact filtered totals without COUNT(*)
+CREATE TABLE quiz_counts (
+  scope TEXT   NOT NULL CHECK (scope IN ('category', 'user')),
+  id    BIGINT NOT NULL,
+  n     BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (scope, id)
+);
+
 -- ===== Helpful indexes =====
-CREATE INDEX idx_question_category ON questions(category_id) WHERE is_active;
+-- Random-key index: quiz generation probes this instead of sorting a whole category by random()
+CREATE INDEX idx_question_category_randkey ON questions(category_id, rand_key) WHERE is_active;
 CREATE INDEX idx_choice_question ON choice(question_id);
-CREATE INDEX idx_quiz_user ON quizzes(user_id);
-CREATE INDEX idx_quiz_category ON quizzes(category_id);
-CREATE INDEX idx_quiz_time_start ON quizzes(time_start DESC);
+-- Full-text search for GET /admin/questions?q=
+CREATE INDEX idx_question_search ON questions USING GIN (search_tsv, category_id);
+CREATE INDEX idx_choice_search ON choice USING GIN (search_tsv);
+-- Keyset pagination for the admin listings (ORDER BY ... DESC, optionally filtered)
+CREATE INDEX idx_question_category_id ON questions(category_id, question_id DESC);
+CREATE INDEX idx_quiz_time_start ON quizzes(time_start DESC, quiz_id DESC);
+CREATE INDEX idx_quiz_user ON quizzes(user_id, time_start DESC, quiz_id DESC);
+CREATE INDEX idx_quiz_category ON quizzes(category_id, time_start DESC, quiz_id DESC);
+-- Leaderboard: top N of a category is the first N entries of this index
+CREATE INDEX idx_stats_leaderboard ON user_category_stats(category_id, best_score DESC, best_at, user_id);
 
 -- ===== Data integrity beyond FKs =====
 -- Ensure the chosen choice belongs to the same question as quizquestion.question_id
@@ -126,6 +171,59 @@ CREATE TRIGGER trg_choice_matches_question
   FOR EACH ROW
   EXECUTE FUNCTION ensure_choice_matches_question();
 
+-- ===== Maintained counters =====
+-- quiz_counts follows inserts and deletes on quizzes (statement-level, one upsert per
+-- distinct category/user touched). quizzes.user_id / category_id are never updated.
+CREATE OR REPLACE FUNCTION maintain_quiz_counts()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    INSERT INTO quiz_counts(scope, id, n)
+    SELECT 'category', category_id, COUNT(*) FROM new_rows GROUP BY category_id
+    UNION ALL
+    SELECT 'user', user_id, COUNT(*) FROM new_rows GROUP BY user_id
+    ON CONFLICT (scope, id) DO UPDATE SET n = quiz_counts.n + EXCLUDED.n;
+  ELSE
+    UPDATE quiz_counts qc SET n = qc.n - d.n
+    FROM (
+      SELECT 'category' AS scope, category_id AS id, COUNT(*) AS n FROM old_rows GROUP BY category_id
+      UNION ALL
+      SELECT 'user', user_id, COUNT(*) FROM old_rows GROUP BY user_id
+    ) d
+    WHERE qc.scope = d.scope AND qc.id = d.id;
+  END IF;
+  RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER trg_quiz_counts_insert
+  AFTER INSERT ON quizzes
+  REFERENCING NEW TABLE AS new_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION maintain_quiz_counts();
+
+CREATE TRIGGER trg_quiz_counts_delete
+  AFTER DELETE ON quizzes
+  REFERENCING OLD TABLE AS old_rows
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION maintain_quiz_counts();
+
+-- ===== Cache invalidation =====
+-- API workers cache GET /categories and LISTEN on this channel (app/services/category.py)
+CREATE OR REPLACE FUNCTION notify_category_changed()
+RETURNS TRIGGER LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM pg_notify('category_changed', '');
+  RETURN NULL;
+END
+$$;
+
+CREATE TRIGGER trg_category_changed
+  AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE
+  ON category
+  FOR EACH STATEMENT
+  EXECUTE FUNCTION notify_category_changed();
+
 
 -- Users (passwords here are plain words; in real life, store bcrypt/scrypt/argon2 hashes)
 INSERT INTO users(email, password_hash, firstname, lastname, is_admin) VALUES